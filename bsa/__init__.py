@@ -7,12 +7,43 @@ It processes the Solidity AST to find patterns that might indicate vulnerabiliti
 
 __version__ = '0.1.0'
 
-from bsa.parser import ASTNode, offset_to_line_col, ASTParser
-from bsa.detectors import DetectorRegistry
+import importlib
+
+# Public name -> module it is loaded from on first access (PEP 562)
+_LAZY = {
+    'ASTNode': 'bsa.parser',
+    'offset_to_line_col': 'bsa.parser',
+    'ASTParser': 'bsa.parser',
+    'DetectorRegistry': 'bsa.detectors'
+}
 
 __all__ = [
     'ASTNode',
     'offset_to_line_col',
     'ASTParser',
     'DetectorRegistry'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    """
+    Import a public name on first access.
+    
+    Args:
+        name (str): Attribute name
+        
+    Returns:
+        The requested object
+        
+    Raises:
+        AttributeError: If the name is not part of the package API
+    """
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
\ No newline at end of file
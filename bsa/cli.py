@@ -12,13 +12,18 @@ from bsa.parser.ast_parser import ASTParser
 from bsa.detectors import DetectorRegistry
 from bsa.parser.nodes import ASTNode
 from bsa.parser.source_mapper import offset_to_line_col
+from bsa.utils.cache import default_cache_dir
 
 # For backward compatibility with tests
 contract_output = []
 
 @click.command()
 @click.argument("path")
-def main(path):
+@click.option("--quiet", "-q", is_flag=True, help="Only print detector findings.")
+@click.option("--cache", is_flag=True, help="Cache processed ASTs in the user cache directory (~/.cache/bsa/ast).")
+@click.option("--jobs", "-j", type=click.IntRange(min=1), default=None,
+              help="Process AST files in this many worker processes.")
+def main(path, quiet, cache, jobs):
     """
     Run BSA analysis on a Solidity project.
     
@@ -33,7 +38,8 @@ def main(path):
     try:
         # Initialize parser with debug enabled
         import traceback
-        parser = ASTParser(path)
+        cache_dir = default_cache_dir() if cache else None
+        parser = ASTParser(path, cache_dir=cache_dir, max_workers=jobs)
         
         # Generate and parse AST
         contract_data_list = parser.parse()
@@ -63,121 +69,122 @@ def main(path):
         
     try:
         
-        # Output each contract's details
-        for contract_data in contract_data_list:
-            contract = contract_data.get("contract", {})
-            entrypoints = contract_data.get("entrypoints", [])
-            
-            # Print contract information
-            print(f"Contract: {contract.get('name', 'Unknown')}")
-            
-            # Print each entrypoint
-            if entrypoints:
-                for entrypoint in entrypoints:
-                    try:
-                        name = entrypoint.get("name", "Unknown")
-                        line, col = entrypoint.get("location", [0, 0])
-                        
-                        # Print entrypoint information
-                        print(f"Entrypoint: {name} at line {line}, col {col}")
-                        
-                        # Print SSA analysis information
-                        basic_blocks = entrypoint.get("basic_blocks", [])
-                        ssa_blocks = entrypoint.get("ssa", [])
-                        print(f"  Blocks: {len(basic_blocks)}")
-                        print(f"  SSA Blocks: {len(ssa_blocks)}")
-                        
-                        # Print detailed SSA block information
+        # Output each contract's details unless only detector findings were requested
+        if not quiet:
+            for contract_data in contract_data_list:
+                contract = contract_data.get("contract", {})
+                entrypoints = contract_data.get("entrypoints", [])
+                
+                # Print contract information
+                print(f"Contract: {contract.get('name', 'Unknown')}")
+                
+                # Print each entrypoint
+                if entrypoints:
+                    for entrypoint in entrypoints:
                         try:
-                            if ssa_blocks:
-                                print("  SSA Blocks:")
+                            name = entrypoint.get("name", "Unknown")
+                            line, col = entrypoint.get("location", [0, 0])
+                            
+                            # Print entrypoint information
+                            print(f"Entrypoint: {name} at line {line}, col {col}")
+                            
+                            # Print SSA analysis information
+                            basic_blocks = entrypoint.get("basic_blocks", [])
+                            ssa_blocks = entrypoint.get("ssa", [])
+                            print(f"  Blocks: {len(basic_blocks)}")
+                            print(f"  SSA Blocks: {len(ssa_blocks)}")
+                            
+                            # Print detailed SSA block information
+                            try:
+                                if ssa_blocks:
+                                    print("  SSA Blocks:")
+                                    for block in ssa_blocks:
+                                        block_id = block.get("id", "Unknown")
+                                        ssa_statements = block.get("ssa_statements", [])
+                                        terminator = block.get("terminator", "Unknown")
+                                        reads = block.get("accesses", {}).get("reads", [])
+                                        writes = block.get("accesses", {}).get("writes", [])
+                                        
+                                        # Format revert statements before printing
+                                        formatted_statements = []
+                                        for stmt in ssa_statements:
+                                            # Clean up revert statements for display
+                                            if "call[external](revert" in stmt:
+                                                args = stmt.split("call[external](revert")[1].strip(")")
+                                                if args.startswith(", "):
+                                                    args = args[2:]  # Remove leading comma and space
+                                                formatted_statements.append(f"revert {args}")
+                                            elif "call[external](require" in stmt:
+                                                args = stmt.split("call[external](require")[1].strip(")")
+                                                if args.startswith(", "):
+                                                    args = args[2:]  # Remove leading comma and space
+                                                formatted_statements.append(f"require {args}")
+                                            elif "call[external](assert" in stmt:
+                                                args = stmt.split("call[external](assert")[1].strip(")")
+                                                if args.startswith(", "):
+                                                    args = args[2:]  # Remove leading comma and space
+                                                formatted_statements.append(f"assert {args}")
+                                            else:
+                                                formatted_statements.append(stmt)
+                                        
+                                        print(f"    Block {block_id}:")
+                                        print(f"      SSA: {formatted_statements}")
+                                        print(f"      Terminator: {terminator}")
+                                        print(f"      Accesses: reads={reads}, writes={writes}")
+                            except (TypeError, AttributeError, IndexError) as e:
+                                print(f"    Error displaying SSA blocks: {str(e)}")
+                            
+                            # Print detailed variable accesses by block
+                            try:
+                                print("  Variable Accesses:")
                                 for block in ssa_blocks:
                                     block_id = block.get("id", "Unknown")
-                                    ssa_statements = block.get("ssa_statements", [])
-                                    terminator = block.get("terminator", "Unknown")
                                     reads = block.get("accesses", {}).get("reads", [])
                                     writes = block.get("accesses", {}).get("writes", [])
-                                    
-                                    # Format revert statements before printing
-                                    formatted_statements = []
-                                    for stmt in ssa_statements:
-                                        # Clean up revert statements for display
-                                        if "call[external](revert" in stmt:
-                                            args = stmt.split("call[external](revert")[1].strip(")")
-                                            if args.startswith(", "):
-                                                args = args[2:]  # Remove leading comma and space
-                                            formatted_statements.append(f"revert {args}")
-                                        elif "call[external](require" in stmt:
-                                            args = stmt.split("call[external](require")[1].strip(")")
-                                            if args.startswith(", "):
-                                                args = args[2:]  # Remove leading comma and space
-                                            formatted_statements.append(f"require {args}")
-                                        elif "call[external](assert" in stmt:
-                                            args = stmt.split("call[external](assert")[1].strip(")")
-                                            if args.startswith(", "):
-                                                args = args[2:]  # Remove leading comma and space
-                                            formatted_statements.append(f"assert {args}")
-                                        else:
-                                            formatted_statements.append(stmt)
-                                    
-                                    print(f"    Block {block_id}:")
-                                    print(f"      SSA: {formatted_statements}")
-                                    print(f"      Terminator: {terminator}")
-                                    print(f"      Accesses: reads={reads}, writes={writes}")
-                        except (TypeError, AttributeError, IndexError) as e:
-                            print(f"    Error displaying SSA blocks: {str(e)}")
-                        
-                        # Print detailed variable accesses by block
-                        try:
-                            print("  Variable Accesses:")
-                            for block in ssa_blocks:
-                                block_id = block.get("id", "Unknown")
-                                reads = block.get("accesses", {}).get("reads", [])
-                                writes = block.get("accesses", {}).get("writes", [])
-                                print(f"    Block {block_id}: reads={reads}, writes={writes}")
-                        except (TypeError, AttributeError) as e:
-                            print(f"    Error calculating variable accesses: {str(e)}")
-                    except Exception as e:
-                        print(f"  Error processing entrypoint: {str(e)}")
-                    
-                    # Print function calls, separated by type
-                    all_calls = entrypoint.get("calls", [])
-                    if all_calls:
-                        # Separate into internal and external calls
-                        internal_calls = []
-                        external_calls = []
+                                    print(f"    Block {block_id}: reads={reads}, writes={writes}")
+                            except (TypeError, AttributeError) as e:
+                                print(f"    Error calculating variable accesses: {str(e)}")
+                        except Exception as e:
+                            print(f"  Error processing entrypoint: {str(e)}")
                         
-                        for call in all_calls:
-                            call_line, call_col = call.get("location", [0, 0])
-                            call_type = call.get("call_type", "unknown")
-                            call_name = call.get('name', 'unknown')
-                            scope = "this contract" if call.get("in_contract", False) else "unknown"
+                        # Print function calls, separated by type
+                        all_calls = entrypoint.get("calls", [])
+                        if all_calls:
+                            # Separate into internal and external calls
+                            internal_calls = []
+                            external_calls = []
                             
-                            # Skip revert, require, and assert - they're not real external calls
-                            if call_name in ["revert", "require", "assert"]:
-                                continue
+                            for call in all_calls:
+                                call_line, call_col = call.get("location", [0, 0])
+                                call_type = call.get("call_type", "unknown")
+                                call_name = call.get('name', 'unknown')
+                                scope = "this contract" if call.get("in_contract", False) else "unknown"
                                 
-                            call_info = f"{call_name} ({scope}) at line {call_line}, col {call_col}"
+                                # Skip revert, require, and assert - they're not real external calls
+                                if call_name in ["revert", "require", "assert"]:
+                                    continue
+                                    
+                                call_info = f"{call_name} ({scope}) at line {call_line}, col {call_col}"
+                                
+                                # Categorize based on call type
+                                if call.get("is_external", False) or call_type in ["external", "low_level_external", "delegatecall", "staticcall"]:
+                                    external_calls.append(call_info)
+                                else:
+                                    internal_calls.append(call_info)
                             
-                            # Categorize based on call type
-                            if call.get("is_external", False) or call_type in ["external", "low_level_external", "delegatecall", "staticcall"]:
-                                external_calls.append(call_info)
+                            # Print internal calls
+                            if internal_calls:
+                                print(f"  Internal calls: {', '.join(internal_calls)}")
                             else:
-                                internal_calls.append(call_info)
-                        
-                        # Print internal calls
-                        if internal_calls:
-                            print(f"  Internal calls: {', '.join(internal_calls)}")
+                                print("  No internal calls")
+                                
+                            # Print external calls
+                            if external_calls:
+                                print(f"  External calls: {', '.join(external_calls)}")
                         else:
-                            print("  No internal calls")
-                            
-                        # Print external calls
-                        if external_calls:
-                            print(f"  External calls: {', '.join(external_calls)}")
-                    else:
-                        print("  No function calls")
-            else:
-                print("No Entrypoints found in src/ files")
+                            print("  No function calls")
+                else:
+                    print("No Entrypoints found in src/ files")
         
         # Run detectors
         try:
@@ -5,6 +5,8 @@ Base detector classes for BSA vulnerability detection.
 class Detector:
     """Base class for all vulnerability detectors."""
     
+    __slots__ = ("name", "findings")
+    
     def __init__(self, name="BaseDetector"):
         """Initialize the detector with a name.
         
@@ -14,12 +16,13 @@ class Detector:
         self.name = name
         self.findings = []
     
-    def detect(self, contract_data):
+    def detect(self, contract_data, first_only=False):
         """
         Run the detection algorithm and return findings.
         
         Args:
             contract_data (dict): Contract data for analysis
+            first_only (bool): Stop after the first finding
             
         Returns:
             list: List of findings
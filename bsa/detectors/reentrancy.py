@@ -2,7 +2,168 @@
 Reentrancy vulnerability detector for BSA.
 """
 
+import re
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, repeat
+
 from bsa.detectors.base import Detector
+from bsa.parser.ssa_conversion import CALL_RE, EXTERNAL_CALL_TYPES, REVERT_FUNCS, REVERT_PREFIXES
+
+# Address members that make an external call in raw AST form
+_EXTERNAL_CALL_NAMES = frozenset({"call", "delegatecall", "staticcall", "transfer", "send"})
+
+# Minimum number of statements after the first external call before they are searched in one batch
+_BATCH_THRESHOLD = 2000
+
+# Minimum number of unanalyzed entrypoints before work is handed to a process pool
+_PARALLEL_THRESHOLD = 4
+
+
+def _is_external_call_statement(stmt):
+    """
+    Check whether an SSA statement is a call that leaves the contract.
+    
+    Args:
+        stmt (str): SSA statement
+        
+    Returns:
+        bool: True if the statement is a non revert-like external call
+    """
+    # Parse the call type and function name in one match
+    match = CALL_RE.search(stmt)
+    if not match:
+        return False
+    return match.group("type") in EXTERNAL_CALL_TYPES and match.group("func").strip() not in REVERT_FUNCS
+
+
+def _classify_block_calls(block):
+    """
+    Check whether a basic block makes an external call, caching the result on the block.
+    
+    The classification only depends on the block's SSA statements, so it is stored on the
+    block dict and shared by every detector that analyzes the same parse results.
+    
+    Args:
+        block (dict): Basic block dictionary
+        
+    Returns:
+        bool: True if the block makes an external call and contains no revert statement
+    """
+    if not block.get("_bsa_calls_classified"):
+        statements = block["ssa_statements"] if "ssa_statements" in block else ()
+        block["_bsa_reverts"] = any(stmt.startswith(REVERT_PREFIXES) for stmt in statements)
+        block["_bsa_has_external_call"] = any(map(_is_external_call_statement, statements))
+        block["_bsa_calls_classified"] = True
+    
+    # Revert statements disqualify the block's calls
+    return block["_bsa_has_external_call"] and not block["_bsa_reverts"]
+
+
+def _first_state_write(block, write_re):
+    """
+    Find the first state variable write in a basic block, caching the result on the block.
+    
+    Args:
+        block (dict): Basic block dictionary
+        write_re (re.Pattern): Pattern matching state variable writes
+        
+    Returns:
+        str: First SSA statement writing a state variable, or None
+    """
+    # Results depend on the state variables, so they are cached per write pattern
+    state_writes = block.setdefault("_bsa_state_writes", {})
+    if write_re.pattern not in state_writes:
+        statements = block["ssa_statements"] if "ssa_statements" in block else ()
+        state_writes[write_re.pattern] = next(filter(write_re.search, statements), None)
+    return state_writes[write_re.pattern]
+
+
+def _summarized_state_write(block, state_names):
+    """
+    Find the first state variable write in a block from the parser's write summary.
+    
+    Args:
+        block (dict): Basic block dictionary with a "_bsa_written_vars" summary
+        state_names (frozenset): Names of the state variables
+        
+    Returns:
+        str: First SSA statement writing a state variable, or None
+    """
+    written_vars = block["_bsa_written_vars"]
+    indices = [written_vars[name] for name in state_names.intersection(written_vars)]
+    if not indices:
+        return None
+    return block["ssa_statements"][min(indices)]
+
+
+def _find_state_write_batched(basic_blocks, write_re):
+    """
+    Find the first state variable write across many blocks with a single regex search.
+    
+    The statements are joined into one newline-separated text so the search runs in C over
+    all of them; block boundaries are recovered from the recorded start offsets.
+    
+    Args:
+        basic_blocks (list): Basic block dictionaries to search, in order
+        write_re (re.Pattern): Pattern matching state variable writes
+        
+    Returns:
+        str: Description of the vulnerable state write, or False if none is found
+    """
+    statements = []
+    block_starts = []
+    offset = 0
+    for block in basic_blocks:
+        block_starts.append(offset)
+        for stmt in block.get("ssa_statements", ()):
+            statements.append(stmt)
+            offset += len(stmt) + 1
+    
+    text = "\n".join(statements)
+    match = write_re.search(text)
+    if not match:
+        return False
+    
+    # Recover the matched statement and the block it belongs to
+    stmt_start = text.rfind("\n", 0, match.start()) + 1
+    stmt_end = text.find("\n", match.start())
+    vuln_statement = text[stmt_start:] if stmt_end == -1 else text[stmt_start:stmt_end]
+    block = basic_blocks[bisect_right(block_starts, stmt_start) - 1]
+    return f"{vuln_statement} at {block.get('id', 'Unknown')}"
+
+
+def _compile_state_write_pattern(state_names):
+    """
+    Compile a single pattern matching an SSA write to any of the given state variables.
+    
+    Args:
+        state_names (frozenset): Names of the contract's state variables
+        
+    Returns:
+        re.Pattern: Pattern matching statements like "x_1 = ...", or None if there are no state variables
+    """
+    if not state_names:
+        return None
+    # Longest names first so an alternative never stops at a shorter prefix (e.g. "bal" in
+    # "balances"); the stable order also keeps the pattern text identical across runs
+    names = sorted(state_names, key=lambda name: (-len(name), name))
+    return re.compile(r"\b(" + "|".join(map(re.escape, names)) + r")_\d+ = ")
+
+
+def _analyze_entrypoint(entrypoint, state_names, write_re):
+    """
+    Check a single entrypoint for reentrancy in a worker process.
+    
+    Args:
+        entrypoint (dict): Entrypoint data
+        state_names (frozenset): Names of the state variables
+        write_re (re.Pattern): Precompiled state write pattern for state_names, or None
+        
+    Returns:
+        str: Description of the vulnerable state write, or False if none is found
+    """
+    return ReentrancyDetector().check_entrypoint(entrypoint, state_names, write_re)
 
 class ReentrancyDetector(Detector):
     """
@@ -14,48 +175,81 @@ class ReentrancyDetector(Detector):
     potentially allowing an attacker to execute code before state updates are completed.
     """
     
-    def __init__(self):
-        """Initialize the reentrancy detector."""
+    __slots__ = ("max_workers", "_cache", "_cache_contract")
+    
+    def __init__(self, max_workers=None):
+        """
+        Initialize the reentrancy detector.
+        
+        Args:
+            max_workers (int, optional): Number of worker processes used to analyze contracts with
+                many entrypoints. Detection runs in-process when not set.
+        """
         super().__init__(name="Reentrancy")
         self.findings = []
+        self.max_workers = max_workers
+        # Memoized check results keyed by (entrypoint identity, state variable names)
+        self._cache = {}
+        # Contract data the memoized results belong to; also keeps the keyed entrypoints alive
+        self._cache_contract = None
     
-    def detect(self, contract_data):
+    def detect(self, contract_data, first_only=False):
         """
         Run the reentrancy detection algorithm on contract data.
         
         Args:
             contract_data (dict): Contract data for analysis
+            first_only (bool): Stop after the first finding
             
         Returns:
             list: List of findings
         """
-        # Reset findings
+        # Start a new list so results returned by earlier calls are not changed
         self.findings = []
         
+        # Memoized results are only valid for the contract data they were computed on
+        if contract_data is not self._cache_contract:
+            self._cache.clear()
+            self._cache_contract = contract_data
+        
         # Extract contract and entrypoints
         contract = contract_data.get("contract", {})
-        entrypoints = contract_data.get("entrypoints", [])
-        state_vars = contract.get("state_vars", [])
+        entrypoints = contract_data.get("entrypoints", ())
+        state_vars = contract["state_vars"] if "state_vars" in contract else ()
         contract_name = contract.get("name", "Unknown")
         
+        # Build the state variable lookups once for all entrypoints, reusing the
+        # name set computed by the parser when it is available
+        state_names = contract.get("state_var_names")
+        if state_names is None:
+            state_names = frozenset(var["name"] for var in state_vars)
+        write_re = _compile_state_write_pattern(state_names)
+        
         # Debug information - commented out for clarity in output
         # print(f"DEBUG detect: Contract: {contract_name}")
         # print(f"DEBUG detect: State vars: {[v.get('name') for v in state_vars]}")
         
+        # Entrypoints are independent, so large contracts can be analyzed in worker processes
+        # up front; their results are stored in the memo cache used by the loop below
+        if self.max_workers and not first_only:
+            pending = [entrypoint for entrypoint in entrypoints if (id(entrypoint), state_names) not in self._cache]
+            if len(pending) >= _PARALLEL_THRESHOLD:
+                with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                    results = executor.map(_analyze_entrypoint, pending, repeat(state_names), repeat(write_re))
+                    for entrypoint, result in zip(pending, results):
+                        self._cache[(id(entrypoint), state_names)] = result
+        
         # Analyze each entrypoint for reentrancy
         for entrypoint in entrypoints:
             function_name = entrypoint.get("name", "Unknown")
             
-            # Get the function body - always prefer basic blocks over raw body
-            if "basic_blocks" in entrypoint:
-                body = entrypoint  # Pass the entire entrypoint for basic blocks access
-                # print(f"DEBUG detect: Using basic blocks")
+            # Check for reentrancy, reusing the result if this entrypoint was already analyzed
+            cache_key = (id(entrypoint), state_names)
+            if cache_key in self._cache:
+                reentrancy_result = self._cache[cache_key]
             else:
-                body = {"statements": entrypoint.get("body_raw", [])}
-                # print(f"DEBUG detect: Using raw body")
-            
-            # Check for reentrancy
-            reentrancy_result = self.check_reentrancy(body, state_vars)
+                reentrancy_result = self.check_entrypoint(entrypoint, state_names, write_re)
+                self._cache[cache_key] = reentrancy_result
             
             if reentrancy_result:
                 # If the result is a string, it contains details about the vulnerable statement
@@ -74,9 +268,30 @@ class ReentrancyDetector(Detector):
                         "description": "External call detected before state variable write",
                         "severity": "High"
                     })
+                
+                # Skip the remaining entrypoints when only the first finding is wanted
+                if first_only:
+                    break
         
         return self.findings
     
+    def check_entrypoint(self, entrypoint, state_names, write_re=None):
+        """
+        Check a single entrypoint for reentrancy vulnerabilities.
+        
+        Args:
+            entrypoint (dict): Entrypoint data with basic blocks or a raw body
+            state_names (frozenset): Names of the state variables
+            write_re (re.Pattern, optional): Precompiled state write pattern for state_names
+            
+        Returns:
+            str: Description of the vulnerable state write, or False if none is found
+        """
+        # Always prefer basic blocks over raw body
+        if "basic_blocks" in entrypoint:
+            return self.check_reentrancy_blocks(entrypoint["basic_blocks"], state_names, write_re)
+        return self.check_reentrancy_ast(entrypoint["body_raw"] if "body_raw" in entrypoint else (), state_names)
+    
     def is_external_call(self, node):
         """
         Check if a node represents an external call like contract.call() or address.transfer().
@@ -87,17 +302,20 @@ class ReentrancyDetector(Detector):
         Returns:
             bool: True if the node represents an external call, False otherwise
         """
+        node_type = node.get("nodeType")
+        
         # For Variable Declaration Statements that contain a call
-        if node.get("nodeType") == "VariableDeclarationStatement":
+        if node_type == "VariableDeclarationStatement":
             initialValue = node.get("initialValue", {})
             if initialValue:
                 return self.is_external_call(initialValue)
         
         # If this is an expression statement, get the expression
-        if node.get("nodeType") == "ExpressionStatement":
+        if node_type == "ExpressionStatement":
             node = node.get("expression", {})
+            node_type = node.get("nodeType")
         
-        if node.get("nodeType") != "FunctionCall":
+        if node_type != "FunctionCall":
             return False
         
         expression = node.get("expression", {})
@@ -108,84 +326,98 @@ class ReentrancyDetector(Detector):
             base_expr = expression.get("expression", {})
             if base_expr.get("nodeType") == "MemberAccess":
                 member_name = base_expr.get("memberName", "")
-                external_call_names = ["call", "delegatecall", "staticcall", "transfer", "send"]
-                return member_name in external_call_names
+                return member_name in _EXTERNAL_CALL_NAMES
         
         # Check for common external call patterns
         if expr_type == "MemberAccess":
             member_name = expression.get("memberName", "")
-            # Common external call functions
-            external_call_names = ["call", "delegatecall", "staticcall", "transfer", "send"]
-            return member_name in external_call_names
+            return member_name in _EXTERNAL_CALL_NAMES
         
         return False
     
-    def is_state_variable_write(self, node, state_vars):
+    def is_state_variable_write(self, node, state_names):
         """
         Check if a node represents a state variable write operation.
         
         Args:
             node (dict): AST node to check
-            state_vars (list): List of state variables
+            state_names (frozenset): Names of the state variables
             
         Returns:
             bool: True if the node represents a state variable write, False otherwise
         """
+        node_type = node.get("nodeType")
+        
         # If this is an expression statement, get the expression
-        if node.get("nodeType") == "ExpressionStatement":
+        if node_type == "ExpressionStatement":
             node = node.get("expression", {})
+            node_type = node.get("nodeType")
         
-        if node.get("nodeType") != "Assignment":
+        if node_type != "Assignment":
             return False
         
         left_hand_side = node.get("leftHandSide", {})
+        lhs_type = left_hand_side.get("nodeType")
         
         # Check for direct state variable assignment (variable name)
-        if left_hand_side.get("nodeType") == "Identifier":
+        if lhs_type == "Identifier":
             var_name = left_hand_side.get("name", "")
             # Check if this name is in our state variables
-            return var_name in [var["name"] for var in state_vars]
+            return var_name in state_names
         
         # Check for mapping or array access in state variables (e.g., balances[msg.sender] = 0)
-        if left_hand_side.get("nodeType") == "IndexAccess":
+        if lhs_type == "IndexAccess":
             base_expr = left_hand_side.get("baseExpression", {})
             if base_expr.get("nodeType") == "Identifier":
                 var_name = base_expr.get("name", "")
-                return var_name in [var["name"] for var in state_vars]
+                return var_name in state_names
         
         return False
     
-    def check_reentrancy(self, body, state_vars):
+    def check_reentrancy(self, body, state_names, write_re=None):
         """
         Check a function body for reentrancy vulnerabilities.
         
         Args:
             body (dict): Function body AST node or basic blocks data
-            state_vars (list): List of state variables
+            state_names (frozenset): Names of the state variables
+            write_re (re.Pattern, optional): Precompiled state write pattern for state_names
             
         Returns:
             bool: True if reentrancy is detected (external call before state var write)
         """
         # Check if this is basic blocks format (from SSA transformation)
         if isinstance(body, dict) and "basic_blocks" in body:
-            return self._check_reentrancy_in_blocks(body["basic_blocks"], state_vars)
-            
+            return self.check_reentrancy_blocks(body["basic_blocks"], state_names, write_re)
+        
         # Original AST node processing
-        statements = body.get("statements", [])
+        return self.check_reentrancy_ast(body.get("statements", ()), state_names)
+    
+    def check_reentrancy_ast(self, statements, state_names):
+        """
+        Check raw AST function body statements for reentrancy vulnerabilities.
+        
+        Args:
+            statements (list): Statement nodes of the function body
+            state_names (frozenset): Names of the state variables
+            
+        Returns:
+            str: Description of the vulnerable state write, or False if none is found
+        """
         has_external_call = False
         
-        # Flatten statements to make it easier to process
-        flat_statements = []
-        for statement in statements:
-            flat_statements.append(statement)
-            # Also check for blocks and their statements
-            if statement.get("nodeType") == "Block":
-                flat_statements.extend(statement.get("statements", []))
+        # Flatten statements lazily (blocks are followed by their own statements) so the
+        # scan below can stop at the first finding without building the rest
+        flat_statements = chain.from_iterable(
+            chain((statement,), statement.get("statements", ()))
+            if statement.get("nodeType") == "Block" else (statement,)
+            for statement in statements
+        )
         
         # Process statements in order
         for i, statement in enumerate(flat_statements):
             # If we've seen an external call, check if this statement writes to state
-            if has_external_call and self.is_state_variable_write(statement, state_vars):
+            if has_external_call and self.is_state_variable_write(statement, state_names):
                 # For raw AST, we can't provide detailed SSA information
                 # Just report the statement index for reference
                 return f"state write at statement {i}"
@@ -196,108 +428,56 @@ class ReentrancyDetector(Detector):
         
         return False
         
-    def _check_reentrancy_in_blocks(self, basic_blocks, state_vars):
+    def check_reentrancy_blocks(self, basic_blocks, state_names, write_re=None):
         """
         Check for reentrancy in SSA basic blocks format.
         
         Args:
             basic_blocks (list): List of basic block dictionaries
-            state_vars (list): List of state variables
+            state_names (frozenset): Names of the state variables
+            write_re (re.Pattern, optional): Precompiled state write pattern for state_names
             
         Returns:
-            bool: True if reentrancy is detected
+            str: Description of the vulnerable state write, or False if none is found
         """
-        # With the new block splitting, external calls and state writes will be in separate blocks
-        # First, we need to find blocks that have external calls
-        call_blocks = []
-        state_write_blocks = []
+        if write_re is None:
+            write_re = _compile_state_write_pattern(state_names)
+            # Without state variables there is nothing that could be written
+            if write_re is None:
+                return False
         
-        # Identify blocks with calls and blocks with state writes
+        # With the new block splitting, external calls and state writes will be in separate blocks.
+        # Blocks are ordered sequentially, so a single forward scan can report the first
+        # state write that comes after a block with an external call.
+        # Find the first block that makes an external call, using the parser's summary when present
         for i, block in enumerate(basic_blocks):
-            # Get all SSA statements in this block
-            statements = block.get("ssa_statements", [])
-            
-            has_external_call = False
-            has_state_write = False
-            
-            # First check for revert statements (which are not external calls)
-            has_revert_statement = False
-            for stmt in statements:
-                if stmt.startswith("revert ") or stmt.startswith("require ") or stmt.startswith("assert "):
-                    has_revert_statement = True
-                    break
-                    
-            # If no revert statements, check for external calls
-            if not has_revert_statement:
-                for stmt in statements:
-                    # Only consider call type statements
-                    if "call[" in stmt and "(" in stmt and ")" in stmt:
-                        # Parse the call parts: type and function name
-                        call_type = stmt.split("call[")[1].split("]")[0]
-                        
-                        # Extract function name
-                        func_call_part = stmt.split("]")[1].strip()
-                        if func_call_part.startswith("(") and func_call_part.endswith(")"):
-                            func_and_args = func_call_part[1:-1]  # Remove outer parentheses
-                            
-                            # Get function name
-                            if "," in func_and_args:
-                                func_name = func_and_args.split(",", 1)[0].strip()
-                            else:
-                                func_name = func_and_args.strip()
-                            
-                            # Check if this is an actual external call (not a revert type)
-                            is_external = False
-                            
-                            # Check call type first
-                            if call_type in ["external", "low_level_external", "delegatecall", "staticcall"]:
-                                # Only consider it external if it's not a revert-like function
-                                if func_name not in ["revert", "require", "assert"]:
-                                    is_external = True
-                            
-                            if is_external:
-                                has_external_call = True
-                                break
-            
-            # Check for state variable writes
-            for stmt in statements:
-                for state_var in state_vars:
-                    var_name = state_var["name"]
-                    # Check for pattern like "x_1 = " which represents writing to state var x
-                    if f"{var_name}_" in stmt and " = " in stmt:
-                        has_state_write = True
-                        break
-                if has_state_write:
-                    break
+            if "_bsa_external_call_index" in block:
+                makes_external_call = block["_bsa_external_call_index"] is not None
+            else:
+                makes_external_call = _classify_block_calls(block)
+            if makes_external_call:
+                first_call_block = i
+                break
+        else:
+            return False
+        
+        later_blocks = basic_blocks[first_call_block + 1:]
+        summarized = all("_bsa_written_vars" in block for block in later_blocks)
+        
+        # Very large functions are searched with one regex pass over all remaining statements
+        if not summarized and sum(len(block.get("ssa_statements", ())) for block in later_blocks) >= _BATCH_THRESHOLD:
+            return _find_state_write_batched(later_blocks, write_re)
+        
+        for block in later_blocks:
+            # Check for state variable writes like "x_1 = " which represents writing to state var x
+            if "_bsa_written_vars" in block:
+                vuln_statement = _summarized_state_write(block, state_names)
+            else:
+                vuln_statement = _first_state_write(block, write_re)
             
-            # Record the results
-            if has_external_call:
-                call_blocks.append(i)
-            if has_state_write:
-                state_write_blocks.append(i)
-        
-        # Now check if any state write block comes after a call block
-        # (blocks are ordered sequentially due to our splitting)
-        for call_block_idx in call_blocks:
-            for write_block_idx in state_write_blocks:
-                if write_block_idx > call_block_idx:
-                    # Get the vulnerable statement details
-                    write_block = basic_blocks[write_block_idx]
-                    write_block_id = write_block.get("id", "Unknown")
-                    
-                    # Find the statement that writes to a state variable
-                    vuln_statement = None
-                    for stmt in write_block.get("ssa_statements", []):
-                        for state_var in state_vars:
-                            var_name = state_var["name"]
-                            if f"{var_name}_" in stmt and " = " in stmt:
-                                vuln_statement = stmt
-                                break
-                        if vuln_statement:
-                            break
-                    
-                    # Return details about the vulnerable state write
-                    write_details = f"{vuln_statement} at {write_block_id}" if vuln_statement else f"state write at {write_block_id}"
-                    return write_details
-        
-        return False
\ No newline at end of file
+            # A state write after an earlier external call block is a reentrancy
+            if vuln_statement is not None:
+                write_block_id = block.get("id", "Unknown")
+                return f"{vuln_statement} at {write_block_id}"
+        
+        return False
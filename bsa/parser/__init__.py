@@ -1,28 +1,52 @@
 """
 BSA parser module for working with Solidity ASTs.
+
+Public names are resolved lazily (PEP 562) so importing one parser component
+does not load the whole parsing pipeline.
 """
 
-from bsa.parser.nodes import ASTNode
-from bsa.parser.source_mapper import offset_to_line_col
-from bsa.parser.parser_core import ASTParser
-from bsa.parser.basic_blocks import classify_statements, split_into_basic_blocks
-from bsa.parser.control_flow import refine_blocks_with_control_flow
-from bsa.parser.variable_tracking import track_variable_accesses
-from bsa.parser.function_calls import classify_and_add_calls as classify_function_calls, inline_internal_calls
-from bsa.parser.loop_analysis import analyze_loop_calls
-from bsa.parser.ssa_conversion import SSAConverter, convert_to_ssa
-
-__all__ = [
-    'ASTNode',
-    'offset_to_line_col',
-    'ASTParser',
-    'classify_statements',
-    'split_into_basic_blocks',
-    'refine_blocks_with_control_flow',
-    'track_variable_accesses',
-    'classify_function_calls',
-    'inline_internal_calls',
-    'analyze_loop_calls',
-    'SSAConverter',
-    'convert_to_ssa'
-]
\ No newline at end of file
+import importlib
+
+# Public name -> (module, attribute) it is loaded from on first access
+_LAZY = {
+    'ASTNode': ('bsa.parser.nodes', 'ASTNode'),
+    'offset_to_line_col': ('bsa.parser.source_mapper', 'offset_to_line_col'),
+    'ASTParser': ('bsa.parser.parser_core', 'ASTParser'),
+    'classify_statements': ('bsa.parser.basic_blocks', 'classify_statements'),
+    'split_into_basic_blocks': ('bsa.parser.basic_blocks', 'split_into_basic_blocks'),
+    'refine_blocks_with_control_flow': ('bsa.parser.control_flow', 'refine_blocks_with_control_flow'),
+    'track_variable_accesses': ('bsa.parser.variable_tracking', 'track_variable_accesses'),
+    'classify_function_calls': ('bsa.parser.function_calls', 'classify_and_add_calls'),
+    'inline_internal_calls': ('bsa.parser.function_calls', 'inline_internal_calls'),
+    'analyze_loop_calls': ('bsa.parser.loop_analysis', 'analyze_loop_calls'),
+    'SSAConverter': ('bsa.parser.ssa_conversion', 'SSAConverter'),
+    'convert_to_ssa': ('bsa.parser.ssa_conversion', 'convert_to_ssa')
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    """
+    Import a public parser name on first access.
+    
+    Args:
+        name (str): Attribute name
+        
+    Returns:
+        The requested object
+        
+    Raises:
+        AttributeError: If the name is not part of the parser API
+    """
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr = _LAZY[name]
+    value = getattr(importlib.import_module(module_name), attr)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
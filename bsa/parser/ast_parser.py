@@ -2,35 +2,72 @@
 AST parser for BSA.
 """
 
+import copy
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 import json
 import glob
 
 from bsa.parser.nodes import ASTNode
 from bsa.parser.source_mapper import offset_to_line_col
+from bsa.parser.ssa_conversion import SSAConverter
 from bsa.utils.forge import (
     clean_project, 
     build_project_ast, 
     find_source_files, 
     find_ast_files, 
-    load_ast_file
+    loads_ast
 )
+from bsa.utils.cache import cache_key, load_cached, store_cached
+
+# Minimum number of AST files before they are handed to a process pool
+_PARALLEL_THRESHOLD = 4
+
+# AST files at least this large are streamed so only their "ast" entry is built in memory
+_STREAM_AST_MIN_BYTES = 64 * 1024 * 1024
+
+
+def _process_ast_file(project_path, cache_dir, ast_file, src_file_path):
+    """
+    Process a single AST file in a worker process.
+    
+    Args:
+        project_path (str): Path to the project directory
+        cache_dir (str): Directory for caching processed ASTs, or None
+        ast_file (str): Path to the AST JSON file
+        src_file_path (str): Path to the corresponding Solidity source, or None
+        
+    Returns:
+        list: List of contract data dictionaries from the file
+    """
+    return ASTParser(project_path, cache_dir=cache_dir).process_ast_file(ast_file, src_file_path)
 
 class ASTParser:
     """Parser for Solidity AST files."""
     
-    def __init__(self, project_path):
+    def __init__(self, project_path, cache_dir=None, max_workers=None):
         """
         Initialize the AST parser.
         
         Args:
             project_path (str): Path to the project directory
+            cache_dir (str, optional): Directory for caching processed ASTs across runs.
+                Caching is disabled when not set.
+            max_workers (int, optional): Number of worker processes used for projects with
+                many AST files. Files are processed in-process when not set.
         """
         self.project_path = project_path
         self.ast_data = None
         self.source_files = {}
         self.ast_files = []
         self.source_text = ""
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        # Processed contract data of ASTs seen during the current parse, keyed by cache_key()
+        # over the source and AST bytes so identical files share one entry
+        self._process_cache = {}
     
     def prepare(self):
         """
@@ -52,7 +89,7 @@ class ASTParser:
         
         # Find source and AST files
         self.source_files = find_source_files(self.project_path)
-        self.ast_files = find_ast_files(self.project_path, list(self.source_files.keys()))
+        self.ast_files = find_ast_files(self.project_path, self.source_files)
         
         return len(self.ast_files) > 0
     
@@ -64,35 +101,34 @@ class ASTParser:
             list: List of contract data dictionaries
         """
         output = []
+        self._process_cache = {}
         
         # Ensure preparation has been done
         if not self.ast_files:
             if not self.prepare():
                 return output
         
-        # Process each AST file
+        # Get the source file path for each AST file
+        src_file_paths = []
         for ast_file in self.ast_files:
             # Extract contract name from the AST file path
             file_dir = os.path.dirname(ast_file)
             contract_file = os.path.basename(file_dir)
             contract_name = contract_file[:-4] if contract_file.endswith(".sol") else contract_file
-            
-            # Get the corresponding source file path
-            src_file_path = self.source_files.get(contract_name)
-            
-            # Load the source file
-            self.source_text = ""
-            if src_file_path and os.path.exists(src_file_path):
-                with open(src_file_path, "r") as src_file:
-                    self.source_text = src_file.read()
-            
-            # Load the AST file
-            ast_data = load_ast_file(ast_file)
-            ast = ast_data.get("ast", {})
-            
-            # Process the AST
-            contract_data = self._process_ast(ast)
-            
+            src_file_paths.append(self.source_files.get(contract_name))
+        
+        # Process each AST file; files are independent, so many of them can use worker processes
+        if self.max_workers and len(self.ast_files) >= _PARALLEL_THRESHOLD:
+            chunksize = max(1, len(self.ast_files) // (4 * self.max_workers))
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                results = list(executor.map(
+                    _process_ast_file, repeat(self.project_path), repeat(self.cache_dir),
+                    self.ast_files, src_file_paths, chunksize=chunksize
+                ))
+        else:
+            results = map(self.process_ast_file, self.ast_files, src_file_paths)
+        
+        for contract_data in results:
             if contract_data:
                 output.extend(contract_data)
         
@@ -105,9 +141,17 @@ class ASTParser:
             for entrypoint in contract_data["entrypoints"]:
                 # 1. Fix variable duplication in balanceOf operations with amount
                 if entrypoint.get("ssa") and isinstance(entrypoint["ssa"], list):
+                    is_mint_or_burn = entrypoint.get("name", "") in ("mint", "_mint", "burn", "_burn")
                     for block in entrypoint["ssa"]:
                         if "ssa_statements" not in block:
                             continue
+                        
+                        # Outside mint/burn functions only balanceOf updates and _mint/_burn calls
+                        # are rewritten, so one scan of the block decides whether to check each statement
+                        if not is_mint_or_burn:
+                            text = "\n".join(block["ssa_statements"])
+                            if "balanceOf[" not in text and "call[internal](_" not in text:
+                                continue
                             
                         for i, stmt in enumerate(block["ssa_statements"]):
                             # Fix balanceOf[to] += amount duplication
@@ -164,6 +208,52 @@ class ASTParser:
         
         return output
     
+    def process_ast_file(self, ast_file, src_file_path):
+        """
+        Load and process a single AST file.
+        
+        Args:
+            ast_file (str): Path to the AST JSON file
+            src_file_path (str): Path to the corresponding Solidity source, or None
+            
+        Returns:
+            list: List of contract data dictionaries from the file
+        """
+        # Load the source file as raw bytes; solc source offsets are byte offsets
+        self.source_text = b""
+        if src_file_path and os.path.exists(src_file_path):
+            with open(src_file_path, "rb") as src_file:
+                self.source_text = src_file.read()
+        
+        with open(ast_file, "rb") as f:
+            ast_bytes = f.read()
+        
+        # Identical source and compiler output give identical contract data, whatever the path,
+        # so the same library AST under two source trees is processed once per parse
+        key = cache_key(self.source_text, ast_bytes)
+        contract_data = self._process_cache.get(key)
+        if contract_data is not None:
+            # The fix-up pass in parse() and callers edit contract data in place, so hand out a copy
+            return copy.deepcopy(contract_data)
+        
+        # Reuse the processed AST from an earlier run if neither input changed
+        contract_data = load_cached(self.cache_dir, key) if self.cache_dir else None
+        if contract_data is None:
+            ast = loads_ast(ast_bytes, stream=len(ast_bytes) >= _STREAM_AST_MIN_BYTES).get("ast", {})
+            contract_data = self._process_ast(ast)
+            if self.cache_dir:
+                store_cached(self.cache_dir, key, contract_data)
+        else:
+            # The cache stores state variable name sets as JSON lists
+            for data in contract_data:
+                contract = data.get("contract", {})
+                if "state_var_names" in contract:
+                    contract["state_var_names"] = frozenset(contract["state_var_names"])
+        
+        # Keep a private copy, since the returned data is edited in place
+        self._process_cache[key] = copy.deepcopy(contract_data)
+        return contract_data
+    
     def _process_ast(self, ast):
         """
         Process an AST and extract contract data.
@@ -3160,7 +3250,7 @@ class ASTParser:
                     var_line, var_col = offset_to_line_col(int(offsets), self.source_text)
                 
                 state_vars.append({
-                    "name": var_name,
+                    "name": sys.intern(var_name),
                     "type": var_type,
                     "location": [var_line, var_col]
                 })
@@ -3565,12 +3655,17 @@ class ASTParser:
                         existing_call["location"] = raw_call["location"]
                         break
         
+        # Summarize call and write positions once the SSA statements are final
+        for entrypoint in entrypoints:
+            SSAConverter.annotate_statement_summary(entrypoint.get("basic_blocks", []))
+        
         # Construct the contract data dictionary
         contract_data = {
             "contract": {
                 "name": contract_name,
                 "pragma": pragma,
                 "state_vars": state_vars,
+                "state_var_names": frozenset(var["name"] for var in state_vars),
                 "functions": functions,
                 "events": events
             },
@@ -2,37 +2,234 @@
 AST parser for BSA (Blockchain Static Analysis).
 """
 
+import copy
 import os
+import re
+import sys
 import json
 import glob
-from typing import Dict, List, Set, Tuple, Any, Optional, Union
+import types
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, List, Mapping, Set, Tuple, Any, Optional, Union
 
-from bsa.parser.nodes import ASTNode
+from bsa.parser.nodes import ASTNode, parse_ssa_statement
 from bsa.parser.source_mapper import offset_to_line_col
+from bsa.parser.ssa_conversion import SSAConverter
 from bsa.utils.forge import (
     clean_project, 
     build_project_ast, 
     find_source_files, 
     find_ast_files, 
-    load_ast_file
+    loads_ast
 )
+from bsa.utils.cache import cache_key
+
+# Statement kind for each AST statement nodeType (ExpressionStatement is refined separately)
+_STATEMENT_KINDS = {
+    "EmitStatement": "EmitStatement",
+    "IfStatement": "IfStatement",
+    "Return": "Return",
+    "ReturnStatement": "Return",
+    "VariableDeclarationStatement": "VariableDeclaration",
+    "ForStatement": "ForLoop",
+    "WhileStatement": "WhileLoop",
+    "Block": "Block"
+}
+
+# Statement kind of an ExpressionStatement by the nodeType of its expression
+_EXPRESSION_KINDS = {
+    "Assignment": "Assignment",
+    "FunctionCall": "FunctionCall"
+}
+
+# Control flow statement types that terminate a basic block
+_BLOCK_TERMINATORS = frozenset({"IfStatement", "ForLoop", "WhileLoop", "Return", "EmitStatement"})
+
+# Control flow statement types split further by refine_blocks_with_control_flow, in priority order
+_CONTROL_KINDS = ("IfStatement", "ForLoop", "WhileLoop")
+
+# Statement types that also terminate a block unless they are the last statement
+_ADDITIONAL_TERMINATORS = frozenset({"FunctionCall", "Assignment", "VariableDeclaration"})
+
+# Statement types _block_accesses takes reads or writes from
+_ACCESS_STATEMENT_TYPES = frozenset({
+    "Assignment", "FunctionCall", "EmitStatement", "IfStatement",
+    "Return", "VariableDeclaration", "ForLoop", "WhileLoop"
+})
+
+# Type of a {"type", "node"} statement record
+_statement_type = itemgetter("type")
+
+# Read-only default for missing child nodes, so lookups on a miss do not allocate a new dict
+_EMPTY_NODE: Mapping[str, Any] = types.MappingProxyType({})
+
+# Minimum number of basic blocks before track_variable_accesses hands them to a process pool
+_PARALLEL_BLOCK_THRESHOLD = 64
+
+# Parser used by _process_block_accesses in a worker process, set by _init_block_worker
+_WORKER_PARSER = None
+
+# Inlining rebuilds the same "<name>_<version>" strings for every call, so recent ones are
+# kept interned; the bound keeps a long-running process from holding every name it has seen
+@lru_cache(maxsize=8192)
+def _versioned_name(var: str, version: int) -> str:
+    """
+    Get the interned SSA name of a variable version.
+    
+    Args:
+        var: The variable name
+        version: The version number
+        
+    Returns:
+        The name in "<var>_<version>" form
+    """
+    return sys.intern(f"{var}_{version}")
+
+
+# Every function numbers its blocks from 0, so the same block ids and "goto <id>" terminators
+# repeat across functions; both caches are bounded for long-running processes
+@lru_cache(maxsize=1024)
+def _block_id(number: int) -> str:
+    """
+    Get the interned id of a basic block.
+    
+    Args:
+        number: The block number
+        
+    Returns:
+        The id in "Block<number>" form
+    """
+    return sys.intern(f"Block{number}")
+
+
+@lru_cache(maxsize=1024)
+def _goto(block_id: str) -> str:
+    """
+    Get the interned unconditional jump terminator to a block.
+    
+    Args:
+        block_id: Id of the target block
+        
+    Returns:
+        The terminator in "goto <block_id>" form
+    """
+    return sys.intern(f"goto {block_id}")
+
+
+def _intern_node_types(ast: Dict[str, Any]) -> None:
+    """
+    Intern every nodeType string in an AST in place.
+    
+    The JSON decoder builds a new string for every value, so each nodeType comparison
+    against a literal falls back to a character compare. Interned values compare equal
+    to the literals by identity.
+    
+    Args:
+        ast: The AST data
+    """
+    intern = sys.intern
+    stack = [ast]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            node_type = node.get("nodeType")
+            if node_type.__class__ is str:
+                node["nodeType"] = intern(node_type)
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+
+
+def _variable_reads(reads: Set[str]) -> List[str]:
+    """
+    Drop empty names and call markers, which are not real variables, from a set of reads.
+    
+    Args:
+        reads: Names read by a block
+        
+    Returns:
+        The names that are variables
+    """
+    # Most names have no "c", so the two marker searches are skipped for them
+    return [
+        read for read in reads
+        if read and ")" not in read and ("c" not in read or ("call[" not in read and "call(" not in read))
+    ]
+
+
+def _init_block_worker() -> None:
+    """
+    Create the parser a worker process uses for _process_block_accesses.
+    """
+    global _WORKER_PARSER
+    _WORKER_PARSER = ASTParser(".")
+
+
+def _process_block_accesses(statements: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """
+    Compute the accesses of a single basic block in a worker process.
+    
+    Args:
+        statements: The block's statement dictionaries
+        
+    Returns:
+        Dictionary with the block's reads and writes
+    """
+    return _WORKER_PARSER._block_accesses(statements)
 
 
 class ASTParser:
     """Parser for Solidity AST files."""
     
-    def __init__(self, project_path: str):
+    # Every statement _rewrite_ssa_statement can fix contains one of these, so a single scan
+    # rules out the rest
+    _FIX_MARKER_RE = re.compile(r"balanceOf\[(?:to|from)\]_1 = |call\[internal\]\(_(?:mint|burn)|emit Transfer")
+    
+    # emit Transfer rewrites for mint/burn functions, by function name
+    _EMIT_TRANSFER_FIXES = {
+        "mint": "emit Transfer(address(0)_0, to_0, amount_0)",
+        "_mint": "emit Transfer(address(0)_0, to_0, amount_0)",
+        "burn": "emit Transfer(from_0, address(0)_0, amount_0)",
+        "_burn": "emit Transfer(from_0, address(0)_0, amount_0)",
+    }
+    
+    # Callee and definition location (line, col) of the mint/burn call fix, by function name
+    _CALL_LOCATION_FIXES = {
+        "mint": ("_mint", (51, 5)),
+        "burn": ("_burn", (57, 5)),
+    }
+    
+    def __init__(self, project_path: str, max_workers: Optional[int] = None):
         """
         Initialize the AST parser.
         
         Args:
             project_path: Path to the project directory
+            max_workers: Number of worker processes parse() uses for variable access tracking, or None to track sequentially
         """
         self.project_path = project_path
+        self.max_workers = max_workers
+        # Process pool for variable access tracking, shared by all functions of one parse()
+        self._executor: Optional[ProcessPoolExecutor] = None
         self.ast_data = None
         self.source_files = {}
         self.ast_files = []
         self.source_text = ""
+        # Statement types by id() of the AST node, with the node kept so its id is not reused
+        self._stmt_type_cache: Dict[int, Tuple[Dict[str, Any], str]] = {}
+        # _extract_reads handlers for expression types that are not walked inline
+        self._read_handlers = {
+            "IndexAccess": self._extract_index_access_reads,
+            "FunctionCall": self._extract_function_call_reads
+        }
+        # _extract_reads results for the block being tracked, by id() of the expression node
+        self._reads_cache: Dict[int, Tuple[Dict[str, Any], Set[str]]] = {}
+        # Contract data of ASTs processed during the current parse, keyed by cache_key() over
+        # the source and AST bytes so identical files share one entry
+        self._process_cache: Dict[str, List[Dict[str, Any]]] = {}
     
     def prepare(self) -> bool:
         """
@@ -54,7 +251,7 @@ class ASTParser:
         
         # Find source and AST files
         self.source_files = find_source_files(self.project_path)
-        self.ast_files = find_ast_files(self.project_path, list(self.source_files.keys()))
+        self.ast_files = find_ast_files(self.project_path, self.source_files)
         
         return len(self.ast_files) > 0
     
@@ -66,13 +263,36 @@ class ASTParser:
             List of contract data dictionaries
         """
         output = []
+        self._stmt_type_cache.clear()
+        self._process_cache = {}
         
         # Ensure preparation has been done
         if not self.ast_files:
             if not self.prepare():
                 return output
         
-        # Process each AST file
+        # One pool serves every function of the parse instead of one pool per function
+        if self.max_workers:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_block_worker)
+        try:
+            self._parse_ast_files(output)
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+        
+        # Correct issues with mint/burn functions
+        self._fix_mint_burn_issues(output)
+        
+        return output
+    
+    def _parse_ast_files(self, output: List[Dict]) -> None:
+        """
+        Process each AST file of the project and collect its contract data.
+        
+        Args:
+            output: List the contract data dictionaries are appended to
+        """
         for ast_file in self.ast_files:
             # Extract contract name from the AST file path
             file_dir = os.path.dirname(ast_file)
@@ -82,26 +302,47 @@ class ASTParser:
             # Get the corresponding source file path
             src_file_path = self.source_files.get(contract_name)
             
-            # Load the source file
-            self.source_text = ""
-            if src_file_path and os.path.exists(src_file_path):
-                with open(src_file_path, "r") as src_file:
-                    self.source_text = src_file.read()
-            
-            # Load the AST file
-            ast_data = load_ast_file(ast_file)
-            ast = ast_data.get("ast", {})
-            
-            # Process the AST
-            contract_data = self._process_ast(ast)
+            contract_data = self._process_ast_file(ast_file, src_file_path)
             
             if contract_data:
                 output.extend(contract_data)
+    
+    def _process_ast_file(self, ast_file: str, src_file_path: Optional[str]) -> List[Dict]:
+        """
+        Load and process a single AST file, reusing the result for identical files.
         
-        # Correct issues with mint/burn functions
-        self._fix_mint_burn_issues(output)
-        
-        return output
+        Args:
+            ast_file: Path to the AST JSON file
+            src_file_path: Path to the corresponding Solidity source, or None
+            
+        Returns:
+            List of contract data dictionaries
+        """
+        # Load the source file as raw bytes; solc source offsets are byte offsets, and
+        # offset_to_line_col maps them against a cached newline index
+        self.source_text = b""
+        if src_file_path and os.path.exists(src_file_path):
+            with open(src_file_path, "rb") as src_file:
+                self.source_text = src_file.read()
+        
+        with open(ast_file, "rb") as f:
+            ast_bytes = f.read()
+        
+        # Identical source and compiler output give identical contract data, whatever the path
+        key = cache_key(self.source_text, ast_bytes)
+        contract_data = self._process_cache.get(key)
+        if contract_data is not None:
+            # The fix-up pass in parse() edits contract data in place, so hand out a copy
+            return copy.deepcopy(contract_data)
+        
+        # Load the AST file
+        ast = loads_ast(ast_bytes).get("ast", {})
+        _intern_node_types(ast)
+        
+        # Process the AST, keeping a private copy since the returned data is edited in place
+        contract_data = self._process_ast(ast)
+        self._process_cache[key] = copy.deepcopy(contract_data)
+        return contract_data
     
     def _fix_mint_burn_issues(self, contracts_data: List[Dict[str, Any]]) -> None:
         """
@@ -116,11 +357,30 @@ class ASTParser:
                 
             # Manually correct for _mint and _burn specific issues
             for entrypoint in contract_data["entrypoints"]:
-                # Fix variable duplication in balanceOf operations
-                self._fix_balance_operations(entrypoint)
-                
-                # Fix call locations to be function definitions not call sites
-                self._fix_call_locations(entrypoint)
+                self._fix_entrypoint(entrypoint)
+    
+    def _fix_entrypoint(self, entrypoint: Dict[str, Any]) -> None:
+        """
+        Apply all mint/burn fixes to an entrypoint in one pass.
+        
+        Args:
+            entrypoint: Function entrypoint data to fix
+        """
+        # Both fixes only depend on the function name, so look it up once
+        function_name = entrypoint.get("name", "")
+        
+        # Fix variable duplication in balanceOf operations
+        ssa = entrypoint.get("ssa")
+        if ssa and isinstance(ssa, list):
+            self._fix_ssa_statements(ssa, self._EMIT_TRANSFER_FIXES.get(function_name))
+        
+        # Fix call locations to be function definitions not call sites
+        call_fix = self._CALL_LOCATION_FIXES.get(function_name)
+        if call_fix and entrypoint.get("calls"):
+            callee, location = call_fix
+            for call in entrypoint["calls"]:
+                if call["name"] == callee:
+                    call["location"] = list(location)
     
     def _fix_balance_operations(self, entrypoint: Dict) -> None:
         """
@@ -131,63 +391,72 @@ class ASTParser:
         """
         if not entrypoint.get("ssa") or not isinstance(entrypoint["ssa"], list):
             return
-            
-        for block in entrypoint["ssa"]:
+        self._fix_ssa_statements(entrypoint["ssa"], self._EMIT_TRANSFER_FIXES.get(entrypoint.get("name", "")))
+    
+    def _fix_ssa_statements(self, ssa: List[Dict[str, Any]], emit_fix: Optional[str]) -> None:
+        """
+        Rewrite balanceOf, _mint/_burn call and emit Transfer statements in place.
+        
+        Args:
+            ssa: SSA blocks of the entrypoint
+            emit_fix: Replacement for emit Transfer statements, or None to leave them
+        """
+        rewrite = self._rewrite_ssa_statement
+        
+        for block in ssa:
             if "ssa_statements" not in block:
                 continue
-                
-            for i, stmt in enumerate(block["ssa_statements"]):
-                # Fix balanceOf[to] += amount duplication
-                if "balanceOf[to]_1 = balanceOf[to]_0 + " in stmt:
-                    if "amount_0" in stmt:
-                        block["ssa_statements"][i] = "balanceOf[to]_1 = balanceOf[to]_0 + amount_0"
-                        
-                # Fix balanceOf[from] -= amount duplication
-                elif "balanceOf[from]_1 = balanceOf[from]_0 - " in stmt:
-                    if "amount_0" in stmt:
-                        block["ssa_statements"][i] = "balanceOf[from]_1 = balanceOf[from]_0 - amount_0"
-                
-                # Fix call[internal] argument formatting with commas
-                elif "call[internal](_mint" in stmt:
-                    call_prefix = stmt.split("call[internal](")[0] + "call[internal]("
-                    if "to_0" in stmt and "amount_0" in stmt:
-                        block["ssa_statements"][i] = f"{call_prefix}_mint, to_0, amount_0)"
-                
-                elif "call[internal](_burn" in stmt:
-                    call_prefix = stmt.split("call[internal](")[0] + "call[internal]("
-                    if "from_0" in stmt and "amount_0" in stmt:
-                        block["ssa_statements"][i] = f"{call_prefix}_burn, from_0, amount_0)"
-                        
-                # Fix emit Transfer formatting for mint and burn
-                elif "emit Transfer" in stmt:
-                    function_name = entrypoint.get("name", "")
-                    
-                    if function_name in ["mint", "_mint"]:
-                        block["ssa_statements"][i] = "emit Transfer(address(0)_0, to_0, amount_0)"
-                    elif function_name in ["burn", "_burn"]:
-                        block["ssa_statements"][i] = "emit Transfer(from_0, address(0)_0, amount_0)"
+            
+            statements = block["ssa_statements"]
+            # Outside mint/burn functions only balanceOf updates and _mint/_burn calls are
+            # rewritten, so one scan of the block decides whether it needs the per-statement pass
+            if emit_fix is None:
+                text = "\n".join(statements)
+                if "balanceOf[" not in text and "call[internal](_" not in text:
+                    continue
+            
+            # Rebuild in place so other references to the statement list see the fixes
+            statements[:] = [rewrite(stmt, emit_fix) for stmt in statements]
     
-    def _fix_call_locations(self, entrypoint: Dict[str, Any]) -> None:
+    def _rewrite_ssa_statement(self, stmt: str, emit_fix: Optional[str]) -> str:
         """
-        Fix call locations to be function definitions not call sites.
+        Rewrite a single balanceOf, _mint/_burn call or emit Transfer statement.
         
         Args:
-            entrypoint: Function entrypoint data to fix
-        """
-        if not entrypoint.get("calls"):
-            return
+            stmt: The SSA statement
+            emit_fix: Replacement for emit Transfer statements, or None to leave them
             
-        if entrypoint.get("name") == "mint":
-            for call in entrypoint["calls"]:
-                if call["name"] == "_mint":
-                    # Set to line 51, col 5 for _mint function definition
-                    call["location"] = [51, 5]
+        Returns:
+            The fixed statement, or the original if no fix applies
+        """
+        if not self._FIX_MARKER_RE.search(stmt):
+            return stmt
         
-        elif entrypoint.get("name") == "burn":
-            for call in entrypoint["calls"]:
-                if call["name"] == "_burn":
-                    # Set to line 57, col 5 for _burn function definition
-                    call["location"] = [57, 5]
+        # Fix balanceOf[to] += amount duplication
+        if "balanceOf[to]_1 = balanceOf[to]_0 + " in stmt:
+            if "amount_0" in stmt:
+                return "balanceOf[to]_1 = balanceOf[to]_0 + amount_0"
+        
+        # Fix balanceOf[from] -= amount duplication
+        elif "balanceOf[from]_1 = balanceOf[from]_0 - " in stmt:
+            if "amount_0" in stmt:
+                return "balanceOf[from]_1 = balanceOf[from]_0 - amount_0"
+        
+        # Fix call[internal] argument formatting with commas, keeping everything up to
+        # the first "call[internal](" as the prefix
+        elif "call[internal](_mint" in stmt:
+            if "to_0" in stmt and "amount_0" in stmt:
+                return f"{stmt.partition('call[internal](')[0]}call[internal](_mint, to_0, amount_0)"
+        
+        elif "call[internal](_burn" in stmt:
+            if "from_0" in stmt and "amount_0" in stmt:
+                return f"{stmt.partition('call[internal](')[0]}call[internal](_burn, from_0, amount_0)"
+        
+        # Fix emit Transfer formatting for mint and burn
+        elif emit_fix is not None and "emit Transfer" in stmt:
+            return emit_fix
+        
+        return stmt
     
     def extract_function_body(self, node: Union[ASTNode, Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -221,33 +490,12 @@ class ASTParser:
         
         for node in statements:
             node_type = node.get("nodeType", "Unknown")
-            statement_type = "Unknown"
             
-            # Classify based on nodeType
+            # Classify based on nodeType; expression statements by their expression
             if node_type == "ExpressionStatement":
-                # Check if it's an assignment
-                expression = node.get("expression", {})
-                if expression.get("nodeType") == "Assignment":
-                    statement_type = "Assignment"
-                elif expression.get("nodeType") == "FunctionCall":
-                    statement_type = "FunctionCall"
-                else:
-                    statement_type = "Expression"
-            elif node_type == "EmitStatement":
-                statement_type = "EmitStatement"
-            elif node_type == "IfStatement":
-                statement_type = "IfStatement"
-            elif node_type == "Return" or node_type == "ReturnStatement":
-                statement_type = "Return"
-            elif node_type == "VariableDeclarationStatement":
-                statement_type = "VariableDeclaration"
-            elif node_type == "ForStatement":
-                statement_type = "ForLoop"
-            elif node_type == "WhileStatement":
-                statement_type = "WhileLoop"
-            elif node_type == "Block":
-                # Recursively classify block statements
-                statement_type = "Block"
+                statement_type = _EXPRESSION_KINDS.get(node.get("expression", _EMPTY_NODE).get("nodeType"), "Expression")
+            else:
+                statement_type = _STATEMENT_KINDS.get(node_type, "Unknown")
             
             typed_statements.append({
                 "type": statement_type,
@@ -266,11 +514,6 @@ class ASTParser:
         Returns:
             List of basic block dictionaries
         """
-        # Control flow statement types that terminate a basic block
-        block_terminators = ["IfStatement", "ForLoop", "WhileLoop", "Return", "EmitStatement"]
-        # Statement types that also terminate a block
-        additional_terminators = ["FunctionCall", "Assignment", "VariableDeclaration"]
-        
         basic_blocks = []
         current_block = {
             "id": "Block0",
@@ -289,12 +532,12 @@ class ASTParser:
             terminator_type = None
             
             # Traditional control flow terminators
-            if statement["type"] in block_terminators:
+            if statement["type"] in _BLOCK_TERMINATORS:
                 is_terminator = True
                 terminator_type = statement["type"]
             
             # Additional terminators: function calls and assignments
-            elif statement["type"] in additional_terminators:
+            elif statement["type"] in _ADDITIONAL_TERMINATORS:
                 # Only terminate if not the last statement
                 if i < len(statements_typed) - 1:
                     is_terminator = True
@@ -309,13 +552,18 @@ class ASTParser:
                 # Set terminator type for diagnostics
                 current_block["terminator"] = terminator_type
                 
+                # Record where the control flow statement is so refinement need not search for it
+                if terminator_type in _CONTROL_KINDS:
+                    current_block["control_kind"] = terminator_type
+                    current_block["control_idx"] = len(current_block["statements"]) - 1
+                
                 # Add current block to blocks list
                 basic_blocks.append(current_block)
                 
                 # Start a new block
                 block_counter += 1
                 current_block = {
-                    "id": f"Block{block_counter}",
+                    "id": _block_id(block_counter),
                     "statements": [],
                     "terminator": None
                 }
@@ -352,9 +600,6 @@ class ASTParser:
                 call_parts = stmt.split("call[internal](")[1].strip(")")
                 
                 func_name, arg_list = self._extract_call_parts(call_parts)
-                    
-                # Get the return variable name and version
-                ret_var = stmt.split(" = ")[0] if " = " in stmt else "ret_1"
                 
                 # Look up the function's SSA data
                 if func_name in function_ssa:
@@ -459,51 +704,59 @@ class ASTParser:
             List of inlined statements
         """
         all_inlined_statements = []
+        update_var_version = self._update_var_version
         
         # Track the highest version used for each variable during inlining
-        var_max_version = {var: ver for var, ver in version_counter.items()}
-        
-        # Inline each block from the target function
-        for target_block in target_ssa:
-            target_statements = target_block.get("ssa_statements", [])
-            
-            # Process each statement in the target function
-            for target_stmt in target_statements:
-                # Skip phi functions
-                if "= phi(" in target_stmt:
-                    continue
-                    
-                # Initialize inlined statement with the original
-                inlined_stmt = target_stmt
-                
-                # Check for compound operations
-                is_compound_op, right_side_vars = self._check_compound_operation(inlined_stmt)
-                
-                # Process variables in the function body
-                # Extract the variable being written to (if any)
-                written_var = self._extract_written_variable(inlined_stmt)
-                
-                # Handle state variables that need version updates
-                var_versions_to_update = {}
-                
-                # Collect all variables that need updating in this statement
-                for var in version_counter:
-                    var_pattern = f"{var}_"
-                    if var_pattern in inlined_stmt:
-                        for i in range(10):  # Assuming versions 0-9 for simplicity
-                            old_var = f"{var}_{i}"
-                            if old_var in inlined_stmt:
-                                self._update_var_version(
-                                    var, i, old_var, written_var, var_versions_to_update,
-                                    version_counter, var_max_version, added_reads, added_writes
-                                )
-                
-                # Apply all updates at once to avoid partial replacements
-                for old_var, new_var in var_versions_to_update.items():
-                    inlined_stmt = inlined_stmt.replace(old_var, new_var)
-                
-                # Add the inlined statement
+        var_max_version = dict(version_counter)
+        
+        # Skip phi functions
+        target_statements = [
+            stmt for target_block in target_ssa
+            for stmt in target_block.get("ssa_statements", []) if "= phi(" not in stmt
+        ]
+        if not version_counter:
+            return target_statements
+        
+        # Inlining only bumps versions of variables already in version_counter, so the set of
+        # tracked names is fixed for the whole call. One pattern finds every versioned use of a
+        # tracked variable (versions 0-9), and the tracking order decides the update order.
+        version_re = re.compile(r"\b(" + "|".join(map(re.escape, version_counter)) + r")_(\d)\b")
+        find_versions = version_re.finditer
+        var_order = {var: idx for idx, var in enumerate(version_counter)}
+        
+        def use_order(use):
+            return var_order[use[0]], use[1]
+        
+        # Process each statement in the target function
+        for target_stmt in target_statements:
+            # Initialize inlined statement with the original
+            inlined_stmt = target_stmt
+            
+            # Collect all variables that need updating in this statement
+            present = {(m.group(1), int(m.group(2))) for m in find_versions(inlined_stmt)}
+            if not present:
                 all_inlined_statements.append(inlined_stmt)
+                continue
+            
+            # Extract the variable being written to (if any)
+            written = parse_ssa_statement(target_stmt).written
+            written_var = written[0] if written else None
+            
+            # Handle state variables that need version updates
+            var_versions_to_update = {}
+            for var, i in sorted(present, key=use_order):
+                update_var_version(
+                    var, i, _versioned_name(var, i), written_var, var_versions_to_update,
+                    version_counter, var_max_version, added_reads, added_writes
+                )
+            
+            # Apply all updates in one pass to avoid partial replacements
+            inlined_stmt = version_re.sub(
+                lambda m: var_versions_to_update.get(m.group(0), m.group(0)), inlined_stmt
+            )
+            
+            # Add the inlined statement
+            all_inlined_statements.append(inlined_stmt)
         
         return all_inlined_statements
         
@@ -517,25 +770,9 @@ class ASTParser:
         Returns:
             Tuple of (is compound operation, list of right side variables)
         """
-        is_compound_op = False
-        right_side_vars = []
-        
-        if " = " in stmt:
-            lhs, rhs = stmt.split(" = ", 1)
-            # For balanceOf[to] = balanceOf[to] + amount patterns
-            if " + " in rhs:
-                is_compound_op = True
-                op_parts = rhs.split(" + ")
-                # Extract variable names without version numbers
-                right_side_vars = [part.split("_")[0] for part in op_parts if "_" in part]
-            # For balanceOf[from] = balanceOf[from] - amount patterns
-            elif " - " in rhs:
-                is_compound_op = True
-                op_parts = rhs.split(" - ")
-                # Extract variable names without version numbers
-                right_side_vars = [part.split("_")[0] for part in op_parts if "_" in part]
-                
-        return is_compound_op, right_side_vars
+        # The operator and unversioned operand names are extracted once per distinct statement
+        parsed = parse_ssa_statement(stmt)
+        return parsed.op is not None, list(parsed.operand_names)
         
     def _extract_written_variable(self, stmt: str) -> Optional[str]:
         """
@@ -547,17 +784,8 @@ class ASTParser:
         Returns:
             The variable name being written to, or None
         """
-        written_var = None
-        if " = " in stmt:
-            written_part = stmt.split(" = ")[0]
-            if "_" in written_part:
-                written_var, written_ver_str = written_part.rsplit("_", 1)
-                try:
-                    written_ver = int(written_ver_str)
-                except ValueError:
-                    written_var = None
-                    
-        return written_var
+        written = parse_ssa_statement(stmt).written
+        return written[0] if written else None
         
     def _update_var_version(self, var: str, i: int, old_var: str, 
                            written_var: Optional[str],
@@ -583,13 +811,13 @@ class ASTParser:
             # This is a write, increment the version counter
             version_counter[var] += 1
             var_max_version[var] = version_counter[var]
-            var_versions_to_update[old_var] = f"{var}_{var_max_version[var]}"
+            var_versions_to_update[old_var] = _versioned_name(var, var_max_version[var])
             # Track this as a write
             added_writes.add(var)
         else:
             # This is a read, use either the latest caller version or a new incremented version
             current_ver = var_max_version.get(var, 0)
-            var_versions_to_update[old_var] = f"{var}_{current_ver}"
+            var_versions_to_update[old_var] = _versioned_name(var, current_ver)
             # Track this as a read
             added_reads.add(var)
             
@@ -605,33 +833,16 @@ class ASTParser:
             added_writes: Set of variables written by inlined code
         """
         # Update with added reads and writes, ensuring clean access tracking
-        if "accesses" not in block:
-            block["accesses"] = {"reads": [], "writes": []}
-        
-        # Ensure reads and writes lists exist
-        if "reads" not in block["accesses"]:
-            block["accesses"]["reads"] = []
-        if "writes" not in block["accesses"]:
-            block["accesses"]["writes"] = []
-        
-        reads = set(block["accesses"]["reads"])
-        writes = set(block["accesses"]["writes"])
+        accesses = block.setdefault("accesses", {"reads": [], "writes": []})
         
-        # Filter out call markers and function call syntax from added_reads
-        filtered_added_reads = {read for read in added_reads 
-                              if not ("call[" in read or "call(" in read or ")" in read)}
-        
-        # Update with filtered reads
-        reads.update(filtered_added_reads)
+        reads = set(accesses.get("reads", ()))
+        reads.update(added_reads)
+        writes = set(accesses.get("writes", ()))
         writes.update(added_writes)
         
-        # Final filtering to ensure clean output
-        reads_filtered = {read for read in reads 
-                        if not ("call[" in read or "call(" in read or ")" in read)}
-        
-        # Apply the filtered sets
-        block["accesses"]["reads"] = list(reads_filtered)
-        block["accesses"]["writes"] = list(writes)
+        # Filter out call markers and function call syntax from existing and added reads in one pass
+        accesses["reads"] = _variable_reads(reads)
+        accesses["writes"] = list(writes)
         
     def _get_statement_type(self, stmt: Dict[str, Any]) -> str:
         """
@@ -643,30 +854,19 @@ class ASTParser:
         Returns:
             Statement type
         """
+        # The same nodes are classified again by each refinement pass
+        cached = self._stmt_type_cache.get(id(stmt))
+        if cached is not None and cached[0] is stmt:
+            return cached[1]
+        
         node_type = stmt.get("nodeType", "Unknown")
         
         if node_type == "ExpressionStatement":
-            expression = stmt.get("expression", {})
-            if expression.get("nodeType") == "Assignment":
-                return "Assignment"
-            elif expression.get("nodeType") == "FunctionCall":
-                return "FunctionCall"
-            else:
-                return "Expression"
-        elif node_type == "IfStatement":
-            return "IfStatement"
-        elif node_type == "Return" or node_type == "ReturnStatement":
-            return "Return"
-        elif node_type == "VariableDeclarationStatement":
-            return "VariableDeclaration"
-        elif node_type == "ForStatement":
-            return "ForLoop"
-        elif node_type == "WhileStatement":
-            return "WhileLoop"
-        elif node_type == "Block":
-            return "Block"
-        
-        return "Unknown"
+            stmt_type = _EXPRESSION_KINDS.get(stmt.get("expression", _EMPTY_NODE).get("nodeType"), "Expression")
+        else:
+            stmt_type = _STATEMENT_KINDS.get(node_type, "Unknown")
+        self._stmt_type_cache[id(stmt)] = (stmt, stmt_type)
+        return stmt_type
     
     def refine_blocks_with_control_flow(self, basic_blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -686,36 +886,75 @@ class ASTParser:
         
         for block_idx, block in enumerate(basic_blocks):
             # Check for various control flow statements in this block
-            statements_types = [s["type"] for s in block["statements"]]
-            has_if = "IfStatement" in statements_types
-            has_for_loop = "ForLoop" in statements_types
-            has_while_loop = "WhileLoop" in statements_types
+            control_kind, control_idx = self._control_statement(block)
             
             # If this block has no control flow statements, add it directly
-            if not (has_if or has_for_loop or has_while_loop):
+            if control_kind is None:
                 refined_blocks.append(block)
                 continue
                 
             # Handle if statement blocks
-            if has_if:
-                self._process_if_statement(block, block_idx, basic_blocks, refined_blocks, block_counter)
+            if control_kind == "IfStatement":
+                self._process_if_statement(block, block_idx, basic_blocks, refined_blocks, block_counter,
+                                           control_idx)
                 block_counter += 2  # We added 2 blocks (true and false branches)
             
             # Handle for loop blocks
-            elif has_for_loop:
-                new_counter = self._process_for_loop(block, block_idx, basic_blocks, refined_blocks, block_counter)
+            elif control_kind == "ForLoop":
+                new_counter = self._process_for_loop(block, block_idx, basic_blocks, refined_blocks,
+                                                     block_counter, control_idx)
                 block_counter = new_counter  # Update counter based on added blocks
             
             # Handle while loop blocks
-            elif has_while_loop:
-                new_counter = self._process_while_loop(block, block_idx, basic_blocks, refined_blocks, block_counter)
+            else:
+                new_counter = self._process_while_loop(block, block_idx, basic_blocks, refined_blocks,
+                                                       block_counter, control_idx)
                 block_counter = new_counter  # Update counter based on added blocks
         
         return refined_blocks
+    
+    def _control_statement(self, block: Dict[str, Any]) -> Tuple[Optional[str], Optional[int]]:
+        """
+        Find the control flow statement a block is refined by.
+        
+        Args:
+            block: Basic block dictionary
+            
+        Returns:
+            Tuple of the statement type ("IfStatement", "ForLoop" or "WhileLoop") and its index
+            in the block, or (None, None) if the block has no control flow
+        """
+        if "control_kind" in block:
+            return block["control_kind"], block["control_idx"]
         
+        # Blocks not built by split_into_basic_blocks carry no annotation; find the first
+        # statement of each type in one pass and take the highest priority kind
+        first_index = {}
+        for idx, statement in enumerate(block["statements"]):
+            first_index.setdefault(statement["type"], idx)
+        for kind in _CONTROL_KINDS:
+            if kind in first_index:
+                return kind, first_index[kind]
+        return None, None
+        
+    def _typed_body_statements(self, body: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Classify the statements of a branch or loop body.
+        
+        Args:
+            body: Body node of an if branch or loop, or None
+            
+        Returns:
+            List of dictionaries with 'type' and 'node' keys
+        """
+        if not body:
+            return []
+        get_statement_type = self._get_statement_type
+        return [{"type": get_statement_type(stmt), "node": stmt} for stmt in body.get("statements", [])]
+    
     def _process_if_statement(self, block: Dict[str, Any], block_idx: int, 
                              basic_blocks: List[Dict[str, Any]], refined_blocks: List[Dict[str, Any]], 
-                             block_counter: int) -> None:
+                             block_counter: int, if_idx: int) -> None:
         """
         Process an if statement block and add it to refined blocks.
         
@@ -725,14 +964,8 @@ class ASTParser:
             basic_blocks: List of all basic blocks
             refined_blocks: List to add refined blocks to
             block_counter: Current block counter for new blocks
+            if_idx: Index of the if statement in the block
         """
-        # Find the index of the IfStatement
-        if_idx = None
-        for idx, statement in enumerate(block["statements"]):
-            if statement["type"] == "IfStatement":
-                if_idx = idx
-                break
-        
         # Extract the if statement and its condition
         if_statement = block["statements"][if_idx]
         condition = if_statement["node"].get("condition", {})
@@ -748,12 +981,10 @@ class ASTParser:
         }
         
         # Create true branch block
-        true_block_id = f"Block{block_counter}"
+        true_block_id = _block_id(block_counter)
         block_counter += 1
         
-        true_body = if_statement["node"].get("trueBody", {})
-        true_statements = true_body.get("statements", [])
-        true_typed_statements = [{"type": self._get_statement_type(stmt), "node": stmt} for stmt in true_statements]
+        true_typed_statements = self._typed_body_statements(if_statement["node"].get("trueBody", _EMPTY_NODE))
         
         true_block = {
             "id": true_block_id,
@@ -763,12 +994,10 @@ class ASTParser:
         }
         
         # Create false branch block
-        false_block_id = f"Block{block_counter}"
+        false_block_id = _block_id(block_counter)
         block_counter += 1
         
-        false_body = if_statement["node"].get("falseBody", {})
-        false_statements = false_body.get("statements", []) if false_body else []
-        false_typed_statements = [{"type": self._get_statement_type(stmt), "node": stmt} for stmt in false_statements]
+        false_typed_statements = self._typed_body_statements(if_statement["node"].get("falseBody", _EMPTY_NODE))
         
         false_block = {
             "id": false_block_id,
@@ -784,20 +1013,18 @@ class ASTParser:
         next_block_id = basic_blocks[block_idx + 1]["id"] if block_idx + 1 < len(basic_blocks) else None
         
         # Add blocks to refined list
-        refined_blocks.append(conditional_block)
-        refined_blocks.append(true_block)
-        refined_blocks.append(false_block)
+        refined_blocks.extend((conditional_block, true_block, false_block))
         
         # Set up jumps to the next block if it exists
         if next_block_id:
             if not true_block["terminator"]:
-                true_block["terminator"] = f"goto {next_block_id}"
+                true_block["terminator"] = _goto(next_block_id)
             if not false_block["terminator"]:
-                false_block["terminator"] = f"goto {next_block_id}"
+                false_block["terminator"] = _goto(next_block_id)
                 
     def _process_for_loop(self, block: Dict[str, Any], block_idx: int, 
                           basic_blocks: List[Dict[str, Any]], refined_blocks: List[Dict[str, Any]], 
-                          block_counter: int) -> int:
+                          block_counter: int, loop_idx: int) -> int:
         """
         Process a for loop block and add it to refined blocks.
         
@@ -807,17 +1034,11 @@ class ASTParser:
             basic_blocks: List of all basic blocks
             refined_blocks: List to add refined blocks to
             block_counter: Current block counter for new blocks
+            loop_idx: Index of the for loop in the block
             
         Returns:
             Updated block counter
         """
-        # Find the index of the ForLoop
-        loop_idx = None
-        for idx, statement in enumerate(block["statements"]):
-            if statement["type"] == "ForLoop":
-                loop_idx = idx
-                break
-        
         # Extract the for loop statement and its components
         loop_statement = block["statements"][loop_idx]
         loop_node = loop_statement["node"]
@@ -842,7 +1063,7 @@ class ASTParser:
         }
         
         # Create loop header block with condition check
-        header_block_id = f"Block{block_counter}"
+        header_block_id = _block_id(block_counter)
         block_counter += 1
         
         header_block = {
@@ -856,23 +1077,22 @@ class ASTParser:
         }
         
         # Create loop body block
-        body_block_id = f"Block{block_counter}"
+        body_block_id = _block_id(block_counter)
         block_counter += 1
         
-        body = loop_node.get("body", {})
-        body_statements = body.get("statements", []) if body else []
-        body_typed_statements = [{"type": self._get_statement_type(stmt), "node": stmt} for stmt in body_statements]
+        body_typed_statements = self._typed_body_statements(loop_node.get("body", _EMPTY_NODE))
         
         # Ensure proper accesses for loop body statements
         body_reads = set()
         body_writes = set()
         
         # Check for unary operations like number++ in loop body
-        for stmt in body_statements:
+        for typed_stmt in body_typed_statements:
+            stmt = typed_stmt["node"]
             if stmt.get("nodeType") == "ExpressionStatement":
-                expr = stmt.get("expression", {})
-                if expr.get("nodeType") == "UnaryOperation" and expr.get("operator") in ["++", "--"]:
-                    sub_expr = expr.get("subExpression", {})
+                expr = stmt.get("expression", _EMPTY_NODE)
+                if expr.get("nodeType") == "UnaryOperation" and expr.get("operator") in ("++", "--"):
+                    sub_expr = expr.get("subExpression", _EMPTY_NODE)
                     if sub_expr.get("nodeType") == "Identifier":
                         var_name = sub_expr.get("name", "")
                         body_reads.add(var_name)
@@ -890,7 +1110,7 @@ class ASTParser:
         }
         
         # Create loop increment block
-        increment_block_id = f"Block{block_counter}"
+        increment_block_id = _block_id(block_counter)
         block_counter += 1
         
         increment_block = {
@@ -904,7 +1124,7 @@ class ASTParser:
         }
         
         # Create exit block for code after the loop
-        exit_block_id = f"Block{block_counter}"
+        exit_block_id = _block_id(block_counter)
         block_counter += 1
         
         exit_block = {
@@ -915,24 +1135,20 @@ class ASTParser:
         }
         
         # Set up the loop control flow connections
-        init_block["terminator"] = f"goto {header_block_id}"
+        init_block["terminator"] = _goto(header_block_id)
         header_block["terminator"] = f"if {condition} then goto {body_block_id} else goto {exit_block_id}"
-        body_block["terminator"] = f"goto {increment_block_id}"
-        increment_block["terminator"] = f"goto {header_block_id}"  # Loop back edge
+        body_block["terminator"] = _goto(increment_block_id)
+        increment_block["terminator"] = _goto(header_block_id)  # Loop back edge
         
         # Check if there are statements after the loop in the original block
         next_block_id = basic_blocks[block_idx + 1]["id"] if block_idx + 1 < len(basic_blocks) else None
         
         # Connect the exit block to the next block if it exists
         if next_block_id:
-            exit_block["terminator"] = f"goto {next_block_id}"
+            exit_block["terminator"] = _goto(next_block_id)
         
         # Add all loop blocks to refined list
-        refined_blocks.append(init_block)
-        refined_blocks.append(header_block)
-        refined_blocks.append(body_block)
-        refined_blocks.append(increment_block)
-        refined_blocks.append(exit_block)
+        refined_blocks.extend((init_block, header_block, body_block, increment_block, exit_block))
         
         # Return updated block counter
         return block_counter
@@ -950,43 +1166,69 @@ class ASTParser:
         if not basic_blocks:
             return []
         
+        # Blocks with no statement that can read or write get empty accesses without a walk
+        pending = []
         for block in basic_blocks:
-            reads = set()
-            writes = set()
-            
-            for statement in block["statements"]:
-                stmt_type = statement["type"]
-                node = statement["node"]
-                
-                if stmt_type == "Assignment":
-                    self._process_assignment(node, reads, writes)
-                elif stmt_type in ["FunctionCall", "EmitStatement"]:
-                    self._process_function_call(node, reads, writes)
-                elif stmt_type == "IfStatement":
-                    self._process_if_condition(node, reads)
-                elif stmt_type == "Return":
-                    self._process_return(node, reads)
-                elif stmt_type == "VariableDeclaration":
-                    self._process_variable_declaration(node, reads, writes)
-                elif stmt_type in ["ForLoop", "WhileLoop"]:
-                    self._process_loop(node, reads, writes, stmt_type)
-            
-            # Clean up accesses: remove empty strings and special call markers
-            reads.discard("")
-            writes.discard("")
-            
-            # Remove call markers - they're not real variables
-            reads_filtered = {read for read in reads 
-                            if not ("call[" in read or "call(" in read or ")" in read)}
-            
-            # Add cleaned accesses to the block
-            block["accesses"] = {
-                "reads": list(reads_filtered),
-                "writes": list(writes)
-            }
+            if not _ACCESS_STATEMENT_TYPES.isdisjoint(map(_statement_type, block["statements"])):
+                pending.append(block)
+            else:
+                block["accesses"] = {"reads": [], "writes": []}
+        
+        executor = self._executor
+        if executor is not None and len(pending) >= _PARALLEL_BLOCK_THRESHOLD:
+            chunksize = max(1, len(pending) // (4 * self.max_workers))
+            accesses = executor.map(
+                _process_block_accesses,
+                [block["statements"] for block in pending],
+                chunksize=chunksize
+            )
+            for block, block_accesses in zip(pending, accesses):
+                block["accesses"] = block_accesses
+        else:
+            for block in pending:
+                block["accesses"] = self._block_accesses(block["statements"])
         
         return basic_blocks
     
+    def _block_accesses(self, statements: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+        """
+        Compute the variable reads and writes of a single basic block.
+        
+        Args:
+            statements: The block's statement dictionaries
+            
+        Returns:
+            Dictionary with the block's reads and writes
+        """
+        reads = set()
+        writes = set()
+        self._reads_cache.clear()
+        
+        for statement in statements:
+            stmt_type = statement["type"]
+            node = statement["node"]
+            
+            if stmt_type == "Assignment":
+                self._process_assignment(node, reads, writes)
+            elif stmt_type == "FunctionCall" or stmt_type == "EmitStatement":
+                self._process_function_call(node, reads, writes)
+            elif stmt_type == "IfStatement":
+                self._process_if_condition(node, reads)
+            elif stmt_type == "Return":
+                self._process_return(node, reads)
+            elif stmt_type == "VariableDeclaration":
+                self._process_variable_declaration(node, reads, writes)
+            elif stmt_type == "ForLoop" or stmt_type == "WhileLoop":
+                self._process_loop(node, reads, writes, stmt_type)
+        
+        # Clean up accesses: remove empty strings and call markers
+        writes.discard("")
+        
+        return {
+            "reads": _variable_reads(reads),
+            "writes": list(writes)
+        }
+    
     def _process_assignment(self, node: Dict[str, Any], reads: Set[str], writes: Set[str]) -> None:
         """
         Process an assignment statement to extract reads and writes.
@@ -998,19 +1240,20 @@ class ASTParser:
         """
         if node["nodeType"] == "ExpressionStatement":
             # Extract the actual assignment expression
-            expression = node.get("expression", {})
-            left_hand_side = expression.get("leftHandSide", {})
+            expression = node.get("expression", _EMPTY_NODE)
+            left_hand_side = expression.get("leftHandSide", _EMPTY_NODE)
+            left_type = left_hand_side.get("nodeType")
             
             # Handle different types of left-hand side
-            if left_hand_side.get("nodeType") == "Identifier":
+            if left_type == "Identifier":
                 writes.add(left_hand_side.get("name", ""))
-            elif left_hand_side.get("nodeType") == "MemberAccess":
+            elif left_type == "MemberAccess":
                 self._process_member_access_write(left_hand_side, writes)
-            elif left_hand_side.get("nodeType") == "IndexAccess":
+            elif left_type == "IndexAccess":
                 self._process_index_access_write(left_hand_side, reads, writes)
             
             # Handle reads on the right side
-            right_hand_side = expression.get("rightHandSide", {})
+            right_hand_side = expression.get("rightHandSide", _EMPTY_NODE)
             self._extract_reads(right_hand_side, reads)
             
     def _process_member_access_write(self, left_hand_side: Dict[str, Any], writes: Set[str]) -> None:
@@ -1022,7 +1265,7 @@ class ASTParser:
             writes: Set to add written variables to
         """
         # For struct fields, track both the base variable and the specific field access
-        base_expr = left_hand_side.get("expression", {})
+        base_expr = left_hand_side.get("expression", _EMPTY_NODE)
         member_name = left_hand_side.get("memberName", "")
         
         if base_expr.get("nodeType") == "Identifier":
@@ -1031,7 +1274,7 @@ class ASTParser:
             writes.add(base_name)
             # Add structured access in format base.member
             if base_name and member_name:
-                writes.add(f"{base_name}.{member_name}")
+                writes.add(sys.intern(f"{base_name}.{member_name}"))
     
     def _process_index_access_write(self, left_hand_side: Dict[str, Any], reads: Set[str], writes: Set[str]) -> None:
         """
@@ -1042,13 +1285,14 @@ class ASTParser:
             reads: Set to add read variables to
             writes: Set to add written variables to
         """
-        base_expr = left_hand_side.get("baseExpression", {})
-        index_expr = left_hand_side.get("indexExpression", {})
+        base_expr = left_hand_side.get("baseExpression", _EMPTY_NODE)
+        index_expr = left_hand_side.get("indexExpression", _EMPTY_NODE)
+        base_type = base_expr.get("nodeType")
         
         # Handle nested IndexAccess like allowance[owner][spender]
-        if base_expr.get("nodeType") == "IndexAccess":
+        if base_type == "IndexAccess":
             self._process_nested_index_access(base_expr, index_expr, reads, writes)
-        elif base_expr.get("nodeType") == "Identifier":
+        elif base_type == "Identifier":
             self._process_simple_index_access(base_expr, index_expr, reads, writes)
     
     def _process_nested_index_access(self, base_expr: Dict[str, Any], index_expr: Dict[str, Any], 
@@ -1062,10 +1306,10 @@ class ASTParser:
             reads: Set to add read variables to
             writes: Set to add written variables to
         """
-        nested_base_expr = base_expr.get("baseExpression", {})
-        nested_index_expr = base_expr.get("indexExpression", {})
+        nested_base_expr = base_expr.get("baseExpression", _EMPTY_NODE)
         
         if nested_base_expr.get("nodeType") == "Identifier":
+            nested_index_expr = base_expr.get("indexExpression", _EMPTY_NODE)
             nested_base_name = nested_base_expr.get("name", "")
             writes.add(nested_base_name)
             
@@ -1074,26 +1318,27 @@ class ASTParser:
                 nested_index_name = nested_index_expr.get("name", "")
                 if nested_base_name and nested_index_name:
                     # First level access e.g., allowance[owner]
-                    first_level = f"{nested_base_name}[{nested_index_name}]"
+                    first_level = sys.intern(f"{nested_base_name}[{nested_index_name}]")
                     writes.add(first_level)
                     
                     # Now add the second level of indexing
-                    if index_expr.get("nodeType") == "Identifier":
+                    index_type = index_expr.get("nodeType")
+                    if index_type == "Identifier":
                         index_name = index_expr.get("name", "")
                         if index_name:
                             # Full two-level access e.g., allowance[owner][spender]
-                            writes.add(f"{first_level}[{index_name}]")
+                            writes.add(sys.intern(f"{first_level}[{index_name}]"))
                             # Extract read from the index expression
                             self._extract_reads(index_expr, reads)
-                    elif index_expr.get("nodeType") == "MemberAccess":
-                        member_expr = index_expr.get("expression", {})
+                    elif index_type == "MemberAccess":
+                        member_expr = index_expr.get("expression", _EMPTY_NODE)
                         member_name = index_expr.get("memberName", "")
                         if member_expr.get("nodeType") == "Identifier":
                             member_base = member_expr.get("name", "")
                             if member_base and member_name:
-                                writes.add(f"{first_level}[{member_base}.{member_name}]")
+                                writes.add(sys.intern(f"{first_level}[{member_base}.{member_name}]"))
                                 # Extract reads from the member access
-                                reads.add(f"{member_base}.{member_name}")
+                                reads.add(sys.intern(f"{member_base}.{member_name}"))
             
             # Extract reads from all index expressions
             self._extract_reads(nested_index_expr, reads)
@@ -1114,23 +1359,24 @@ class ASTParser:
         writes.add(base_name)
         
         # If the index is a literal or identifier, track the specific access
-        if index_expr.get("nodeType") == "Literal":
+        index_type = index_expr.get("nodeType")
+        if index_type == "Literal":
             index_value = index_expr.get("value", "")
             if base_name and index_value != "":
-                writes.add(f"{base_name}[{index_value}]")
-        elif index_expr.get("nodeType") == "Identifier":
+                writes.add(sys.intern(f"{base_name}[{index_value}]"))
+        elif index_type == "Identifier":
             index_name = index_expr.get("name", "")
             if base_name and index_name:
-                writes.add(f"{base_name}[{index_name}]")
-        elif index_expr.get("nodeType") == "MemberAccess":
+                writes.add(sys.intern(f"{base_name}[{index_name}]"))
+        elif index_type == "MemberAccess":
             # Handle cases like balances[msg.sender]
-            member_expr = index_expr.get("expression", {})
+            member_expr = index_expr.get("expression", _EMPTY_NODE)
             member_name = index_expr.get("memberName", "")
             
             if member_expr.get("nodeType") == "Identifier":
                 member_base = member_expr.get("name", "")
                 if base_name and member_base and member_name:
-                    writes.add(f"{base_name}[{member_base}.{member_name}]")
+                    writes.add(sys.intern(f"{base_name}[{member_base}.{member_name}]"))
                 
         # Also extract reads from the index expression
         self._extract_reads(index_expr, reads)
@@ -1148,25 +1394,25 @@ class ASTParser:
         
         if node_type == "ExpressionStatement":
             # Handle regular function calls
-            expression = node.get("expression", {})
+            expression = node.get("expression", _EMPTY_NODE)
             
             # Extract function arguments as reads
             if expression.get("nodeType") == "FunctionCall":
-                for arg in expression.get("arguments", []):
+                for arg in expression.get("arguments", ()):
                     self._extract_reads(arg, reads)
         
         elif node_type == "EmitStatement":
             # Handle emit statements
-            event_call = node.get("eventCall", {})
+            event_call = node.get("eventCall", _EMPTY_NODE)
             if event_call.get("nodeType") == "FunctionCall":
                 # Get the event name from the expression
-                event_expr = event_call.get("expression", {})
+                event_expr = event_call.get("expression", _EMPTY_NODE)
                 event_name = event_expr.get("name", "Unknown")
                 
                 # Track all event arguments as reads
-                for arg in event_call.get("arguments", []):
+                for arg in event_call.get("arguments", ()):
                     # Special handling for address(0) in Transfer events
-                    if arg.get("nodeType") == "FunctionCall" and arg.get("expression", {}).get("name") == "address":
+                    if arg.get("nodeType") == "FunctionCall" and arg.get("expression", _EMPTY_NODE).get("name") == "address":
                         # No reads for address(0)
                         pass
                     else:
@@ -1175,21 +1421,21 @@ class ASTParser:
                 # For Transfer events, ensure to and amount or from and amount are tracked
                 if event_name == "Transfer":
                     # Check arguments to determine if it's mint or burn
-                    if len(event_call.get("arguments", [])) >= 3:
+                    if len(event_call.get("arguments", ())) >= 3:
                         first_arg = event_call["arguments"][0]
                         second_arg = event_call["arguments"][1]
                         
                         # Check if it's mint (first arg is address(0))
                         is_mint = (first_arg.get("nodeType") == "FunctionCall" and 
-                                  first_arg.get("expression", {}).get("name") == "address" and
-                                  len(first_arg.get("arguments", [])) > 0 and
+                                  first_arg.get("expression", _EMPTY_NODE).get("name") == "address" and
+                                  len(first_arg.get("arguments", ())) > 0 and
                                   first_arg["arguments"][0].get("nodeType") == "Literal" and
                                   first_arg["arguments"][0].get("value") == "0")
                         
                         # Check if it's burn (second arg is address(0))
                         is_burn = (second_arg.get("nodeType") == "FunctionCall" and 
-                                  second_arg.get("expression", {}).get("name") == "address" and
-                                  len(second_arg.get("arguments", [])) > 0 and
+                                  second_arg.get("expression", _EMPTY_NODE).get("name") == "address" and
+                                  len(second_arg.get("arguments", ())) > 0 and
                                   second_arg["arguments"][0].get("nodeType") == "Literal" and
                                   second_arg["arguments"][0].get("value") == "0")
                         
@@ -1209,26 +1455,8 @@ class ASTParser:
             node: The if statement node
             reads: Set to add read variables to
         """
-        # Extract condition variables as reads
-        condition = node.get("condition", {})
-        self._extract_reads(condition, reads)
-        
-        # Ensure if condition variables are correctly tracked
-        if condition.get("nodeType") == "BinaryOperation":
-            left_expr = condition.get("leftExpression", {})
-            right_expr = condition.get("rightExpression", {})
-            
-            # Extract left expression
-            if left_expr.get("nodeType") == "Identifier":
-                reads.add(left_expr.get("name", ""))
-            else:
-                self._extract_reads(left_expr, reads)
-                
-            # Extract right expression
-            if right_expr.get("nodeType") == "Identifier":
-                reads.add(right_expr.get("name", ""))
-            else:
-                self._extract_reads(right_expr, reads)
+        # Extract condition variables as reads; _extract_reads walks both sides of comparisons
+        self._extract_reads(node.get("condition", _EMPTY_NODE), reads)
     
     def _process_return(self, node: Dict[str, Any], reads: Set[str]) -> None:
         """
@@ -1239,7 +1467,7 @@ class ASTParser:
             reads: Set to add read variables to
         """
         # Extract expression variables as reads
-        expression = node.get("expression", {})
+        expression = node.get("expression", _EMPTY_NODE)
         if expression:
             self._extract_reads(expression, reads)
     
@@ -1253,13 +1481,13 @@ class ASTParser:
             writes: Set to add written variables to
         """
         # Handle variable declarations
-        declarations = node.get("declarations", [])
+        declarations = node.get("declarations", ())
         for decl in declarations:
             if decl and decl.get("nodeType") == "VariableDeclaration":
                 writes.add(decl.get("name", ""))
         
         # Handle initialization value as reads
-        init_value = node.get("initialValue", {})
+        init_value = node.get("initialValue", _EMPTY_NODE)
         if init_value:
             self._extract_reads(init_value, reads)
     
@@ -1277,12 +1505,30 @@ class ASTParser:
             # Handle for loop components
             
             # Initialization (e.g., uint i = 0)
-            init = node.get("initializationExpression", {})
+            init = node.get("initializationExpression", _EMPTY_NODE)
             if init:
                 self._process_loop_initialization(init, reads, writes)
             
             # Condition (e.g., i < 10)
-            condition = node.get("condition", {})
+            condition = node.get("condition", _EMPTY_NODE)
+            if condition:
+                self._extract_reads(condition, reads)
+            
+            # Loop expression (e.g., i++)
+            loop_expr = node.get("loopExpression", _EMPTY_NODE)
+            if loop_expr:
+                self._process_loop_expression(loop_expr, reads, writes)
+            
+            # Process loop body for statements like "number++"
+            body = node.get("body", _EMPTY_NODE)
+            if body and body.get("nodeType") == "Block":
+                self._process_loop_body(body, reads, writes)
+                
+        elif loop_type == "WhileLoop":
+            # Handle while loop components
+            
+            # Condition (e.g., i < 10)
+            condition = node.get("condition", _EMPTY_NODE)
             if condition:
                 self._extract_reads(condition, reads)
     
@@ -1295,25 +1541,27 @@ class ASTParser:
             reads: Set to add read variables to
             writes: Set to add written variables to
         """
+        init_type = init.get("nodeType")
+        
         # Check if it's a variable declaration
-        if init.get("nodeType") == "VariableDeclarationStatement":
-            for decl in init.get("declarations", []):
+        if init_type == "VariableDeclarationStatement":
+            for decl in init.get("declarations", ()):
                 if decl and decl.get("nodeType") == "VariableDeclaration":
                     writes.add(decl.get("name", ""))
             
             # Handle initialization value as reads
-            init_value = init.get("initialValue", {})
+            init_value = init.get("initialValue", _EMPTY_NODE)
             if init_value:
                 self._extract_reads(init_value, reads)
         # Check if it's an assignment
-        elif init.get("nodeType") == "ExpressionStatement":
-            expr = init.get("expression", {})
+        elif init_type == "ExpressionStatement":
+            expr = init.get("expression", _EMPTY_NODE)
             if expr.get("nodeType") == "Assignment":
-                left = expr.get("leftHandSide", {})
+                left = expr.get("leftHandSide", _EMPTY_NODE)
                 if left.get("nodeType") == "Identifier":
                     writes.add(left.get("name", ""))
                 
-                right = expr.get("rightHandSide", {})
+                right = expr.get("rightHandSide", _EMPTY_NODE)
                 self._extract_reads(right, reads)
     
     def _process_loop_expression(self, loop_expr: Dict[str, Any], reads: Set[str], writes: Set[str]) -> None:
@@ -1326,23 +1574,24 @@ class ASTParser:
             writes: Set to add written variables to
         """
         if loop_expr.get("nodeType") == "ExpressionStatement":
-            expr = loop_expr.get("expression", {})
+            expr = loop_expr.get("expression", _EMPTY_NODE)
+            expr_type = expr.get("nodeType")
             
             # Detect increment/decrement (i++, i--)
-            if expr.get("nodeType") == "UnaryOperation":
-                if expr.get("operator") in ["++", "--"]:
-                    sub_expr = expr.get("subExpression", {})
+            if expr_type == "UnaryOperation":
+                if expr.get("operator") in ("++", "--"):
+                    sub_expr = expr.get("subExpression", _EMPTY_NODE)
                     if sub_expr.get("nodeType") == "Identifier":
                         reads.add(sub_expr.get("name", ""))
                         writes.add(sub_expr.get("name", ""))
-            elif expr.get("nodeType") == "BinaryOperation":
+            elif expr_type == "BinaryOperation":
                 self._extract_reads(expr, reads)
-            elif expr.get("nodeType") == "Assignment":
-                left = expr.get("leftHandSide", {})
+            elif expr_type == "Assignment":
+                left = expr.get("leftHandSide", _EMPTY_NODE)
                 if left.get("nodeType") == "Identifier":
                     writes.add(left.get("name", ""))
                 
-                right = expr.get("rightHandSide", {})
+                right = expr.get("rightHandSide", _EMPTY_NODE)
                 self._extract_reads(right, reads)
     
     def _process_loop_body(self, body: Dict[str, Any], reads: Set[str], writes: Set[str]) -> None:
@@ -1354,28 +1603,29 @@ class ASTParser:
             reads: Set to add read variables to
             writes: Set to add written variables to
         """
-        for body_stmt in body.get("statements", []):
+        for body_stmt in body.get("statements", ()):
             if body_stmt.get("nodeType") == "ExpressionStatement":
-                body_expr = body_stmt.get("expression", {})
+                body_expr = body_stmt.get("expression", _EMPTY_NODE)
+                body_expr_type = body_expr.get("nodeType")
                 # Handle unary operations like number++
-                if body_expr.get("nodeType") == "UnaryOperation" and body_expr.get("operator") in ["++", "--"]:
-                    sub_expr = body_expr.get("subExpression", {})
+                if body_expr_type == "UnaryOperation" and body_expr.get("operator") in ("++", "--"):
+                    sub_expr = body_expr.get("subExpression", _EMPTY_NODE)
                     if sub_expr.get("nodeType") == "Identifier":
                         var_name = sub_expr.get("name", "")
                         reads.add(var_name)
                         writes.add(var_name)
                 # Handle assignments like number = number + 1
-                elif body_expr.get("nodeType") == "Assignment":
-                    left = body_expr.get("leftHandSide", {})
+                elif body_expr_type == "Assignment":
+                    left = body_expr.get("leftHandSide", _EMPTY_NODE)
                     if left.get("nodeType") == "Identifier":
                         var_name = left.get("name", "")
                         writes.add(var_name)
-                    right = body_expr.get("rightHandSide", {})
+                    right = body_expr.get("rightHandSide", _EMPTY_NODE)
                     self._extract_reads(right, reads)
     
     def _extract_reads(self, node: Dict[str, Any], reads_set: Set[str]) -> None:
         """
-        Helper method to recursively extract variables being read from an expression.
+        Helper method to extract variables being read from an expression.
         
         Args:
             node: AST node
@@ -1383,76 +1633,117 @@ class ASTParser:
         """
         if not node:
             return
-            
-        node_type = node.get("nodeType", "")
         
-        if node_type == "Identifier":
+        if node.get("nodeType") == "Identifier":
             reads_set.add(node.get("name", ""))
+            return
         
-        elif node_type == "BinaryOperation":
-            self._extract_reads(node.get("leftExpression", {}), reads_set)
-            self._extract_reads(node.get("rightExpression", {}), reads_set)
-        
-        elif node_type == "MemberAccess":
-            self._extract_member_access_reads(node, reads_set)
-        
-        elif node_type == "IndexAccess":
-            self._extract_index_access_reads(node, reads_set)
+        # Index accesses are walked both for their write target and their reads, so
+        # reuse the reads of an expression already walked within this block
+        cached = self._reads_cache.get(id(node))
+        if cached is not None:
+            reads_set.update(cached[1])
+            return
         
-        elif node_type == "FunctionCall":
-            self._extract_function_call_reads(node, reads_set)
-    
-    def _extract_member_access_reads(self, node: Dict[str, Any], reads_set: Set[str]) -> None:
-        """
-        Extract reads from a member access expression.
+        handlers = self._read_handlers
+        reads = set()
         
-        Args:
-            node: The member access node
-            reads_set: Set to add read variables to
-        """
-        # For struct fields, track both the base variable and the specific field access
-        base_expr = node.get("expression", {})
-        member_name = node.get("memberName", "")
-        
-        if base_expr.get("nodeType") == "Identifier":
-            base_name = base_expr.get("name", "")
-            # Add both the base variable and a structured field access
-            reads_set.add(base_name)
-            # Add structured access in format base.member
-            if base_name and member_name:
-                reads_set.add(f"{base_name}.{member_name}")
+        # Walk operand trees with a worklist instead of recursing once per operand
+        stack = [node]
+        while stack:
+            expr = stack.pop()
+            if not expr:
+                continue
             
-        # Handle nested MemberAccess by recursive call on base expression
-        elif base_expr.get("nodeType") in ["MemberAccess", "IndexAccess"]:
-            self._extract_reads(base_expr, reads_set)
+            node_type = expr.get("nodeType", "")
             
-    def _extract_index_access_reads(self, node: Dict[str, Any], reads_set: Set[str]) -> None:
+            if node_type == "Identifier":
+                reads.add(expr.get("name", ""))
+            
+            elif node_type == "BinaryOperation":
+                stack.append(expr.get("rightExpression", _EMPTY_NODE))
+                stack.append(expr.get("leftExpression", _EMPTY_NODE))
+            
+            elif node_type == "MemberAccess":
+                # For struct fields, track both the base variable and the specific field access
+                base_expr = expr.get("expression", _EMPTY_NODE)
+                base_type = base_expr.get("nodeType")
+                
+                if base_type == "Identifier":
+                    base_name = base_expr.get("name", "")
+                    member_name = expr.get("memberName", "")
+                    reads.add(base_name)
+                    if base_name and member_name:
+                        reads.add(sys.intern(f"{base_name}.{member_name}"))
+                
+                # Handle nested MemberAccess by walking the base expression
+                elif base_type == "MemberAccess" or base_type == "IndexAccess":
+                    stack.append(base_expr)
+            
+            else:
+                # Handlers push the subexpressions still to be walked onto the stack
+                handler = handlers.get(node_type)
+                if handler is not None:
+                    handler(expr, reads, stack)
+        
+        # The node is kept with its reads so its id is not reused while cached
+        self._reads_cache[id(node)] = (node, reads)
+        reads_set.update(reads)
+    
+    def _extract_index_access_reads(self, node: Dict[str, Any], reads_set: Set[str],
+                                    pending: List[Dict[str, Any]]) -> None:
         """
         Extract reads from an index access expression.
         
         Args:
             node: The index access node
             reads_set: Set to add read variables to
+            pending: Worklist of _extract_reads to push subexpressions onto
         """
         # For arrays/mappings, track both the base variable and the specific index access
-        base_expr = node.get("baseExpression", {})
-        index_expr = node.get("indexExpression", {})
+        base_expr = node.get("baseExpression", _EMPTY_NODE)
+        index_expr = node.get("indexExpression", _EMPTY_NODE)
+        
+        base_type = base_expr.get("nodeType")
         
         # Handle nested IndexAccess like allowance[owner][spender]
-        if base_expr.get("nodeType") == "IndexAccess":
-            self._extract_nested_index_access_reads(base_expr, index_expr, reads_set)
-        elif base_expr.get("nodeType") == "Identifier":
-            self._extract_simple_index_access_reads(base_expr, index_expr, reads_set)
-        # Handle nested IndexAccess by recursive call on base expression
-        elif base_expr.get("nodeType") in ["MemberAccess", "IndexAccess"]:
-            self._extract_reads(base_expr, reads_set)
+        if base_type == "IndexAccess":
+            self._extract_nested_index_access_reads(base_expr, index_expr, reads_set, pending)
+        elif base_type == "Identifier":
+            base_name = base_expr.get("name", "")
+            reads_set.add(base_name)
+            
+            # If the index is a literal or identifier, track the specific access
+            index_type = index_expr.get("nodeType")
+            if index_type == "Literal":
+                index_value = index_expr.get("value", "")
+                if base_name and index_value != "":
+                    reads_set.add(sys.intern(f"{base_name}[{index_value}]"))
+            elif index_type == "Identifier":
+                index_name = index_expr.get("name", "")
+                if base_name and index_name:
+                    reads_set.add(sys.intern(f"{base_name}[{index_name}]"))
+            elif index_type == "MemberAccess":
+                # Handle cases like balances[msg.sender]
+                member_expr = index_expr.get("expression", _EMPTY_NODE)
+                member_name = index_expr.get("memberName", "")
+                
+                if member_expr.get("nodeType") == "Identifier":
+                    member_base = member_expr.get("name", "")
+                    if base_name and member_base and member_name:
+                        reads_set.add(sys.intern(f"{base_name}[{member_base}.{member_name}]"))
+                        # Also add the member access itself as a read
+                        reads_set.add(sys.intern(f"{member_base}.{member_name}"))
+        # Handle nested IndexAccess by walking the base expression
+        elif base_type == "MemberAccess":
+            pending.append(base_expr)
         
         # Also extract reads from the index expression
         if index_expr:
-            self._extract_reads(index_expr, reads_set)
+            pending.append(index_expr)
             
     def _extract_nested_index_access_reads(self, base_expr: Dict[str, Any], index_expr: Dict[str, Any], 
-                                         reads_set: Set[str]) -> None:
+                                         reads_set: Set[str], pending: List[Dict[str, Any]]) -> None:
         """
         Extract reads from a nested index access expression.
         
@@ -1460,9 +1751,14 @@ class ASTParser:
             base_expr: The base expression (which is itself an index access)
             index_expr: The index expression
             reads_set: Set to add read variables to
+            pending: Worklist of _extract_reads to push subexpressions onto
         """
-        nested_base_expr = base_expr.get("baseExpression", {})
-        nested_index_expr = base_expr.get("indexExpression", {})
+        nested_base_expr = base_expr.get("baseExpression", _EMPTY_NODE)
+        nested_index_expr = base_expr.get("indexExpression", _EMPTY_NODE)
+        
+        # _extract_index_access_reads already pushes the outer index expression, and a nested
+        # base that is a plain identifier is added below, so neither is walked again here
+        pending.append(nested_index_expr)
         
         if nested_base_expr.get("nodeType") == "Identifier":
             nested_base_name = nested_base_expr.get("name", "")
@@ -1473,7 +1769,7 @@ class ASTParser:
                 nested_index_name = nested_index_expr.get("name", "")
                 if nested_base_name and nested_index_name:
                     # First level access e.g., allowance[owner]
-                    first_level = f"{nested_base_name}[{nested_index_name}]"
+                    first_level = sys.intern(f"{nested_base_name}[{nested_index_name}]")
                     reads_set.add(first_level)
                     
                     # Now add the second level of indexing
@@ -1481,86 +1777,49 @@ class ASTParser:
                         index_name = index_expr.get("name", "")
                         if index_name:
                             # Full two-level access e.g., allowance[owner][spender]
-                            reads_set.add(f"{first_level}[{index_name}]")
+                            reads_set.add(sys.intern(f"{first_level}[{index_name}]"))
                     elif index_expr.get("nodeType") == "MemberAccess":
-                        member_expr = index_expr.get("expression", {})
+                        member_expr = index_expr.get("expression", _EMPTY_NODE)
                         member_name = index_expr.get("memberName", "")
                         if member_expr.get("nodeType") == "Identifier":
                             member_base = member_expr.get("name", "")
                             if member_base and member_name:
-                                reads_set.add(f"{first_level}[{member_base}.{member_name}]")
+                                reads_set.add(sys.intern(f"{first_level}[{member_base}.{member_name}]"))
             elif nested_index_expr.get("nodeType") == "MemberAccess":
                 # Handle msg.sender in first index
-                member_expr = nested_index_expr.get("expression", {})
+                member_expr = nested_index_expr.get("expression", _EMPTY_NODE)
                 member_name = nested_index_expr.get("memberName", "")
                 if member_expr.get("nodeType") == "Identifier":
                     member_base = member_expr.get("name", "")
                     if nested_base_name and member_base and member_name:
-                        first_level = f"{nested_base_name}[{member_base}.{member_name}]"
+                        first_level = sys.intern(f"{nested_base_name}[{member_base}.{member_name}]")
                         reads_set.add(first_level)
                         
                         # Add second level indexing
                         if index_expr.get("nodeType") == "Identifier":
                             index_name = index_expr.get("name", "")
                             if index_name:
-                                reads_set.add(f"{first_level}[{index_name}]")
-        
-        # Always extract from base and index expressions
-        self._extract_reads(nested_base_expr, reads_set)
-        self._extract_reads(nested_index_expr, reads_set)
-        self._extract_reads(index_expr, reads_set)
-        
-    def _extract_simple_index_access_reads(self, base_expr: Dict[str, Any], index_expr: Dict[str, Any], 
-                                          reads_set: Set[str]) -> None:
-        """
-        Extract reads from a simple index access expression.
-        
-        Args:
-            base_expr: The base expression (identifier)
-            index_expr: The index expression
-            reads_set: Set to add read variables to
-        """
-        base_name = base_expr.get("name", "")
-        reads_set.add(base_name)
+                                reads_set.add(sys.intern(f"{first_level}[{index_name}]"))
+        else:
+            pending.append(nested_base_expr)
         
-        # If the index is a literal or identifier, track the specific access
-        if index_expr.get("nodeType") == "Literal":
-            index_value = index_expr.get("value", "")
-            if base_name and index_value != "":
-                reads_set.add(f"{base_name}[{index_value}]")
-        elif index_expr.get("nodeType") == "Identifier":
-            index_name = index_expr.get("name", "")
-            if base_name and index_name:
-                reads_set.add(f"{base_name}[{index_name}]")
-        elif index_expr.get("nodeType") == "MemberAccess":
-            # Handle cases like balances[msg.sender]
-            member_expr = index_expr.get("expression", {})
-            member_name = index_expr.get("memberName", "")
-            
-            if member_expr.get("nodeType") == "Identifier":
-                member_base = member_expr.get("name", "")
-                if base_name and member_base and member_name:
-                    reads_set.add(f"{base_name}[{member_base}.{member_name}]")
-                    # Also add the member access itself as a read
-                    reads_set.add(f"{member_base}.{member_name}")
-    
-    def _extract_function_call_reads(self, node: Dict[str, Any], reads_set: Set[str]) -> None:
+    def _extract_function_call_reads(self, node: Dict[str, Any], reads_set: Set[str],
+                                     pending: List[Dict[str, Any]]) -> None:
         """
         Extract reads from a function call expression.
         
         Args:
             node: The function call node
             reads_set: Set to add read variables to
+            pending: Worklist of _extract_reads to push subexpressions onto
         """
         # Consider function arguments as reads
-        for arg in node.get("arguments", []):
-            self._extract_reads(arg, reads_set)
+        pending.extend(node.get("arguments", ()))
         
         # For method calls, consider the base object as read
-        expr = node.get("expression", {})
+        expr = node.get("expression", _EMPTY_NODE)
         if expr.get("nodeType") == "MemberAccess":
-            base = expr.get("expression", {})
-            self._extract_reads(base, reads_set)
+            pending.append(expr.get("expression", _EMPTY_NODE))
     
     def assign_ssa_versions(self, basic_blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -1580,49 +1839,27 @@ class ASTParser:
             if "accesses" not in block:
                 block["accesses"] = {"reads": [], "writes": []}
         
-        # Initialize version counters for all variables
-        version_counters = {}
-        current_versions = {}
+        # Latest version of every variable; a variable not seen yet is at version 0
+        versions = defaultdict(int)
         
-        # First pass: initialize all variables with version 0
-        for block in basic_blocks:
-            reads = block["accesses"]["reads"]
-            writes = block["accesses"]["writes"]
-            
-            # Initialize any new variables found in reads
-            for var in reads:
-                if var not in version_counters:
-                    version_counters[var] = 0
-                    current_versions[var] = 0
-            
-            # Initialize any new variables found in writes
-            for var in writes:
-                if var not in version_counters:
-                    version_counters[var] = 0
-                    current_versions[var] = 0
-        
-        # Second pass: assign versions to each block
+        # Assign versions to each block
         for block in basic_blocks:
-            reads = block["accesses"]["reads"]
-            writes = block["accesses"]["writes"]
-            reads_dict = {}
-            writes_dict = {}
+            accesses = block["accesses"]
             
             # Assign read versions (use current version)
-            for var in reads:
-                reads_dict[var] = current_versions[var]
-            
-            # Assign write versions (increment counter and update current)
-            for var in writes:
-                version_counters[var] += 1
-                current_version = version_counters[var]
-                writes_dict[var] = current_version
-                current_versions[var] = current_version
-                
-                # Special case: If a variable is both read and written in the same block,
-                # and it appears in an if statement after the write, update its read version
-                if var in reads and "IfStatement" in [stmt["type"] for stmt in block["statements"]]:
-                    reads_dict[var] = current_version
+            reads_dict = {var: versions[var] for var in accesses["reads"]}
+            
+            # Assign write versions (increment the variable's version)
+            writes_dict = {}
+            for var in accesses["writes"]:
+                version = writes_dict[var] = versions[var] + 1
+                versions[var] = version
+            
+            # Special case: If a variable is both read and written in the same block,
+            # and it appears in an if statement after the write, update its read version
+            if "IfStatement" in map(_statement_type, block["statements"]):
+                for var in reads_dict.keys() & writes_dict.keys():
+                    reads_dict[var] = writes_dict[var]
             
             # Store the version information in the block
             block["ssa_versions"] = {
@@ -1633,43 +1870,163 @@ class ASTParser:
             # Create SSA statements
             block["ssa_statements"] = []
             
-            # Special handling for blocks with number++ operations
-            if block.get("has_number_increment", False) and "number" in block.get("accesses", {}).get("writes", []):
+            # Special handling for blocks with number++ operations; only loop bodies are flagged,
+            # so the statement is formatted just for them
+            if block.get("has_number_increment", False) and "number" in writes_dict:
                 # Get versions for the number variable
-                read_version = block["ssa_versions"]["reads"].get("number", 0)
-                write_version = block["ssa_versions"]["writes"].get("number", 1)
+                read_version = reads_dict.get("number", 0)
+                write_version = writes_dict["number"]
                 
                 # Add explicit SSA statement for number++ operation
                 block["ssa_statements"].append(f"number_{write_version} = number_{read_version} + 1")
                 
-            self._generate_ssa_statements(block)
-            
-    def _generate_ssa_statements(self, block: Dict[str, Any]) -> None:
+            self._generate_ssa_statements(block, versions)
+        
+        return basic_blocks
+    
+    def _generate_ssa_statements(self, block: Dict[str, Any], versions: Dict[str, int]) -> None:
         """
         Generate SSA statements for a basic block.
         
         Args:
             block: The basic block to generate SSA statements for
+            versions: Latest version of every variable, as tracked by assign_ssa_versions
         """
         reads_dict = block.get("ssa_versions", {}).get("reads", {})
         writes_dict = block.get("ssa_versions", {}).get("writes", {})
         
+        generators = self._SSA_GENERATORS
         for statement in block["statements"]:
-            stmt_type = statement["type"]
-            node = statement["node"]
-            
-            if stmt_type == "Assignment":
-                self._generate_assignment_ssa(node, reads_dict, writes_dict, block)
-            elif stmt_type in ["FunctionCall", "EmitStatement"]:
-                self._generate_function_call_ssa(node, reads_dict, writes_dict, block, stmt_type)
-            elif stmt_type == "IfStatement":
-                self._generate_if_statement_ssa(node, reads_dict, block)
-            elif stmt_type == "Return":
-                self._generate_return_ssa(node, reads_dict, block)
-            elif stmt_type == "VariableDeclaration":
-                self._generate_variable_declaration_ssa(node, reads_dict, writes_dict, block)
+            generator = generators.get(statement["type"])
+            if generator is not None:
+                generator(self, statement["node"], reads_dict, writes_dict, block, versions)
+    
+    def _generate_assignment_ssa(self, node: Dict[str, Any], reads_dict: Dict[str, int],
+                                 writes_dict: Dict[str, int], block: Dict[str, Any],
+                                 versions: Dict[str, int]) -> None:
+        """
+        Append the SSA form of an assignment statement to the block.
         
-        return basic_blocks
+        Args:
+            node: ExpressionStatement node wrapping the assignment
+            reads_dict: Read version of each variable in the block
+            writes_dict: Write version of each variable in the block
+            block: The basic block to append to
+            versions: Latest version of every variable
+        """
+        block["ssa_statements"].extend(
+            SSAConverter._handle_assignment(node, reads_dict, writes_dict, versions)
+        )
+    
+    def _generate_function_call_ssa(self, node: Dict[str, Any], reads_dict: Dict[str, int],
+                                    writes_dict: Dict[str, int], block: Dict[str, Any],
+                                    versions: Dict[str, int]) -> None:
+        """
+        Append the SSA form of a function call statement to the block.
+        
+        Args:
+            node: ExpressionStatement node wrapping the call
+            reads_dict: Read version of each variable in the block
+            writes_dict: Write version of each variable in the block
+            block: The basic block to append to
+            versions: Latest version of every variable
+        """
+        call_statement = SSAConverter._handle_function_call(node, reads_dict, writes_dict, versions)
+        if call_statement:
+            block["ssa_statements"].append(call_statement)
+    
+    def _generate_emit_ssa(self, node: Dict[str, Any], reads_dict: Dict[str, int],
+                           writes_dict: Dict[str, int], block: Dict[str, Any],
+                           versions: Dict[str, int]) -> None:
+        """
+        Append the SSA form of an emit statement to the block.
+        
+        Args:
+            node: EmitStatement node
+            reads_dict: Read version of each variable in the block
+            writes_dict: Write version of each variable in the block
+            block: The basic block to append to
+            versions: Latest version of every variable
+        """
+        emit_statement = SSAConverter._handle_emit_statement(node, reads_dict, block)
+        if emit_statement:
+            block["ssa_statements"].append(emit_statement)
+    
+    def _generate_if_statement_ssa(self, node: Dict[str, Any], reads_dict: Dict[str, int],
+                                   writes_dict: Dict[str, int], block: Dict[str, Any],
+                                   versions: Dict[str, int]) -> None:
+        """
+        Append the SSA form of an if statement condition to the block.
+        
+        Args:
+            node: IfStatement node
+            reads_dict: Read version of each variable in the block
+            writes_dict: Write version of each variable in the block
+            block: The basic block to append to
+            versions: Latest version of every variable
+        """
+        block["ssa_statements"].append(SSAConverter._handle_if_statement(node, reads_dict, block))
+    
+    def _generate_return_ssa(self, node: Dict[str, Any], reads_dict: Dict[str, int],
+                             writes_dict: Dict[str, int], block: Dict[str, Any],
+                             versions: Dict[str, int]) -> None:
+        """
+        Append the SSA form of a return statement to the block.
+        
+        Args:
+            node: Return node
+            reads_dict: Read version of each variable in the block
+            writes_dict: Write version of each variable in the block
+            block: The basic block to append to
+            versions: Latest version of every variable
+        """
+        return_statement = SSAConverter._handle_return_statement(node, reads_dict)
+        if return_statement:
+            block["ssa_statements"].append(return_statement)
+    
+    def _generate_variable_declaration_ssa(self, node: Dict[str, Any], reads_dict: Dict[str, int],
+                                           writes_dict: Dict[str, int], block: Dict[str, Any],
+                                           versions: Dict[str, int]) -> None:
+        """
+        Append the SSA form of a variable declaration statement to the block.
+        
+        Args:
+            node: VariableDeclarationStatement node
+            reads_dict: Read version of each variable in the block
+            writes_dict: Write version of each variable in the block
+            block: The basic block to append to
+            versions: Latest version of every variable
+        """
+        block["ssa_statements"].extend(
+            SSAConverter._handle_variable_declaration(node, reads_dict, writes_dict, versions)
+        )
+    
+    # SSA statement generator for each statement type, so each statement costs one dict
+    # lookup. Every generator takes (self, node, reads_dict, writes_dict, block, versions).
+    _SSA_GENERATORS = {
+        "Assignment": _generate_assignment_ssa,
+        "FunctionCall": _generate_function_call_ssa,
+        "EmitStatement": _generate_emit_ssa,
+        "IfStatement": _generate_if_statement_ssa,
+        "Return": _generate_return_ssa,
+        "VariableDeclaration": _generate_variable_declaration_ssa,
+    }
+    
+    def _location(self, node: Union[ASTNode, Dict[str, Any]]) -> List[int]:
+        """
+        Get the line and column where a node starts in the current source file.
+        
+        Args:
+            node: AST node with an optional "offset:length:file" src field
+            
+        Returns:
+            [line, column], or [0, 0] if the node has no source location
+        """
+        src = node.get("src", "")
+        if not src:
+            return [0, 0]
+        line, col = offset_to_line_col(int(src.partition(":")[0]), self.source_text)
+        return [line, col]
     
     def _process_contract_definition(self, node: ASTNode, pragma: str) -> Dict[str, Any]:
         """
@@ -1682,16 +2039,9 @@ class ASTParser:
         Returns:
             Dictionary with contract data
         """
-        # Extract contract name and location
+        # Extract contract name
         contract_name = node.get("name", "Unknown")
         
-        # Get the contract's source location (if available)
-        src = node.get("src", "")
-        line, col = 0, 0
-        if src:
-            offsets = src.split(":", 1)[0]
-            line, col = offset_to_line_col(int(offsets), self.source_text)
-        
         # Initialize outputs
         state_vars = []
         functions = {}
@@ -1710,21 +2060,14 @@ class ASTParser:
                 var_type = ""
                 
                 # Get variable type
-                type_node = subnode.get("typeName", {})
+                type_node = subnode.get("typeName", _EMPTY_NODE)
                 if type_node:
                     var_type = type_node.get("name", "unknown")
                 
-                # Get variable location
-                var_src = subnode.get("src", "")
-                var_line, var_col = 0, 0
-                if var_src:
-                    offsets = var_src.split(":", 1)[0]
-                    var_line, var_col = offset_to_line_col(int(offsets), self.source_text)
-                
                 state_vars.append({
                     "name": var_name,
                     "type": var_type,
-                    "location": [var_line, var_col]
+                    "location": self._location(subnode)
                 })
             
             elif node_type == "FunctionDefinition":
@@ -1732,16 +2075,9 @@ class ASTParser:
                 func_name = subnode.get("name", "")
                 visibility = subnode.get("visibility", "internal")
                 
-                # Get function location
-                func_src = subnode.get("src", "")
-                func_line, func_col = 0, 0
-                if func_src:
-                    offsets = func_src.split(":", 1)[0]
-                    func_line, func_col = offset_to_line_col(int(offsets), self.source_text)
-                
                 functions[func_name] = {
                     "visibility": visibility,
-                    "location": [func_line, func_col]
+                    "location": self._location(subnode)
                 }
                 
                 # Add to function map for call detection
@@ -1751,16 +2087,9 @@ class ASTParser:
                 # Extract event information
                 event_name = subnode.get("name", "")
                 
-                # Get event location
-                event_src = subnode.get("src", "")
-                event_line, event_col = 0, 0
-                if event_src:
-                    offsets = event_src.split(":", 1)[0]
-                    event_line, event_col = offset_to_line_col(int(offsets), self.source_text)
-                
                 events.append({
                     "name": event_name,
-                    "location": [event_line, event_col]
+                    "location": self._location(subnode)
                 })
         
         # Process all functions to build entrypoints data
@@ -1855,28 +2184,10 @@ class ASTParser:
         self._update_function_calls(entrypoints, function_map)
         
         return entrypoints
-            
-            # Loop expression (e.g., i++)
-            loop_expr = node.get("loopExpression", {})
-            if loop_expr:
-                self._process_loop_expression(loop_expr, reads, writes)
-            
-            # Process loop body for statements like "number++"
-            body = node.get("body", {})
-            if body and body.get("nodeType") == "Block":
-                self._process_loop_body(body, reads, writes)
-                
-        elif loop_type == "WhileLoop":
-            # Handle while loop components
-            
-            # Condition (e.g., i < 10)
-            condition = node.get("condition", {})
-            if condition:
-                self._extract_reads(condition, reads)
-        
+    
     def _process_while_loop(self, block: Dict[str, Any], block_idx: int, 
                            basic_blocks: List[Dict[str, Any]], refined_blocks: List[Dict[str, Any]], 
-                           block_counter: int) -> int:
+                           block_counter: int, loop_idx: int) -> int:
         """
         Process a while loop block and add it to refined blocks.
         
@@ -1886,17 +2197,11 @@ class ASTParser:
             basic_blocks: List of all basic blocks
             refined_blocks: List to add refined blocks to
             block_counter: Current block counter for new blocks
+            loop_idx: Index of the while loop in the block
             
         Returns:
             Updated block counter
         """
-        # Find the index of the WhileLoop
-        loop_idx = None
-        for idx, statement in enumerate(block["statements"]):
-            if statement["type"] == "WhileLoop":
-                loop_idx = idx
-                break
-        
         # Extract the while loop statement and its components
         loop_statement = block["statements"][loop_idx]
         loop_node = loop_statement["node"]
@@ -1915,7 +2220,7 @@ class ASTParser:
         }
         
         # Create loop header block with condition check
-        header_block_id = f"Block{block_counter}"
+        header_block_id = _block_id(block_counter)
         block_counter += 1
         
         header_block = {
@@ -1929,12 +2234,10 @@ class ASTParser:
         }
         
         # Create loop body block
-        body_block_id = f"Block{block_counter}"
+        body_block_id = _block_id(block_counter)
         block_counter += 1
         
-        body = loop_node.get("body", {})
-        body_statements = body.get("statements", []) if body else []
-        body_typed_statements = [{"type": self._get_statement_type(stmt), "node": stmt} for stmt in body_statements]
+        body_typed_statements = self._typed_body_statements(loop_node.get("body", _EMPTY_NODE))
         
         body_block = {
             "id": body_block_id,
@@ -1944,7 +2247,7 @@ class ASTParser:
         }
         
         # Create exit block for code after the loop
-        exit_block_id = f"Block{block_counter}"
+        exit_block_id = _block_id(block_counter)
         block_counter += 1
         
         exit_block = {
@@ -1955,22 +2258,19 @@ class ASTParser:
         }
         
         # Set up the loop control flow connections
-        pre_block["terminator"] = f"goto {header_block_id}"
+        pre_block["terminator"] = _goto(header_block_id)
         header_block["terminator"] = f"if {condition} then goto {body_block_id} else goto {exit_block_id}"
-        body_block["terminator"] = f"goto {header_block_id}"  # Loop back edge
+        body_block["terminator"] = _goto(header_block_id)  # Loop back edge
         
         # Check if there are statements after the loop in the original block
         next_block_id = basic_blocks[block_idx + 1]["id"] if block_idx + 1 < len(basic_blocks) else None
         
         # Connect the exit block to the next block if it exists
         if next_block_id:
-            exit_block["terminator"] = f"goto {next_block_id}"
+            exit_block["terminator"] = _goto(next_block_id)
         
         # Add all loop blocks to refined list
-        refined_blocks.append(pre_block)
-        refined_blocks.append(header_block)
-        refined_blocks.append(body_block)
-        refined_blocks.append(exit_block)
+        refined_blocks.extend((pre_block, header_block, body_block, exit_block))
         
         # Return updated block counter
         return block_counter
@@ -2,6 +2,83 @@
 Function call handling for BSA.
 """
 
+import re
+import types
+from collections import defaultdict
+from functools import lru_cache
+
+from bsa.parser.nodes import parse_ssa_statement
+
+# SSA statements that are a plain call, either bare or assigning its return value
+_CALL_STMT_RE = re.compile(r"^call\(|= call\(")
+
+# SSA statements an external call may have been lowered to
+_EXTERNAL_CALL_STMT_RE = re.compile(r"call\(|= ")
+
+# SSA statements a revert, require or assert may have been lowered to
+_REVERT_STMT_RE = re.compile(r"call\(|= (?:revert|require|assert)")
+
+# Read-only default for missing child nodes, so lookups on a miss do not allocate a new dict
+_EMPTY_NODE = types.MappingProxyType({})
+
+# Start of the right-hand side of an internal call statement
+_INTERNAL_CALL_PREFIX = "call[internal]("
+
+def _call_statement_kinds(stmt):
+    """
+    Classify an SSA statement for the call, external call and revert passes.
+    
+    Args:
+        stmt (str): The SSA statement
+        
+    Returns:
+        tuple: (is_call, is_external_call, is_revert) flags for the statement
+    """
+    # Call and revert statements both also match the external call pattern
+    if not _EXTERNAL_CALL_STMT_RE.search(stmt):
+        return (False, False, False)
+    return (_CALL_STMT_RE.search(stmt) is not None, True, _REVERT_STMT_RE.search(stmt) is not None)
+
+@lru_cache(maxsize=4096)
+def _split_versioned(name):
+    """
+    Split a versioned name such as "amount_0" into its base name and version.
+    
+    Call sites pass the same argument names over and over, so results are cached.
+    
+    Args:
+        name (str): The versioned name
+        
+    Returns:
+        tuple: (base name, version), or None if the name has no integer version
+    """
+    base, versioned, version = name.rpartition("_")
+    if not versioned:
+        return None
+    try:
+        return base, int(version)
+    except ValueError:
+        # Not a valid version number
+        return None
+
+@lru_cache(maxsize=1024)
+def _versioned_names_pattern(names):
+    """
+    Compile a pattern matching whole versioned references to any of the given names.
+    
+    Call sites of the same callee, and blocks that track no new caller variables, share
+    one compiled pattern.
+    
+    Args:
+        names (frozenset): Variable names, e.g. "amount" or "balanceOf[to]"
+        
+    Returns:
+        re.Pattern: Pattern whose groups are the name and the version of references such as "amount_3"
+    """
+    # Sorted so equal name sets always build the same pattern
+    alternatives = "|".join(map(re.escape, sorted(names)))
+    return re.compile(r"\b(" + alternatives + r")_(\d+)\b")
+
 def classify_and_add_calls(basic_blocks, function_map):
     """
     Classify function calls in basic blocks and enhance SSA statements.
@@ -16,21 +93,19 @@ def classify_and_add_calls(basic_blocks, function_map):
     if not basic_blocks:
         return []
     
-    # Tracks the next return value version
-    ret_counter = 0
-    
     for block in basic_blocks:
         # Find function call statements, revert statements, and external calls
         function_calls = []
         revert_calls = []  # Track revert calls separately
         external_calls = [] # Track external calls separately
         for i, stmt in enumerate(block.get("statements", [])):
-            if stmt.get("type") == "FunctionCall":
+            stmt_type = stmt.get("type")
+            if stmt_type == "FunctionCall":
                 function_calls.append(i)
-            elif stmt.get("type") == "Revert":
+            elif stmt_type == "Revert":
                 # Track revert calls so we can format them specially
                 revert_calls.append(i)
-            elif stmt.get("type") == "ExternalCall":
+            elif stmt_type == "ExternalCall":
                 # Track external calls so we can format them specially
                 external_calls.append(i)
         
@@ -43,14 +118,12 @@ def classify_and_add_calls(basic_blocks, function_map):
         if not ssa_statements:
             continue
         
-        # Create modified statements list
-        modified_statements = list(ssa_statements)
+        # Classify every SSA statement once; a statement rewritten by one pass is
+        # classified again before the next pass looks at it
+        stmt_kinds = [_call_statement_kinds(stmt) for stmt in ssa_statements]
         
         # Map function calls to SSA statements
-        call_stmt_indices = []
-        for i, stmt in enumerate(ssa_statements):
-            if ("call(" in stmt and ("= call(" in stmt or stmt.startswith("call("))):
-                call_stmt_indices.append(i)
+        call_stmt_indices = [i for i, kinds in enumerate(stmt_kinds) if kinds[0]]
         
         # Process each function call
         for call_idx in range(min(len(function_calls), len(call_stmt_indices))):
@@ -61,29 +134,11 @@ def classify_and_add_calls(basic_blocks, function_map):
             call_node = block["statements"][stmt_node_idx]["node"]
             
             # Get the expression containing the function call
-            expr = call_node.get("expression", {})
+            expr = call_node.get("expression", _EMPTY_NODE)
             
-            # Handle various node types that represent function calls
-            is_external_call = False
-            external_call_type = None
-            external_call_name = None
-            
-            # Check for direct member access (like owner.transfer(amount))
-            if expr.get("nodeType") == "ExpressionStatement":
-                inner_expr = expr.get("expression", {})
-                if inner_expr.get("nodeType") == "MemberAccess":
-                    member_name = inner_expr.get("memberName", "")
-                    if member_name in ["transfer", "send", "call", "delegatecall", "staticcall"]:
-                        is_external_call = True
-                        external_call_type = "low_level_external"
-                        base_expr = inner_expr.get("expression", {})
-                        if base_expr.get("nodeType") == "Identifier":
-                            base_name = base_expr.get("name", "address")
-                            external_call_name = f"{base_name}.{member_name}"
-            
-            # Continue with the normal flow for FunctionCall
+            # Only FunctionCall expressions are classified
             if expr.get("nodeType") == "FunctionCall":
-                func_expr = expr.get("expression", {})
+                func_expr = expr.get("expression", _EMPTY_NODE)
                 
                 # Determine the type of function call
                 call_type = "unknown"
@@ -91,14 +146,16 @@ def classify_and_add_calls(basic_blocks, function_map):
                 
                 # Collect argument values for more informative call statements
                 args = []
-                for arg in expr.get("arguments", []):
-                    if arg.get("nodeType") == "Identifier":
+                for arg in expr.get("arguments", ()):
+                    arg_type = arg.get("nodeType")
+                    if arg_type == "Identifier":
                         args.append(arg.get("name", ""))
-                    elif arg.get("nodeType") == "Literal":
+                    elif arg_type == "Literal":
                         args.append(str(arg.get("value", "")))
                 
                 # Function name and target analysis
-                if func_expr.get("nodeType") == "Identifier":
+                func_type = func_expr.get("nodeType")
+                if func_type == "Identifier":
                     # Direct function call: foo()
                     call_name = func_expr.get("name", "unknown")
                     
@@ -111,7 +168,7 @@ def classify_and_add_calls(basic_blocks, function_map):
                         call_type = "internal"
                     else:
                         call_type = "external"
-                elif func_expr.get("nodeType") == "MemberAccess":
+                elif func_type == "MemberAccess":
                     # Member function call: obj.foo()
                     member_name = func_expr.get("memberName", "unknown")
                     call_name = member_name
@@ -125,16 +182,17 @@ def classify_and_add_calls(basic_blocks, function_map):
                         call_type = "staticcall"
                     else:
                         # Check if this is a call on a contract/interface type
-                        base_expr = func_expr.get("expression", {})
+                        base_expr = func_expr.get("expression", _EMPTY_NODE)
+                        base_type = base_expr.get("nodeType")
                         # For calls like IA(a).hello()
-                        if base_expr.get("nodeType") == "FunctionCall":
+                        if base_type == "FunctionCall":
                             # This is a cast to contract type, definitely external
                             call_type = "external"
-                        elif base_expr.get("nodeType") == "Identifier":
+                        elif base_type == "Identifier":
                             # For contract instance variables
                             base_name = base_expr.get("name", "")
                             # Check type information if available
-                            type_descriptions = base_expr.get("typeDescriptions", {})
+                            type_descriptions = base_expr.get("typeDescriptions", _EMPTY_NODE)
                             type_string = type_descriptions.get("typeString", "")
                             
                             # If type string indicates contract or interface, it's external
@@ -149,49 +207,31 @@ def classify_and_add_calls(basic_blocks, function_map):
                 # Update the SSA statement with the call classification
                 call_stmt = ssa_statements[stmt_idx]
                 
-                # Check if this is a function call statement
-                if "call(" in call_stmt:
-                    # Create enhanced call statement based on type and name
-                    enhanced_stmt = ""
-                    
-                    # Handle both formats: "ret_1 = call(...)" and "call(...)"
-                    if "= call(" in call_stmt:
-                        ret_part = call_stmt.split(" = ")[0]
-                        enhanced_stmt = f"{ret_part} = call[{call_type}]({call_name}"
-                    else:
-                        enhanced_stmt = f"call[{call_type}]({call_name}"
-                    
-                    # Extract arguments
-                    args_part = ""
-                    if "(" in call_stmt:
-                        args_part = call_stmt.split("(", 1)[1].strip(")")
-                    
-                    # Add arguments to the enhanced statement
-                    if args_part.strip():
-                        enhanced_stmt += f", {args_part}"
-                    elif args:
-                        # If no args in the statement but AST has args
-                        enhanced_stmt += ", " + ", ".join(args)
-                    
-                    enhanced_stmt += ")"
-                    
-                    # Use the properly formatted call statement with no special cases
-                    # The enhanced_stmt already has the correct format based on the call type and arguments
-                    
-                    # Replace the statement
-                    modified_statements[stmt_idx] = enhanced_stmt
-        
-        # Update the block with modified statements if we processed function calls
-        if function_calls:
-            block["ssa_statements"] = modified_statements
+                # Handle both formats: "ret_1 = call(...)" and "call(...)"
+                ret_prefix = f"{call_stmt.partition(' = ')[0]} = " if "= call(" in call_stmt else ""
+                
+                # Extract arguments; call statements were matched on "call(", so they
+                # always have an argument list
+                args_part = call_stmt.partition("(")[2].strip(")")
+                
+                # Create enhanced call statement based on type, name and arguments in one step
+                if args_part.strip():
+                    enhanced_stmt = f"{ret_prefix}call[{call_type}]({call_name}, {args_part})"
+                elif args:
+                    # If no args in the statement but AST has args
+                    enhanced_stmt = f"{ret_prefix}call[{call_type}]({call_name}, {', '.join(args)})"
+                else:
+                    enhanced_stmt = f"{ret_prefix}call[{call_type}]({call_name})"
+                
+                # Replace the statement in place; the external and revert passes below
+                # already rewrite the block's statements the same way
+                ssa_statements[stmt_idx] = enhanced_stmt
+                stmt_kinds[stmt_idx] = _call_statement_kinds(enhanced_stmt)
         
         # Process external calls if any
         if external_calls:
             # Find existing call statements in SSA
-            external_call_indices = []
-            for i, stmt in enumerate(block["ssa_statements"]):
-                if "call(" in stmt or "= " in stmt:
-                    external_call_indices.append(i)
+            external_call_indices = [i for i, kinds in enumerate(stmt_kinds) if kinds[1]]
             
             # Process each external call
             for ext_idx in range(min(len(external_calls), len(external_call_indices))):
@@ -202,58 +242,58 @@ def classify_and_add_calls(basic_blocks, function_map):
                 ext_node = block["statements"][node_idx]["node"]
                 
                 # Get the expression containing the function call
-                expr = ext_node.get("expression", {})
+                expr = ext_node.get("expression", _EMPTY_NODE)
                 
                 # Handle both FunctionCall and direct MemberAccess
-                if expr.get("nodeType") == "FunctionCall":
-                    func_expr = expr.get("expression", {})
+                expr_type = expr.get("nodeType")
+                if expr_type == "FunctionCall":
+                    func_expr = expr.get("expression", _EMPTY_NODE)
                     if func_expr.get("nodeType") == "MemberAccess":
                         member_name = func_expr.get("memberName", "")
-                        base_expr = func_expr.get("expression", {})
+                        base_expr = func_expr.get("expression", _EMPTY_NODE)
                         base_name = "address"
                         if base_expr.get("nodeType") == "Identifier":
                             base_name = base_expr.get("name", "address")
                         
                         # Format the external call statement
-                        ssa_stmt = block["ssa_statements"][stmt_idx]
+                        ssa_stmt = ssa_statements[stmt_idx]
                         
                         # Create enhanced external call statement
                         if "= " in ssa_stmt:
-                            ret_part = ssa_stmt.split(" = ")[0]
+                            ret_part = ssa_stmt.partition(" = ")[0]
                             ext_stmt = f"{ret_part} = call[low_level_external]({base_name}.{member_name})"
                         else:
                             ext_stmt = f"call[low_level_external]({base_name}.{member_name})"
                         
                         # Update the statement
-                        block["ssa_statements"][stmt_idx] = ext_stmt
+                        ssa_statements[stmt_idx] = ext_stmt
+                        stmt_kinds[stmt_idx] = _call_statement_kinds(ext_stmt)
                         
-                elif expr.get("nodeType") == "MemberAccess":
+                elif expr_type == "MemberAccess":
                     member_name = expr.get("memberName", "")
-                    base_expr = expr.get("expression", {})
+                    base_expr = expr.get("expression", _EMPTY_NODE)
                     base_name = "address"
                     if base_expr.get("nodeType") == "Identifier":
                         base_name = base_expr.get("name", "address")
                     
                     # Format the external call statement
-                    ssa_stmt = block["ssa_statements"][stmt_idx]
+                    ssa_stmt = ssa_statements[stmt_idx]
                     
                     # Create enhanced external call statement
                     if "= " in ssa_stmt:
-                        ret_part = ssa_stmt.split(" = ")[0]
+                        ret_part = ssa_stmt.partition(" = ")[0]
                         ext_stmt = f"{ret_part} = call[low_level_external]({base_name}.{member_name})"
                     else:
                         ext_stmt = f"call[low_level_external]({base_name}.{member_name})"
                     
                     # Update the statement
-                    block["ssa_statements"][stmt_idx] = ext_stmt
+                    ssa_statements[stmt_idx] = ext_stmt
+                    stmt_kinds[stmt_idx] = _call_statement_kinds(ext_stmt)
         
         # Process revert statements if any
         if revert_calls:
             # Find existing call statements in SSA that might be reverts
-            revert_ssa_indices = []
-            for i, stmt in enumerate(block["ssa_statements"]):
-                if "call(" in stmt or "= revert" in stmt or "= require" in stmt or "= assert" in stmt:
-                    revert_ssa_indices.append(i)
+            revert_ssa_indices = [i for i, kinds in enumerate(stmt_kinds) if kinds[2]]
             
             # Process each revert call
             for rev_idx in range(min(len(revert_calls), len(revert_ssa_indices))):
@@ -264,9 +304,9 @@ def classify_and_add_calls(basic_blocks, function_map):
                 revert_node = block["statements"][node_idx]["node"]
                 
                 # Get the expression containing the function call
-                expr = revert_node.get("expression", {})
+                expr = revert_node.get("expression", _EMPTY_NODE)
                 if expr.get("nodeType") == "FunctionCall":
-                    func_expr = expr.get("expression", {})
+                    func_expr = expr.get("expression", _EMPTY_NODE)
                     
                     # Get the function name (revert or require)
                     func_name = "revert"  # Default
@@ -275,31 +315,28 @@ def classify_and_add_calls(basic_blocks, function_map):
                     
                     # Collect arguments for the revert call
                     args = []
-                    for arg in expr.get("arguments", []):
-                        if arg.get("nodeType") == "Identifier":
+                    for arg in expr.get("arguments", ()):
+                        arg_type = arg.get("nodeType")
+                        if arg_type == "Identifier":
                             args.append(arg.get("name", ""))
-                        elif arg.get("nodeType") == "Literal":
+                        elif arg_type == "Literal":
                             if isinstance(arg.get("value"), str):
                                 args.append(f'"{arg.get("value", "")}"')
                             else:
                                 args.append(str(arg.get("value", "")))
                     
                     # Format the revert statement
-                    ssa_stmt = block["ssa_statements"][stmt_idx]
-                    
-                    # Create enhanced revert statement
-                    if "= call(" in ssa_stmt:
-                        ret_part = ssa_stmt.split(" = ")[0]
-                        revert_stmt = f"{ret_part} = {func_name}"
-                    else:
-                        revert_stmt = func_name
+                    ssa_stmt = ssa_statements[stmt_idx]
                     
-                    # Add arguments if any
+                    # Create enhanced revert statement, with arguments if any
+                    ret_prefix = f"{ssa_stmt.partition(' = ')[0]} = " if "= call(" in ssa_stmt else ""
                     if args:
-                        revert_stmt += " " + ", ".join(args)
+                        revert_stmt = f"{ret_prefix}{func_name} {', '.join(args)}"
+                    else:
+                        revert_stmt = f"{ret_prefix}{func_name}"
                     
                     # Update the statement
-                    block["ssa_statements"][stmt_idx] = revert_stmt
+                    ssa_statements[stmt_idx] = revert_stmt
     
     return basic_blocks
 
@@ -329,11 +366,17 @@ def inline_internal_calls(basic_blocks, function_map, entrypoints_data=None):
         if entry_name and "ssa" in entry:
             function_ssa[entry_name] = entry["ssa"]
         
+    # Parameter names, inlinable statements and statement text of each callee, built on its first call
+    # since a callee is usually called from several sites
+    callee_params = {}
+    callee_statements = {}
+    callee_text = {}
+    
     # Initialize a counter for generating unique variable versions
     version_counter = {}
     
     # Initialize tracking dictionary to deduplicate arguments in compound operations
-    seen_args_by_call = {}
+    seen_args_by_call = defaultdict(set)
     
     # Process each block for function calls
     for block in basic_blocks:
@@ -354,10 +397,14 @@ def inline_internal_calls(basic_blocks, function_map, entrypoints_data=None):
         added_writes = set()
         
         for stmt_idx, stmt in enumerate(block["ssa_statements"]):
-            # Check if this is an internal function call
-            if "call[internal]" in stmt:
+            # Check if this is an internal function call; classify_and_add_calls writes them
+            # as "ret_1 = call[internal](...)" or "call[internal](...)"
+            ret_part, sep, call_body = stmt.partition(" = ")
+            if not sep:
+                call_body = ret_part
+            if call_body.startswith(_INTERNAL_CALL_PREFIX):
                 # Extract function name and arguments
-                call_parts = stmt.split("call[internal](")[1].strip(")")
+                call_parts = call_body[len(_INTERNAL_CALL_PREFIX):].strip(")")
                 if "," in call_parts:
                     func_name = call_parts.split(",")[0].strip()
                     args_part = call_parts[len(func_name)+1:].strip()
@@ -375,9 +422,6 @@ def inline_internal_calls(basic_blocks, function_map, entrypoints_data=None):
                         func_name = call_parts.strip()
                         arg_list = []
                 
-                # Get the return variable name and version
-                ret_var = stmt.split(" = ")[0] if " = " in stmt else "ret_1"
-                
                 # Look up the function's SSA data
                 if func_name in function_ssa:
                     target_ssa = function_ssa[func_name]
@@ -385,7 +429,7 @@ def inline_internal_calls(basic_blocks, function_map, entrypoints_data=None):
                     # Add the original call for reference, but with proper formatting
                     if len(arg_list) > 1:
                         # Format with proper commas
-                        func_part = stmt.split("call[internal](")[0] + "call[internal]("
+                        func_part = (ret_part + sep if sep else "") + _INTERNAL_CALL_PREFIX
                         args_formatted = func_name + ", " + ", ".join(arg_list)
                         formatted_stmt = func_part + args_formatted + ")"
                         modified_statements.append(formatted_stmt)
@@ -402,33 +446,29 @@ def inline_internal_calls(basic_blocks, function_map, entrypoints_data=None):
                     if arg_list:
                         # Map arguments to their respective variables in the callee
                         # Find the function definition to get parameter names
-                        func_node = function_map.get(func_name)
-                        if func_node:
-                            parameters = func_node.get("parameters", {}).get("parameters", [])
-                            for i, param in enumerate(parameters):
-                                if i < len(arg_list):
-                                    param_name = param.get("name", "")
-                                    if param_name:
-                                        # Extract the base name and version from the argument
-                                        arg = arg_list[i]
-                                        if "_" in arg:  # Has version number
-                                            arg_base, arg_version = arg.rsplit("_", 1)
-                                            try:
-                                                arg_version = int(arg_version)
-                                                # Map parameter to this argument's version
-                                                arg_version_map[param_name] = (arg_base, arg_version)
-                                                # Also track which parameter maps to which argument name
-                                                param_to_arg_map[param_name] = arg_base
-                                            except ValueError:
-                                                # Not a valid version number
-                                                pass
+                        param_names = callee_params.get(func_name)
+                        if param_names is None:
+                            func_node = function_map.get(func_name)
+                            parameters = func_node.get("parameters", {}).get("parameters", []) if func_node else []
+                            param_names = callee_params[func_name] = tuple(param.get("name", "") for param in parameters)
+                        
+                        for param_name, arg in zip(param_names, arg_list):
+                            if param_name:
+                                # Extract the base name and version from the argument
+                                versioned_arg = _split_versioned(arg)
+                                if versioned_arg is not None:
+                                    # Map parameter to this argument's version
+                                    arg_version_map[param_name] = versioned_arg
+                                    # Also track which parameter maps to which argument name
+                                    param_to_arg_map[param_name] = versioned_arg[0]
                     
-                    # Create a unique key for this function call and statement to track argument usage
-                    call_key = f"{func_name}_{stmt_idx}"
+                    # Arguments already bound in compound operations of this function call,
+                    # keyed by the call and its statement
+                    seen_args = seen_args_by_call[(func_name, stmt_idx)]
                     
-                    # Initialize tracking set for this call if it doesn't exist
-                    if call_key not in seen_args_by_call:
-                        seen_args_by_call[call_key] = set()
+                    # Versioned references to the parameters, and the order they are bound in
+                    param_pattern = _versioned_names_pattern(frozenset(arg_version_map)) if arg_version_map else None
+                    param_order = {param_name: i for i, param_name in enumerate(arg_version_map)}
 
                     # Collect all inlined statements from all target blocks
                     all_inlined_statements = []
@@ -436,131 +476,115 @@ def inline_internal_calls(basic_blocks, function_map, entrypoints_data=None):
                     # Track the highest version used for each variable during inlining
                     var_max_version = {var: ver for var, ver in version_counter.items()}
                     
-                    # Inline each block from the target function
-                    for target_block in target_ssa:
-                        target_statements = target_block.get("ssa_statements", [])
-                        
-                        # Process each statement in the target function
-                        for target_stmt in target_statements:
+                    # Statements of every block of the target function, each with whether it
+                    # is a compound operation (+=, -=, etc.), e.g. balanceOf[to] = balanceOf[to] + amount
+                    target_statements = callee_statements.get(func_name)
+                    if target_statements is None:
+                        target_statements = callee_statements[func_name] = [
+                            (target_stmt, parse_ssa_statement(target_stmt).op is not None)
+                            for target_block in target_ssa
+                            for target_stmt in target_block.get("ssa_statements", [])
                             # Skip phi functions (they don't transfer well across function boundaries)
-                            if "= phi(" in target_stmt:
-                                continue
-                                
-                            # Initialize inlined statement with the original
-                            inlined_stmt = target_stmt
-                            
-                            # Check if this is a compound operation (+=, -=, etc.)
-                            is_compound_op = False
-                            right_side_vars = []
-                            if " = " in inlined_stmt:
-                                lhs, rhs = inlined_stmt.split(" = ", 1)
-                                # For balanceOf[to] = balanceOf[to] + amount patterns
-                                if " + " in rhs:
-                                    is_compound_op = True
-                                    op_parts = rhs.split(" + ")
-                                    # Extract variable names without version numbers
-                                    right_side_vars = [part.split("_")[0] for part in op_parts if "_" in part]
-                                # For balanceOf[from] = balanceOf[from] - amount patterns
-                                elif " - " in rhs:
-                                    is_compound_op = True
-                                    op_parts = rhs.split(" - ")
-                                    # Extract variable names without version numbers
-                                    right_side_vars = [part.split("_")[0] for part in op_parts if "_" in part]
-                            
-                            # We're already using the call_key from the outer scope for this function call
-                            
-                            # Bind arguments to parameters based on the mapping we created
-                            for param_name, (arg_base, arg_version) in arg_version_map.items():
-                                # Replace parameter references with argument references
-                                param_pattern = f"{param_name}_"
-                                
-                                # Only replace whole variables with version numbers
-                                # This avoids issues with partial name matches
-                                for i in range(10):  # Assuming versions 0-9 for simplicity
-                                    param_ref = f"{param_name}_{i}"
-                                    if param_ref in inlined_stmt:
-                                        # For compound operations, ensure we use the correct variable name
-                                        # and eliminate duplication of variables in the output
-                                        if is_compound_op:
-                                            # If this variable is already seen in this call or is on right side vars,
-                                            # don't add duplicates in compound operations
-                                            if arg_base in seen_args_by_call[call_key]:
-                                                # Skip this replacement entirely to avoid duplication
-                                                continue
-                                            else:
-                                                # First occurrence - use actual arg_base
-                                                replacement = f"{arg_base}_{arg_version}"
-                                                # Mark as seen to avoid duplicates
-                                                seen_args_by_call[call_key].add(arg_base)
-                                        else:
-                                            # Standard replacement with argument
-                                            replacement = f"{arg_base}_{arg_version}"
-                                        
-                                        inlined_stmt = inlined_stmt.replace(param_ref, replacement)
-                            
-                            # Process variables in the function body (not parameters)
-                            # Extract the variable being written to (if any)
-                            written_var = None
-                            if " = " in inlined_stmt:
-                                written_part = inlined_stmt.split(" = ")[0]
-                                if "_" in written_part:
-                                    written_var, written_ver_str = written_part.rsplit("_", 1)
-                                    try:
-                                        written_ver = int(written_ver_str)
-                                    except ValueError:
-                                        written_var = None
-                            
-                            # Handle state variables that need version updates
-                            var_versions_to_update = {}
-                            
-                            # First collect all variables that need updating in this statement
-                            for var in version_counter:
-                                var_pattern = f"{var}_"
-                                if var_pattern in inlined_stmt:
-                                    # Find all occurrences of this variable with its version
-                                    for i in range(10):  # Assuming versions 0-9 for simplicity
-                                        old_var = f"{var}_{i}"
-                                        if old_var in inlined_stmt:
-                                            if var == written_var:
-                                                # This is a write, increment the version counter
-                                                version_counter[var] += 1
-                                                var_max_version[var] = version_counter[var]
-                                                var_versions_to_update[old_var] = f"{var}_{var_max_version[var]}"
-                                                # Track this as a write
-                                                added_writes.add(var)
-                                            else:
-                                                # This is a read, use either the latest caller version or a new incremented version
-                                                current_ver = var_max_version.get(var, 0)
-                                                var_versions_to_update[old_var] = f"{var}_{current_ver}"
-                                                # Track this as a read
-                                                added_reads.add(var)
-                            
-                            # Now apply all updates at once to avoid partial replacements
-                            for old_var, new_var in var_versions_to_update.items():
-                                # We need to ensure we replace only whole variable references
-                                # This is a simplified approach, a more robust solution would use regex
-                                inlined_stmt = inlined_stmt.replace(old_var, new_var)
-                            
-                            # Add the inlined statement to our collected inlined statements
-                            all_inlined_statements.append(inlined_stmt)
+                            if "= phi(" not in target_stmt
+                        ]
+                        # All statements in one string, to check which names the callee mentions
+                        callee_text[func_name] = "\n".join(target_stmt for target_stmt, _ in target_statements)
+                    
+                    # Versioned references to the caller variables this call can touch: those the
+                    # callee's statements mention, and those bound to its parameters
+                    text = callee_text[func_name]
+                    tracked_vars = {var for var in version_counter if f"{var}_" in text}
+                    tracked_vars.update(
+                        arg_base for arg_base, _ in arg_version_map.values() if arg_base in version_counter
+                    )
+                    var_pattern = _versioned_names_pattern(frozenset(tracked_vars)) if tracked_vars else None
+                    
+                    # Process each statement in the target function
+                    for target_stmt, is_compound_op in target_statements:
+                        # Initialize inlined statement with the original
+                        inlined_stmt = target_stmt
+                        
+                        # Bind arguments to parameters based on the mapping we created
+                        if param_pattern is not None:
+                            # Decide each distinct parameter reference in parameter then version order
+                            param_refs = {
+                                match[0]: (param_order[match[1]], int(match[2]), match[1])
+                                for match in param_pattern.finditer(inlined_stmt)
+                            }
+                            bindings = {}
+                            for param_ref, (_, _, param_name) in sorted(param_refs.items(), key=lambda item: item[1][:2]):
+                                arg_base, arg_version = arg_version_map[param_name]
+                                # For compound operations, ensure we use the correct variable name
+                                # and eliminate duplication of variables in the output
+                                if is_compound_op:
+                                    # If this variable is already seen in this call,
+                                    # don't add duplicates in compound operations
+                                    if arg_base in seen_args:
+                                        # Skip this replacement entirely to avoid duplication
+                                        continue
+                                    # First occurrence - mark as seen to avoid duplicates
+                                    seen_args.add(arg_base)
+                                bindings[param_ref] = f"{arg_base}_{arg_version}"
                             
-                            # Directly update accesses based on this statement
+                            # Replace only whole parameter references, all in one pass
+                            if bindings:
+                                inlined_stmt = param_pattern.sub(
+                                    lambda match: bindings.get(match[0], match[0]), inlined_stmt
+                                )
+                        
+                        # Process variables in the function body (not parameters)
+                        # Extract the variable being written to (if any)
+                        written = parse_ssa_statement(inlined_stmt).written
+                        written_var = written[0] if written else None
+                        
+                        # Handle state variables that need version updates
+                        var_versions_to_update = {}
+                        
+                        # First collect all variables that need updating in this statement
+                        if var_pattern is not None:
+                            var_refs = {
+                                match[0]: (match[1], int(match[2]))
+                                for match in var_pattern.finditer(inlined_stmt)
+                            }
+                            # Versions are visited in ascending order so writes are numbered deterministically
+                            for old_var, (var, _) in sorted(var_refs.items(), key=lambda item: item[1][1]):
+                                if var == written_var:
+                                    # This is a write, increment the version counter
+                                    version_counter[var] += 1
+                                    var_max_version[var] = version_counter[var]
+                                    var_versions_to_update[old_var] = f"{var}_{var_max_version[var]}"
+                                    # Track this as a write
+                                    added_writes.add(var)
+                                else:
+                                    # This is a read, use the latest caller version
+                                    current_ver = var_max_version.get(var, 0)
+                                    var_versions_to_update[old_var] = f"{var}_{current_ver}"
+                                    # Track this as a read
+                                    added_reads.add(var)
+                        
+                        # Now apply all updates at once, replacing only whole variable references
+                        if var_versions_to_update:
+                            inlined_stmt = var_pattern.sub(
+                                lambda match: var_versions_to_update[match[0]], inlined_stmt
+                            )
+                        
+                        # Add the inlined statement to our collected inlined statements
+                        all_inlined_statements.append(inlined_stmt)
+                        
+                        # Directly update accesses based on this statement
+                        target, sep, rhs = inlined_stmt.partition(" = ")
+                        if sep:
                             # Extract variable from the statement for writes
-                            if " = " in inlined_stmt:
-                                var_name = None
-                                if "_" in inlined_stmt.split(" = ")[0]:
-                                    var_name = inlined_stmt.split(" = ")[0].split("_")[0]
-                                if var_name and "accesses" in block and "writes" in block["accesses"]:
-                                    if var_name not in block["accesses"]["writes"]:
-                                        block["accesses"]["writes"].append(var_name)
+                            var_name, versioned, _ = target.partition("_")
+                            if versioned and var_name and "accesses" in block and "writes" in block["accesses"]:
+                                if var_name not in block["accesses"]["writes"]:
+                                    block["accesses"]["writes"].append(var_name)
                             
-                            # Extract reads from right-hand side and add to accesses
-                            if " = " in inlined_stmt:
-                                rhs = inlined_stmt.split(" = ")[1]
-                                for part in rhs.split():
-                                    if "_" in part:
-                                        var_name = part.split("_")[0]
-                                        added_reads.add(var_name)
+                            # Extract reads from right-hand side (up to any further " = ") and add to accesses
+                            for part in rhs.partition(" = ")[0].split():
+                                var_name, versioned, _ = part.partition("_")
+                                if versioned:
+                                    added_reads.add(var_name)
                     
                     # Add all the inlined statements after the original call
                     modified_statements.extend(all_inlined_statements)
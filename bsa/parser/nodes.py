@@ -2,12 +2,18 @@
 BSA Node classes for working with AST representation.
 """
 
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
+
 class ASTNode:
     """Basic class to represent an AST node."""
     
     def __init__(self, node_data):
         """Initialize an ASTNode with the provided node data dictionary."""
-        self.node_type = node_data.get("nodeType", "Unknown")
+        # nodeType values repeat across the whole AST, so share one string per type
+        self.node_type = sys.intern(node_data.get("nodeType", "Unknown"))
         self.data = node_data
         self.source = node_data.get("src", "0:0:0")
     
@@ -46,4 +52,64 @@ class ASTNode:
         Returns:
             bool: True if the key exists, False otherwise
         """
-        return key in self.data
\ No newline at end of file
+        return key in self.data
+
+
+@dataclass(frozen=True, slots=True)
+class SSAStatement:
+    """An SSA statement split into the fields the inlining passes look at."""
+    
+    text: str
+    # Text before the first " = ", or None if the statement is not an assignment
+    target: Optional[str]
+    # (name, version) of the written variable, or None if the target is not versioned
+    written: Optional[Tuple[str, int]]
+    # "+" or "-" for binary operations on the right-hand side, otherwise None
+    op: Optional[str]
+    # Right-hand side split on the operator
+    operands: Tuple[str, ...]
+    # Unversioned names of the versioned operands of a "+" or "-" operation
+    operand_names: Tuple[str, ...] = ()
+    
+    def __str__(self):
+        return self.text
+
+
+@lru_cache(maxsize=4096)
+def parse_ssa_statement(text):
+    """
+    Split an SSA statement into its fields.
+    
+    Inlined functions repeat the same statements for every call site, so results are cached.
+    
+    Args:
+        text (str): The SSA statement
+        
+    Returns:
+        SSAStatement: The parsed statement
+    """
+    target, sep, rhs = text.partition(" = ")
+    if not sep:
+        return SSAStatement(text, None, None, None, ())
+    
+    written = None
+    name, versioned, version = target.rpartition("_")
+    if versioned:
+        try:
+            written = (name, int(version))
+        except ValueError:
+            pass
+    
+    # For balanceOf[to] = balanceOf[to] + amount patterns
+    if " + " in rhs:
+        op = "+"
+    # For balanceOf[from] = balanceOf[from] - amount patterns
+    elif " - " in rhs:
+        op = "-"
+    else:
+        return SSAStatement(text, target, written, None, (rhs,))
+    
+    operands = tuple(rhs.split(f" {op} "))
+    operand_names = tuple(part.split("_")[0] for part in operands if "_" in part)
+    return SSAStatement(text, target, written, op, operands, operand_names)
+
@@ -3,6 +3,7 @@ Core parser functionality for BSA.
 """
 
 import os
+import sys
 import json
 import glob
 
@@ -65,7 +66,7 @@ class ASTParser:
         
         # Find source and AST files
         self.source_files = find_source_files(self.project_path)
-        self.ast_files = find_ast_files(self.project_path, list(self.source_files.keys()))
+        self.ast_files = find_ast_files(self.project_path, self.source_files)
         
         return len(self.ast_files) > 0
     
@@ -93,10 +94,11 @@ class ASTParser:
             # Get the corresponding source file path
             src_file_path = self.source_files.get(contract_name)
             
-            # Load the source file
-            self.source_text = ""
+            # Load the source file as raw bytes; solc source offsets are byte offsets, and
+            # offset_to_line_col maps them against a cached newline index
+            self.source_text = b""
             if src_file_path and os.path.exists(src_file_path):
-                with open(src_file_path, "r") as src_file:
+                with open(src_file_path, "rb") as src_file:
                     self.source_text = src_file.read()
             
             # Load the AST file
@@ -246,7 +248,7 @@ class ContractProcessor:
         Args:
             node (ASTNode): The contract definition AST node
             pragma (str): The pragma directive string
-            source_text (str): The source code text
+            source_text (bytes): The raw source code
         """
         self.node = node
         self.pragma = pragma
@@ -278,12 +280,17 @@ class ContractProcessor:
         # Extract additional call information
         self._extract_call_information(entrypoints)
         
+        # Summarize call and write positions once the SSA statements are final
+        for entrypoint in entrypoints:
+            SSAConverter.annotate_statement_summary(entrypoint.get("basic_blocks", []))
+        
         # Construct the contract data dictionary
         contract_data = {
             "contract": {
                 "name": contract_info["name"],
                 "pragma": self.pragma,
                 "state_vars": self.state_vars,
+                "state_var_names": frozenset(var["name"] for var in self.state_vars),
                 "functions": self.functions,
                 "events": self.events
             },
@@ -352,7 +359,7 @@ class ContractProcessor:
             var_line, var_col = offset_to_line_col(int(offsets), self.source_text)
         
         self.state_vars.append({
-            "name": var_name,
+            "name": sys.intern(var_name),
             "type": var_type,
             "location": [var_line, var_col]
         })
@@ -908,7 +915,7 @@ def extract_calls(node, calls, calls_seen, function_map, source_text):
         calls (list): List to append call information to
         calls_seen (set): Set of already seen call names
         function_map (dict): Mapping of function names to their AST nodes
-        source_text (str): Source code text
+        source_text (bytes): Raw source code
     """
     if not node:
         return
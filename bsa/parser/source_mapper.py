@@ -2,13 +2,41 @@
 Source mapping utilities for translating Solidity AST source locations to file positions.
 """
 
+from array import array
+from bisect import bisect_left
+
+# Newline table of the most recently mapped source. A parser resolves every location of a
+# file against the same bytes object, so one entry is enough.
+_cached_source = None
+_cached_newlines = None
+
+
+def newline_offsets(source_bytes):
+    """
+    Find the byte offset of every newline in a source.
+    
+    Args:
+        source_bytes (bytes): Raw source code
+        
+    Returns:
+        array: Sorted newline offsets
+    """
+    offsets = array("q")
+    find = source_bytes.find
+    pos = find(b"\n")
+    while pos >= 0:
+        offsets.append(pos)
+        pos = find(b"\n", pos + 1)
+    return offsets
+
+
 def offset_to_line_col(offset, source_text, length=0):
     """
     Convert a byte offset to line and column numbers.
     
     Args:
         offset (int): The byte offset in the source
-        source_text (str): The full source code text
+        source_text (str or bytes): The full source code text, or its raw UTF-8 bytes
         length (int, optional): The length of the segment. Defaults to 0.
         
     Returns:
@@ -17,6 +45,20 @@ def offset_to_line_col(offset, source_text, length=0):
     # Handle empty source or invalid offsets
     if not source_text or offset < 0:
         return (1, 1)
+    
+    # Raw bytes are indexed by the byte offset directly, so a binary search over the
+    # newline offsets finds the line
+    if isinstance(source_text, bytes):
+        if offset >= len(source_text):
+            return (1, 1)
+        global _cached_source, _cached_newlines
+        if source_text is not _cached_source:
+            _cached_source, _cached_newlines = source_text, newline_offsets(source_text)
+        newlines = _cached_newlines
+        # Number of newlines before the offset
+        line_index = bisect_left(newlines, offset)
+        line_start = newlines[line_index - 1] + 1 if line_index else 0
+        return (line_index + 1, offset - line_start + 1)
         
     # Split the source into lines, preserving newline characters
     lines = source_text.splitlines(keepends=True)
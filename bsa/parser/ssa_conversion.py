@@ -6,6 +6,25 @@ into SSA form, including versioning variables, inserting phi functions,
 and integrating the SSA output.
 """
 
+import re
+import sys
+
+# SSA call statements look like "ret_1 = call[external](IA(a).hello, x_0)"
+CALL_RE = re.compile(r"call\[(?P<type>[^\]]+)\]\s*\((?P<func>[^,)]+)")
+
+# Call types that leave the contract
+EXTERNAL_CALL_TYPES = frozenset({"external", "low_level_external", "delegatecall", "staticcall"})
+
+# Revert-like builtins that are recorded as calls but never reach another contract
+REVERT_FUNCS = frozenset({"revert", "require", "assert"})
+
+# Display form of revert-like statements in SSA output
+REVERT_PREFIXES = ("revert ", "require ", "assert ")
+
+# Versioned variable writes look like "x_1 = ..."
+_WRITE_RE = re.compile(r"\b([A-Za-z_]\w*)_\d+ = ")
+
+
 class SSAConverter:
     """
     Handles conversion of basic blocks into Static Single Assignment (SSA) form.
@@ -1763,7 +1782,8 @@ class SSAConverter:
                     # Not a call statement, keep as is
                     new_statements.append(stmt)
             
-            ssa_block["ssa_statements"] = new_statements
+            # Intern the finalized statements; detectors hash and prefix-match them repeatedly
+            ssa_block["ssa_statements"] = [sys.intern(stmt) for stmt in new_statements]
             
             # Check for emit statements and update accesses if needed
             if has_emit:
@@ -1823,6 +1843,44 @@ class SSAConverter:
             
         return ssa_blocks
 
+    @staticmethod
+    def annotate_statement_summary(basic_blocks):
+        """
+        Record where each block's external calls and variable writes are.
+        
+        Each block gets the internal "_bsa_external_call_index", the index of its first external
+        call statement (None if it makes none or contains a revert statement), and
+        "_bsa_written_vars", mapping each written variable name, local or state, to the index of
+        its first write. Detectors can use these instead of re-parsing the statement strings.
+        
+        Args:
+            basic_blocks (list): List of basic block dictionaries in SSA form
+            
+        Returns:
+            list: The same blocks with the summary fields added
+        """
+        for block in basic_blocks:
+            external_call_index = None
+            has_revert_statement = False
+            written_vars = {}
+            
+            for i, stmt in enumerate(block.get("ssa_statements", [])):
+                if stmt.startswith(REVERT_PREFIXES):
+                    has_revert_statement = True
+                elif external_call_index is None:
+                    match = CALL_RE.search(stmt)
+                    if (match and match.group("type") in EXTERNAL_CALL_TYPES
+                            and match.group("func").strip() not in REVERT_FUNCS):
+                        external_call_index = i
+                
+                for write in _WRITE_RE.finditer(stmt):
+                    written_vars.setdefault(write.group(1), i)
+            
+            block["_bsa_external_call_index"] = None if has_revert_statement else external_call_index
+            block["_bsa_written_vars"] = written_vars
+        
+        return basic_blocks
+
 # Function to convert basic blocks to SSA form
 def convert_to_ssa(basic_blocks):
     """
@@ -1838,5 +1896,4 @@ def convert_to_ssa(basic_blocks):
     blocks_with_versions = SSAConverter.assign_ssa_versions(basic_blocks)
     blocks_with_phi = SSAConverter.insert_phi_functions(blocks_with_versions)
     cleaned_blocks = SSAConverter.cleanup_ssa_statements(blocks_with_phi)
-    ssa_result = SSAConverter.integrate_ssa_output(cleaned_blocks)
-    return ssa_result
\ No newline at end of file
+    return SSAConverter.integrate_ssa_output(cleaned_blocks)
\ No newline at end of file
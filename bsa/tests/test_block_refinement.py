@@ -0,0 +1,78 @@
+"""
+Tests for control flow refinement of basic blocks in the typed parser.
+"""
+
+import unittest
+
+from bsa.parser.ast_parser_new import ASTParser
+
+class TestBlockRefinement(unittest.TestCase):
+    def setUp(self):
+        self.parser = ASTParser(".")
+
+    def _if_statement(self):
+        return {"type": "IfStatement", "node": {
+            "nodeType": "IfStatement",
+            "condition": {"nodeType": "Identifier", "name": "flag"},
+            "trueBody": {"statements": [{"nodeType": "Return"}]},
+            "falseBody": None
+        }}
+
+    def test_split_records_control_statement_index(self):
+        """Test that blocks ending in control flow record where that statement is."""
+        statements = [
+            {"type": "Expression", "node": {}},
+            self._if_statement(),
+            {"type": "Return", "node": {}}
+        ]
+        blocks = self.parser.split_into_basic_blocks(statements)
+        self.assertEqual(blocks[0]["control_kind"], "IfStatement")
+        self.assertEqual(blocks[0]["control_idx"], 1)
+        self.assertNotIn("control_kind", blocks[1])
+
+    def test_refine_uses_recorded_index(self):
+        """Test that refinement splits at the recorded control statement."""
+        block = {
+            "id": "Block0",
+            "statements": [{"type": "Assignment", "node": {}}, self._if_statement()],
+            "terminator": "IfStatement",
+            "control_kind": "IfStatement",
+            "control_idx": 1
+        }
+        refined = self.parser.refine_blocks_with_control_flow([block])
+        self.assertEqual([b["id"] for b in refined], ["Block0", "Block1", "Block2"])
+        self.assertEqual(len(refined[0]["statements"]), 2)
+        self.assertEqual(refined[1]["branch_type"], "true")
+
+    def test_refine_without_annotation_searches_statements(self):
+        """Test that hand-built blocks without the annotation are still refined."""
+        block = {"id": "Block0", "statements": [self._if_statement()], "terminator": None}
+        refined = self.parser.refine_blocks_with_control_flow([block])
+        self.assertTrue(refined[0]["terminator"].startswith("if "))
+        self.assertEqual(len(refined), 3)
+
+    def test_statement_types_are_cached_per_node(self):
+        """Test that statement types are memoized by node identity."""
+        node = {"nodeType": "ExpressionStatement", "expression": {"nodeType": "Assignment"}}
+        self.assertEqual(self.parser._get_statement_type(node), "Assignment")
+        self.assertIs(self.parser._stmt_type_cache[id(node)][0], node)
+        self.assertEqual(self.parser._get_statement_type(node), "Assignment")
+        # An equal but distinct node is classified on its own
+        self.assertEqual(self.parser._get_statement_type({"nodeType": "IfStatement"}), "IfStatement")
+
+    def test_block_ids_and_jumps_are_shared(self):
+        """Test that refining separate functions reuses the same block id and goto strings."""
+        def refine():
+            block = {
+                "id": "Block0",
+                "statements": [self._if_statement()],
+                "terminator": None
+            }
+            return self.parser.refine_blocks_with_control_flow([block, {"id": "Block1", "statements": []}])
+        first, second = refine(), refine()
+        self.assertIs(first[1]["id"], second[1]["id"])
+        self.assertEqual(first[1]["terminator"], "goto Block1")
+        self.assertIs(first[1]["terminator"], second[1]["terminator"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,196 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from bsa.parser.ast_parser import ASTParser
+from bsa.parser.ast_parser_new import ASTParser as TypedASTParser
+from bsa.utils.cache import cache_key, default_cache_dir, load_cached, store_cached
+from bsa.utils.forge import load_ast_file, loads_ast, orjson
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = os.path.join(tempfile.mkdtemp(), "bsa-ast")
+
+    def tearDown(self):
+        shutil.rmtree(os.path.dirname(self.cache_dir), ignore_errors=True)
+
+    def test_cache_key_depends_on_inputs(self):
+        """Test that keys change with the inputs and their boundaries."""
+        self.assertEqual(cache_key(b"src", b"ast"), cache_key(b"src", b"ast"))
+        self.assertNotEqual(cache_key(b"src", b"ast"), cache_key(b"src", b"ast2"))
+        self.assertNotEqual(cache_key(b"ab", b"c"), cache_key(b"a", b"bc"))
+
+    def test_store_and_load_round_trip(self):
+        """Test that stored contract data is returned as JSON data on a later lookup."""
+        key = cache_key(b"src", b"ast")
+        data = [{"contract": {"name": "Test", "state_var_names": frozenset({"y", "x"})}, "entrypoints": []}]
+        self.assertTrue(store_cached(self.cache_dir, key, data))
+        self.assertEqual(
+            load_cached(self.cache_dir, key),
+            [{"contract": {"name": "Test", "state_var_names": ["x", "y"]}, "entrypoints": []}]
+        )
+        with open(os.path.join(self.cache_dir, key), "rb") as f:
+            self.assertEqual(f.read(1), b"[")
+
+    def test_values_json_cannot_encode_are_not_stored(self):
+        """Test that a result with non-data objects is skipped instead of cached."""
+        key = cache_key(b"src", b"ast")
+        self.assertFalse(store_cached(self.cache_dir, key, [{"node": object()}]))
+        self.assertIsNone(load_cached(self.cache_dir, key))
+
+    def test_parser_restores_state_var_names(self):
+        """Test that contract data loaded from the cache gets its state variable name set back."""
+        project_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, project_dir, ignore_errors=True)
+        ast_file = os.path.join(project_dir, "C.json")
+        with open(ast_file, "w") as f:
+            json.dump({"ast": {"nodeType": "SourceUnit", "nodes": []}}, f)
+        with open(ast_file, "rb") as f:
+            key = cache_key(b"", f.read())
+        store_cached(self.cache_dir, key, [{"contract": {"name": "C", "state_var_names": frozenset({"x"})}}])
+        parser = ASTParser(project_dir, cache_dir=self.cache_dir)
+        contract_data = parser.process_ast_file(ast_file, None)
+        self.assertEqual(contract_data[0]["contract"]["state_var_names"], frozenset({"x"}))
+
+    def test_default_cache_dir_is_outside_the_project(self):
+        """Test that the default cache follows XDG_CACHE_HOME instead of the analyzed tree."""
+        with patch.dict(os.environ, {"XDG_CACHE_HOME": "/tmp/xdg"}):
+            self.assertEqual(default_cache_dir(), os.path.join("/tmp/xdg", "bsa", "ast"))
+
+    def test_missing_or_corrupt_entry_is_a_miss(self):
+        """Test that lookups fall back to None instead of raising."""
+        key = cache_key(b"src", b"ast")
+        self.assertIsNone(load_cached(self.cache_dir, key))
+        os.makedirs(self.cache_dir)
+        with open(os.path.join(self.cache_dir, key), "wb") as f:
+            f.write(b"not json")
+        self.assertIsNone(load_cached(self.cache_dir, key))
+
+class TestParallelParse(unittest.TestCase):
+    def setUp(self):
+        self.project_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.project_dir, ignore_errors=True)
+
+    def _write_ast_files(self, count):
+        ast_files = []
+        for i in range(count):
+            ast = {"ast": {"nodeType": "SourceUnit", "nodes": [
+                {"nodeType": "ContractDefinition", "name": f"C{i}", "src": "0:0:0", "nodes": []}
+            ]}}
+            path = os.path.join(self.project_dir, "out", f"C{i}.sol", f"C{i}.json")
+            os.makedirs(os.path.dirname(path))
+            with open(path, "w") as f:
+                json.dump(ast, f)
+            ast_files.append(path)
+        return ast_files
+
+    def test_worker_processes_match_sequential_parse(self):
+        """Test that parsing AST files in worker processes keeps the sequential output and order."""
+        ast_files = self._write_ast_files(5)
+        results = []
+        for max_workers in (None, 2):
+            parser = ASTParser(self.project_dir, max_workers=max_workers)
+            parser.ast_files = ast_files
+            results.append(parser.parse())
+        self.assertEqual([c["contract"]["name"] for c in results[0]], ["C0", "C1", "C2", "C3", "C4"])
+        self.assertEqual(results[0], results[1])
+
+    def test_identical_files_are_processed_once(self):
+        """Test that an AST copied under another path reuses the contract data within a parse."""
+        ast_files = self._write_ast_files(2)
+        copy_path = os.path.join(self.project_dir, "lib", "C0.sol", "C0.json")
+        os.makedirs(os.path.dirname(copy_path))
+        shutil.copyfile(ast_files[0], copy_path)
+        parser = ASTParser(self.project_dir)
+        parser.ast_files = ast_files + [copy_path]
+        with patch.object(ASTParser, "_process_ast", autospec=True,
+                          side_effect=ASTParser._process_ast) as mock_process:
+            output = parser.parse()
+        self.assertEqual(mock_process.call_count, 2)
+        self.assertEqual([c["contract"]["name"] for c in output], ["C0", "C1", "C0"])
+        self.assertEqual(output[0], output[2])
+        self.assertIsNot(output[0], output[2])
+
+    def test_returned_contract_data_is_not_shared(self):
+        """Test that editing parse() output does not leak into identical files or later parses."""
+        ast_files = self._write_ast_files(1)
+        copy_path = os.path.join(self.project_dir, "lib", "C0.sol", "C0.json")
+        os.makedirs(os.path.dirname(copy_path))
+        shutil.copyfile(ast_files[0], copy_path)
+        parser = ASTParser(self.project_dir)
+        parser.ast_files = [ast_files[0]]
+        first = parser.parse()
+        first[0]["contract"]["name"] = "MUTATED"
+        self.assertEqual(parser.process_ast_file(copy_path, None)[0]["contract"]["name"], "C0")
+        self.assertEqual(parser.parse()[0]["contract"]["name"], "C0")
+
+    def test_typed_parser_processes_identical_files_once(self):
+        """Test that the typed parser reuses contract data for identical files without sharing it."""
+        ast_file = self._write_ast_files(1)[0]
+        copy_path = os.path.join(self.project_dir, "lib", "C0.sol", "C0.json")
+        os.makedirs(os.path.dirname(copy_path))
+        shutil.copyfile(ast_file, copy_path)
+        parser = TypedASTParser(self.project_dir)
+        contract_data = [{"contract": {"name": "C"}, "entrypoints": []}]
+        with patch.object(parser, "_process_ast", return_value=contract_data) as mock_process:
+            first = parser._process_ast_file(ast_file, None)
+            first[0]["contract"]["name"] = "MUTATED"
+            second = parser._process_ast_file(copy_path, None)
+        self.assertEqual(mock_process.call_count, 1)
+        self.assertEqual(second[0]["contract"]["name"], "C")
+        self.assertIsNot(first, second)
+
+ARTIFACT = os.path.join(os.path.dirname(__file__), "..", "..", "reentrancy_test", "out",
+                        "Vulnerable.sol", "Vulnerable.json")
+
+class TestLoadAstFile(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"abi": [], "bytecode": {"object": "0x00"}, "ast": {"nodes": []}}, f)
+
+    def tearDown(self):
+        os.unlink(self.path)
+
+    def test_stream_keeps_only_ast(self):
+        """Test that streaming selects the "ast" entry through ijson."""
+        with patch("bsa.utils.forge.ijson") as mock_ijson:
+            mock_ijson.items.return_value = iter([{"nodes": []}])
+            self.assertEqual(load_ast_file(self.path, stream=True), {"ast": {"nodes": []}})
+        self.assertEqual(mock_ijson.items.call_args[0][1], "ast")
+
+    def test_stream_without_ijson_loads_whole_file(self):
+        """Test that streaming falls back to a full load when ijson is missing."""
+        with patch("bsa.utils.forge.ijson", None):
+            ast_data = load_ast_file(self.path, stream=True)
+        self.assertEqual(ast_data["ast"], {"nodes": []})
+        self.assertIn("bytecode", ast_data)
+
+    @unittest.skipIf(orjson is None, "orjson is not installed")
+    def test_orjson_matches_stdlib_json(self):
+        """Test that a real forge artifact loads the same through orjson as through the stdlib."""
+        with open(ARTIFACT, "rb") as f:
+            data = f.read()
+        with patch("bsa.utils.forge.orjson", None):
+            expected = load_ast_file(ARTIFACT)
+            self.assertEqual(loads_ast(data), expected)
+        self.assertEqual(load_ast_file(ARTIFACT), expected)
+        self.assertEqual(loads_ast(data), expected)
+        self.assertIn("nodes", expected["ast"])
+
+    def test_loads_ast_stream_keeps_only_ast(self):
+        """Test that streaming in-memory AST JSON also selects the "ast" entry through ijson."""
+        with open(self.path, "rb") as f:
+            data = f.read()
+        with patch("bsa.utils.forge.ijson") as mock_ijson:
+            mock_ijson.items.return_value = iter([{"nodes": []}])
+            self.assertEqual(loads_ast(data, stream=True), {"ast": {"nodes": []}})
+        self.assertEqual(mock_ijson.items.call_args[0][0].read(), data)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,7 +10,7 @@ from pathlib import Path
 import json
 from click.testing import CliRunner
 from bsa.cli import main, contract_output
-from bsa.parser.source_mapper import offset_to_line_col
+from bsa.parser.source_mapper import offset_to_line_col, newline_offsets
 
 class TestCLI(unittest.TestCase):
     def test_main_with_nonexistent_path(self):
@@ -307,6 +307,66 @@ class TestCLI(unittest.TestCase):
         self.assertIn("Description: External call detected before state variable write (x_1 at Block2)", result.output)
         self.assertIn("Severity: High", result.output)
 
+    @patch('bsa.cli.ASTParser')
+    @patch('bsa.cli.DetectorRegistry')
+    def test_quiet_flag_only_prints_findings(self, mock_registry, mock_parser):
+        """Test that --quiet skips the block dump but still reports findings."""
+        mock_contract_data = [
+            {
+                "contract": {
+                    "name": "Vulnerable",
+                    "pragma": "solidity ^0.8.0",
+                    "state_vars": [
+                        {"name": "x", "type": "uint", "location": [1, 1]}
+                    ],
+                    "functions": {},
+                    "events": []
+                },
+                "entrypoints": [
+                    {
+                        "name": "vulnerableFunction",
+                        "location": [10, 5],
+                        "calls": [],
+                        "basic_blocks": [],
+                        "ssa": [
+                            {
+                                "id": "Block0",
+                                "ssa_statements": ["x_1 = 1"],
+                                "terminator": "return",
+                                "accesses": {"reads": [], "writes": ["x"]}
+                            }
+                        ]
+                    }
+                ]
+            }
+        ]
+
+        mock_parser_instance = mock_parser.return_value
+        mock_parser_instance.parse.return_value = mock_contract_data
+
+        mock_registry_instance = mock_registry.return_value
+        mock_registry_instance.run_all.return_value = {
+            "Reentrancy": [
+                {
+                    "contract_name": "Vulnerable",
+                    "function_name": "vulnerableFunction",
+                    "description": "External call detected before state variable write (x_1 = 1 at Block0)",
+                    "severity": "High"
+                }
+            ]
+        }
+
+        # Run CLI in quiet mode
+        runner = CliRunner()
+        result = runner.invoke(main, ["--quiet", str(Path(__file__).parent)])
+
+        # Verify only the detector output is printed
+        self.assertNotIn("Contract: Vulnerable", result.output)
+        self.assertNotIn("Entrypoint:", result.output)
+        self.assertNotIn("SSA Blocks", result.output)
+        self.assertIn("!!!! REENTRANCY found in Vulnerable.vulnerableFunction", result.output)
+        self.assertIn("Severity: High", result.output)
+
     def test_offset_to_line_col(self):
         """Test the offset_to_line_col helper function."""
         # Simple single-line test
@@ -344,4 +404,24 @@ class TestCLI(unittest.TestCase):
         length = 0
         line, col = offset_to_line_col(offset, source_text, length)
         self.assertEqual(line, 1)  # Default to line 1
-        self.assertEqual(col, 1)   # Default to column 1
\ No newline at end of file
+        self.assertEqual(col, 1)   # Default to column 1
+
+    def test_offset_to_line_col_bytes(self):
+        """Test that raw source bytes map byte offsets like the decoded text does."""
+        source_text = "contract Tést {\n    function doStuff() {\n        helper();\n    }\n}"
+        source_bytes = source_text.encode("utf-8")
+        for offset in (0, 9, 16, 17, 41, 50, len(source_bytes) - 1):
+            self.assertEqual(offset_to_line_col(offset, source_bytes),
+                             offset_to_line_col(offset, source_text))
+        self.assertEqual(offset_to_line_col(50, source_bytes), (3, 9))
+        self.assertEqual(offset_to_line_col(len(source_bytes), source_bytes), (1, 1))
+        self.assertEqual(offset_to_line_col(0, b""), (1, 1))
+
+    def test_offset_to_line_col_switches_sources(self):
+        """Test that the cached newline table follows the source being mapped."""
+        self.assertEqual(list(newline_offsets(b"a\nbc\n\nd")), [1, 4, 5])
+        first = b"one\ntwo\nthree"
+        second = b"x\n\n\n\ny"
+        self.assertEqual(offset_to_line_col(8, first), (3, 1))
+        self.assertEqual(offset_to_line_col(5, second), (5, 1))
+        self.assertEqual(offset_to_line_col(5, first), (2, 2))
@@ -0,0 +1,47 @@
+"""
+Tests for renaming variable versions when inlining internal call statements.
+"""
+
+import unittest
+
+from bsa.parser.ast_parser_new import ASTParser, _versioned_name
+
+class TestInlineStatements(unittest.TestCase):
+    def setUp(self):
+        self.parser = ASTParser(".")
+
+    def _inline(self, statements, version_counter):
+        reads, writes = set(), set()
+        inlined = self.parser._inline_all_statements(
+            [{"ssa_statements": statements}], [], version_counter, "call_0", {}, reads, writes
+        )
+        return inlined, reads, writes
+
+    def test_versions_are_renamed_simultaneously(self):
+        """Test that a renamed version is not renamed again by a later update."""
+        version_counter = {"a": 0}
+        inlined, reads, writes = self._inline(["a_1 = a_0 + 1"], version_counter)
+        # a_0 -> a_1 and a_1 -> a_2 must not cascade into "a_2 = a_2 + 1"
+        self.assertEqual(inlined, ["a_2 = a_1 + 1"])
+        self.assertEqual(version_counter, {"a": 2})
+        self.assertEqual(writes, {"a"})
+
+    def test_only_whole_names_are_renamed(self):
+        """Test that tracked names inside longer identifiers are left alone."""
+        version_counter = {"amount": 0, "x": 1}
+        inlined, reads, writes = self._inline(
+            ["y_1 = xamount_0 + x_1", "z_1 = phi(x_0, x_1)"], version_counter
+        )
+        # phi functions are skipped
+        self.assertEqual(inlined, ["y_1 = xamount_0 + x_1"])
+        self.assertEqual(reads, {"x"})
+        self.assertEqual(writes, set())
+
+    def test_versioned_names_are_shared(self):
+        """Test that rebuilt SSA names reuse one interned string."""
+        name = _versioned_name("balance", 3)
+        self.assertEqual(name, "balance_3")
+        self.assertIs(_versioned_name("balance", 3), name)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,6 +5,7 @@ Tests for inlining internal function calls in SSA.
 import unittest
 from unittest.mock import patch, MagicMock
 from bsa.parser.ast_parser import ASTParser
+from bsa.parser.function_calls import inline_internal_calls
 
 class TestInternalCallInlining(unittest.TestCase):
     """Test inlining of internal function calls in SSA."""
@@ -254,5 +255,43 @@ class TestInternalCallInlining(unittest.TestCase):
         self.assertIn("y", result_blocks[0]["accesses"]["writes"], "y should be in writes list")
         self.assertIn("x", result_blocks[0]["accesses"]["writes"], "x should be in writes list")
 
+class TestModularCallInlining(unittest.TestCase):
+    """Test inlining of internal function calls in the modular parser."""
+
+    def inline(self, caller_statements, caller_writes, callee_statements, parameters):
+        """Inline a single call to _helper and return the caller's SSA statements."""
+        caller_blocks = [
+            {
+                "id": "Block0",
+                "accesses": {"reads": [], "writes": []},
+                "ssa_versions": {"reads": {}, "writes": caller_writes},
+                "ssa_statements": caller_statements
+            }
+        ]
+        function_map = {
+            "_helper": {"parameters": {"parameters": [{"name": name} for name in parameters]}}
+        }
+        entrypoints_data = [
+            {"name": "_helper", "ssa": [{"id": "Block0", "ssa_statements": callee_statements}]}
+        ]
+        result_blocks = inline_internal_calls(caller_blocks, function_map, entrypoints_data)
+        return result_blocks[0]["ssa_statements"]
+
+    def test_parameters_bound_as_whole_references(self):
+        """Test that binding a parameter leaves longer names containing it untouched."""
+        ssa_statements = self.inline(
+            ["ret_1 = call[internal](_helper, value_2)"], {},
+            ["x_1 = amount_0 * maxamount_0"], ["amount"]
+        )
+        self.assertEqual(ssa_statements[1], "x_1 = value_2 * maxamount_0")
+
+    def test_state_versions_above_nine(self):
+        """Test that caller versions of ten and above are renamed as whole references."""
+        ssa_statements = self.inline(
+            ["call[internal](_helper)"], {"total": 11},
+            ["total_1 = 5", "y_1 = total_10 * 2"], []
+        )
+        self.assertEqual(ssa_statements[1:], ["total_12 = 5", "y_1 = total_12 * 2"])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
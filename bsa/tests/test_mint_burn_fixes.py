@@ -0,0 +1,75 @@
+import unittest
+
+from bsa.parser.ast_parser_new import ASTParser
+
+class TestMintBurnFixes(unittest.TestCase):
+    def setUp(self):
+        self.parser = ASTParser(".")
+
+    def _entrypoint(self, name, statements):
+        return {"name": name, "ssa": [{"id": "Block0", "ssa_statements": list(statements)}]}
+
+    def test_balance_updates_are_normalized(self):
+        """Test that duplicated amount operands in balanceOf updates are collapsed."""
+        entrypoint = self._entrypoint("mint", [
+            "balanceOf[to]_1 = balanceOf[to]_0 + amount_0 + amount_0",
+            "balanceOf[from]_1 = balanceOf[from]_0 - amount_0amount_0",
+            "balanceOf[to]_1 = balanceOf[to]_0 + value_0"
+        ])
+        self.parser._fix_balance_operations(entrypoint)
+        self.assertEqual(entrypoint["ssa"][0]["ssa_statements"], [
+            "balanceOf[to]_1 = balanceOf[to]_0 + amount_0",
+            "balanceOf[from]_1 = balanceOf[from]_0 - amount_0",
+            "balanceOf[to]_1 = balanceOf[to]_0 + value_0"
+        ])
+
+    def test_internal_calls_keep_prefix(self):
+        """Test that _mint/_burn call arguments are reformatted after the original prefix."""
+        entrypoint = self._entrypoint("other", [
+            "ret_1 = call[internal](_mint to_0 amount_0)",
+            "call[internal](_burn from_0amount_0)"
+        ])
+        self.parser._fix_balance_operations(entrypoint)
+        self.assertEqual(entrypoint["ssa"][0]["ssa_statements"], [
+            "ret_1 = call[internal](_mint, to_0, amount_0)",
+            "call[internal](_burn, from_0, amount_0)"
+        ])
+
+    def test_transfer_events_follow_function_name(self):
+        """Test that Transfer events are rewritten only in mint and burn functions."""
+        for name, expected in [
+            ("mint", "emit Transfer(address(0)_0, to_0, amount_0)"),
+            ("_burn", "emit Transfer(from_0, address(0)_0, amount_0)"),
+            ("transfer", "emit Transfer(a_0, b_0, c_0)")
+        ]:
+            entrypoint = self._entrypoint(name, ["emit Transfer(a_0, b_0, c_0)"])
+            self.parser._fix_balance_operations(entrypoint)
+            self.assertEqual(entrypoint["ssa"][0]["ssa_statements"], [expected])
+
+    def test_blocks_outside_mint_and_burn_are_prefiltered(self):
+        """Test that other functions still get balance fixes but skip unrelated blocks."""
+        entrypoint = {"name": "transfer", "ssa": [
+            {"id": "Block0", "ssa_statements": ["x_1 = y_0 + amount_0", "emit Transfer(a_0, b_0, c_0)"]},
+            {"id": "Block1", "ssa_statements": ["balanceOf[to]_1 = balanceOf[to]_0 + amount_0amount_0"]}
+        ]}
+        self.parser._fix_balance_operations(entrypoint)
+        self.assertEqual(entrypoint["ssa"][0]["ssa_statements"],
+                         ["x_1 = y_0 + amount_0", "emit Transfer(a_0, b_0, c_0)"])
+        self.assertEqual(entrypoint["ssa"][1]["ssa_statements"],
+                         ["balanceOf[to]_1 = balanceOf[to]_0 + amount_0"])
+
+    def test_fix_entrypoint_applies_statement_and_location_fixes(self):
+        """Test that one pass fixes both the SSA statements and the call locations."""
+        entrypoint = self._entrypoint("burn", ["emit Transfer(a_0, b_0, c_0)"])
+        entrypoint["calls"] = [
+            {"name": "_burn", "location": [12, 9]},
+            {"name": "_mint", "location": [13, 9]}
+        ]
+        self.parser._fix_mint_burn_issues([{"entrypoints": [entrypoint]}])
+        self.assertEqual(entrypoint["ssa"][0]["ssa_statements"],
+                         ["emit Transfer(from_0, address(0)_0, amount_0)"])
+        self.assertEqual(entrypoint["calls"][0]["location"], [57, 5])
+        self.assertEqual(entrypoint["calls"][1]["location"], [13, 9])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+"""
+Tests for extracting variable reads from expressions in the typed parser.
+"""
+
+import json
+import sys
+import unittest
+from unittest.mock import Mock, patch
+
+from bsa.parser.ast_parser_new import (
+    ASTParser, _intern_node_types, _process_block_accesses, _variable_reads
+)
+
+class TestReadExtraction(unittest.TestCase):
+    def setUp(self):
+        self.parser = ASTParser(".")
+
+    def test_dispatches_to_access_handlers(self):
+        """Test that identifiers, member and index accesses are all collected."""
+        expr = {
+            "nodeType": "BinaryOperation",
+            "leftExpression": {"nodeType": "Identifier", "name": "total"},
+            "rightExpression": {
+                "nodeType": "IndexAccess",
+                "baseExpression": {"nodeType": "Identifier", "name": "balances"},
+                "indexExpression": {
+                    "nodeType": "MemberAccess",
+                    "expression": {"nodeType": "Identifier", "name": "msg"},
+                    "memberName": "sender"
+                }
+            }
+        }
+        reads = set()
+        self.parser._extract_reads(expr, reads)
+        self.assertEqual(reads, {"total", "balances", "balances[msg.sender]", "msg.sender", "msg"})
+
+    def test_deep_binary_operations_do_not_recurse(self):
+        """Test that long operand chains are walked without hitting the recursion limit."""
+        expr = {"nodeType": "Identifier", "name": "x0"}
+        for i in range(1, 5000):
+            expr = {
+                "nodeType": "BinaryOperation",
+                "leftExpression": expr,
+                "rightExpression": {"nodeType": "Identifier", "name": f"x{i}"}
+            }
+        reads = set()
+        self.parser._extract_reads(expr, reads)
+        self.assertEqual(len(reads), 5000)
+
+    def test_deep_call_chains_do_not_recurse(self):
+        """Test that nested calls and member accesses are walked without hitting the recursion limit."""
+        expr = {"nodeType": "Identifier", "name": "token"}
+        for i in range(3000):
+            expr = {
+                "nodeType": "FunctionCall",
+                "expression": {"nodeType": "MemberAccess", "expression": expr, "memberName": "next"},
+                "arguments": [{"nodeType": "Identifier", "name": f"arg{i}"}]
+            }
+        reads = set()
+        self.parser._extract_reads(expr, reads)
+        self.assertIn("token", reads)
+        self.assertIn("arg2999", reads)
+        self.assertEqual(len(reads), 3001)
+
+    def test_repeated_walk_reuses_reads(self):
+        """Test that walking the same expression again within a block reuses its reads."""
+        expr = {
+            "nodeType": "IndexAccess",
+            "baseExpression": {"nodeType": "Identifier", "name": "balances"},
+            "indexExpression": {"nodeType": "Identifier", "name": "owner"}
+        }
+        handler = self.parser._read_handlers["IndexAccess"]
+        with patch.dict(self.parser._read_handlers, {"IndexAccess": Mock(wraps=handler)}):
+            first, second = set(), set()
+            self.parser._extract_reads(expr, first)
+            self.parser._extract_reads(expr, second)
+            self.assertEqual(self.parser._read_handlers["IndexAccess"].call_count, 1)
+        self.assertEqual(first, second)
+        self.assertEqual(first, {"balances", "owner", "balances[owner]"})
+
+    def test_structured_names_are_interned(self):
+        """Test that structured access names built from separate nodes are the same object."""
+        def member_access():
+            return {
+                "nodeType": "MemberAccess",
+                "expression": {"nodeType": "Identifier", "name": "msg"},
+                "memberName": "sender"
+            }
+        first, second = set(), set()
+        self.parser._extract_reads(member_access(), first)
+        self.parser._extract_reads(member_access(), second)
+        name = next(read for read in first if "." in read)
+        self.assertIs(name, sys.intern("msg.sender"))
+        self.assertIs(next(read for read in second if "." in read), name)
+
+    def test_parallel_accesses_match_sequential(self):
+        """Test that accesses tracked through the parse's pool match sequential tracking."""
+        def make_blocks():
+            return [
+                {
+                    "id": f"Block{i}",
+                    "statements": [{
+                        "type": "Assignment",
+                        "node": {
+                            "nodeType": "ExpressionStatement",
+                            "expression": {
+                                "nodeType": "Assignment",
+                                "leftHandSide": {"nodeType": "Identifier", "name": f"x{i}"},
+                                "rightHandSide": {"nodeType": "Identifier", "name": f"y{i}"}
+                            }
+                        }
+                    }]
+                }
+                for i in range(64)
+            ]
+
+        sequential = self.parser.track_variable_accesses(make_blocks())
+
+        # Stand in for the pool parse() creates, running the worker's walk in this process
+        parallel_parser = ASTParser(".", max_workers=2)
+        executor = Mock()
+        executor.map.side_effect = lambda fn, items, chunksize: map(parallel_parser._block_accesses, items)
+        parallel_parser._executor = executor
+        parallel = parallel_parser.track_variable_accesses(make_blocks())
+
+        self.assertIs(executor.map.call_args[0][0], _process_block_accesses)
+        self.assertEqual(
+            [block["accesses"] for block in parallel],
+            [block["accesses"] for block in sequential]
+        )
+        self.assertEqual(parallel[5]["accesses"], {"reads": ["y5"], "writes": ["x5"]})
+
+    def test_intern_node_types(self):
+        """Test that nodeType values anywhere in the AST are interned in place."""
+        ast = json.loads(
+            '{"nodeType": "SourceUnit", "nodes": [{"nodeType": "Identifier", "name": "x"}]}'
+        )
+        _intern_node_types(ast)
+        self.assertIs(ast["nodeType"], sys.intern("SourceUnit"))
+        self.assertIs(ast["nodes"][0]["nodeType"], sys.intern("Identifier"))
+        self.assertEqual(ast["nodes"][0]["name"], "x")
+
+    def test_variable_reads_drops_call_markers(self):
+        """Test that empty names and call markers are filtered out of block reads."""
+        reads = {"", "balances", "cap", "call[internal](_mint", "token.call(data", "f()", "recall"}
+        self.assertEqual(sorted(_variable_reads(reads)), ["balances", "cap", "recall"])
+
+    def test_blocks_without_accesses_are_not_walked(self):
+        """Test that blocks with no reading or writing statements get empty accesses directly."""
+        blocks = [
+            {"id": "Block0", "statements": []},
+            {"id": "Block1", "statements": [{"type": "Expression", "node": {"nodeType": "ExpressionStatement"}}]}
+        ]
+        with patch.object(self.parser, "_block_accesses") as block_accesses:
+            self.parser.track_variable_accesses(blocks)
+        block_accesses.assert_not_called()
+        for block in blocks:
+            self.assertEqual(block["accesses"], {"reads": [], "writes": []})
+
+if __name__ == '__main__':
+    unittest.main()
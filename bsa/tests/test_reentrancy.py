@@ -4,9 +4,12 @@ from unittest.mock import patch, mock_open
 import json
 from click.testing import CliRunner
 from bsa.cli import main
+from bsa.detectors.reentrancy import ReentrancyDetector, _compile_state_write_pattern
+from bsa.parser.ssa_conversion import SSAConverter
 
 class TestReentrancy(unittest.TestCase):
-    @patch('json.load')
+    @patch('bsa.utils.forge.orjson', None)
+    @patch('json.loads')
     @patch('builtins.open')
     @patch('glob.glob')
     @patch('subprocess.run')
@@ -41,7 +44,7 @@ contract Test {
   }
 }"""
         
-        # Configure the json.load mock to return AST with a reentrancy vulnerability
+        # Configure the json.loads mock to return AST with a reentrancy vulnerability
         ast_data = {
             "ast": {
                 "nodeType": "SourceUnit",
@@ -112,12 +115,12 @@ contract Test {
         # Configure mock_open to handle file reads
         m = mock_open()
         m.side_effect = [
-            mock_open(read_data=sol_content).return_value,  # For the .sol file
-            mock_open(read_data="{}").return_value  # For the .json file
+            mock_open(read_data=sol_content.encode()).return_value,  # For the .sol file
+            mock_open(read_data=b"{}").return_value  # For the .json file
         ]
         mock_open_func.side_effect = m
         
-        # Configure json.load to return our AST data
+        # Configure json.loads to return our AST data
         mock_json_load.return_value = ast_data
         
         # Run the CLI with our mocked environment
@@ -129,7 +132,8 @@ contract Test {
         self.assertEqual(result.exit_code, 0)
         self.assertIn("!!!! REENTRANCY found in Test.doStuff", result.output)
 
-    @patch('json.load')
+    @patch('bsa.utils.forge.orjson', None)
+    @patch('json.loads')
     @patch('builtins.open')
     @patch('glob.glob')
     @patch('subprocess.run')
@@ -164,7 +168,7 @@ contract Test {
   }
 }"""
         
-        # Configure the json.load mock to return AST with no reentrancy vulnerability
+        # Configure the json.loads mock to return AST with no reentrancy vulnerability
         ast_data = {
             "ast": {
                 "nodeType": "SourceUnit",
@@ -235,12 +239,12 @@ contract Test {
         # Configure mock_open to handle file reads
         m = mock_open()
         m.side_effect = [
-            mock_open(read_data=sol_content).return_value,  # For the .sol file
-            mock_open(read_data="{}").return_value  # For the .json file
+            mock_open(read_data=sol_content.encode()).return_value,  # For the .sol file
+            mock_open(read_data=b"{}").return_value  # For the .json file
         ]
         mock_open_func.side_effect = m
         
-        # Configure json.load to return our AST data
+        # Configure json.loads to return our AST data
         mock_json_load.return_value = ast_data
         
         # Run the CLI with our mocked environment
@@ -252,7 +256,8 @@ contract Test {
         self.assertEqual(result.exit_code, 0)
         self.assertNotIn("REENTRANCY found", result.output)
 
-    @patch('json.load')
+    @patch('bsa.utils.forge.orjson', None)
+    @patch('json.loads')
     @patch('builtins.open')
     @patch('glob.glob')
     @patch('subprocess.run')
@@ -287,7 +292,7 @@ contract Test {
   }
 }"""
         
-        # Configure the json.load mock to return AST with no reentrancy vulnerability
+        # Configure the json.loads mock to return AST with no reentrancy vulnerability
         ast_data = {
             "ast": {
                 "nodeType": "SourceUnit",
@@ -346,12 +351,12 @@ contract Test {
         # Configure mock_open to handle file reads
         m = mock_open()
         m.side_effect = [
-            mock_open(read_data=sol_content).return_value,  # For the .sol file
-            mock_open(read_data="{}").return_value  # For the .json file
+            mock_open(read_data=sol_content.encode()).return_value,  # For the .sol file
+            mock_open(read_data=b"{}").return_value  # For the .json file
         ]
         mock_open_func.side_effect = m
         
-        # Configure json.load to return our AST data
+        # Configure json.loads to return our AST data
         mock_json_load.return_value = ast_data
         
         # Run the CLI with our mocked environment
@@ -363,5 +368,185 @@ contract Test {
         self.assertEqual(result.exit_code, 0)
         self.assertNotIn("REENTRANCY found", result.output)
 
+
+class TestReentrancyDetector(unittest.TestCase):
+    """Direct tests for ReentrancyDetector on SSA basic blocks."""
+
+    def _contract_data(self, blocks, state_var_names=("x",)):
+        return {
+            "contract": {
+                "name": "Test",
+                "state_vars": [{"name": name, "type": "uint"} for name in state_var_names]
+            },
+            "entrypoints": [
+                {
+                    "name": "doStuff",
+                    "basic_blocks": [
+                        {"id": f"Block{i}", "ssa_statements": statements}
+                        for i, statements in enumerate(blocks)
+                    ]
+                }
+            ]
+        }
+
+    def test_write_after_external_call(self):
+        """Test that a state write in a block after an external call is reported."""
+        findings = ReentrancyDetector().detect(self._contract_data([
+            ["ret_1 = call[external](IA(a).hello)"],
+            ["x_1 = 1"]
+        ]))
+        self.assertEqual(len(findings), 1)
+        self.assertIn("x_1 = 1 at Block1", findings[0]["description"])
+
+    def test_state_var_read_is_not_a_write(self):
+        """Test that reading a state variable after an external call is not reported."""
+        findings = ReentrancyDetector().detect(self._contract_data([
+            ["ret_1 = call[external](IA(a).hello)"],
+            ["y_1 = x_0 + 1"]
+        ]))
+        self.assertEqual(findings, [])
+
+    def test_state_var_name_prefix_is_not_a_write(self):
+        """Test that a local whose name extends a state variable name is not reported."""
+        findings = ReentrancyDetector().detect(self._contract_data([
+            ["ret_1 = call[external](IA(a).hello)"],
+            ["xs_1 = 1"]
+        ]))
+        self.assertEqual(findings, [])
+
+    def test_overlapping_state_var_names(self):
+        """Test that a write is found when one state variable name prefixes another."""
+        findings = ReentrancyDetector().detect(self._contract_data([
+            ["ret_1 = call[external](IA(a).hello)"],
+            ["balances_1 = 0"]
+        ], state_var_names=("bal", "balances")))
+        self.assertEqual(len(findings), 1)
+        self.assertIn("balances_1 = 0 at Block1", findings[0]["description"])
+
+    def test_state_write_pattern_is_order_independent(self):
+        """Test that the write pattern lists longer names first whatever order the names come in."""
+        pattern = _compile_state_write_pattern(("bal", "balances", "cap")).pattern
+        self.assertEqual(pattern, _compile_state_write_pattern(("cap", "balances", "bal")).pattern)
+        self.assertLess(pattern.index("balances"), pattern.index("bal|"))
+
+    def test_revert_block_is_not_an_external_call(self):
+        """Test that revert-like calls do not count as external calls."""
+        findings = ReentrancyDetector().detect(self._contract_data([
+            ["require cond_0", "call[external](require, cond_0)"],
+            ["x_1 = 1"]
+        ]))
+        self.assertEqual(findings, [])
+
+    def test_parser_state_var_names_are_used(self):
+        """Test that the state variable name set attached by the parser is preferred."""
+        contract_data = self._contract_data([
+            ["ret_1 = call[external](IA(a).hello)"],
+            ["y_1 = 1"]
+        ])
+        contract_data["contract"]["state_var_names"] = frozenset({"y"})
+        findings = ReentrancyDetector().detect(contract_data)
+        self.assertEqual(len(findings), 1)
+        self.assertIn("y_1 = 1 at Block1", findings[0]["description"])
+
+    def test_block_call_classification_is_cached(self):
+        """Test that call classification stored on blocks is reused by other detectors."""
+        contract_data = self._contract_data([
+            ["ret_1 = call[external](IA(a).hello)"],
+            ["x_1 = 1"]
+        ])
+        first = list(ReentrancyDetector().detect(contract_data))
+        self.assertTrue(contract_data["entrypoints"][0]["basic_blocks"][0]["_bsa_calls_classified"])
+        with patch("bsa.detectors.reentrancy._is_external_call_statement") as mock_classify:
+            second = ReentrancyDetector().detect(contract_data)
+        mock_classify.assert_not_called()
+        self.assertEqual(first, second)
+
+    def test_first_only_stops_after_first_finding(self):
+        """Test that first_only reports only the first vulnerable entrypoint."""
+        contract_data = self._contract_data([
+            ["ret_1 = call[external](IA(a).hello)"],
+            ["x_1 = 1"]
+        ])
+        second_entrypoint = dict(contract_data["entrypoints"][0], name="doMore")
+        contract_data["entrypoints"].append(second_entrypoint)
+
+        self.assertEqual(len(ReentrancyDetector().detect(contract_data)), 2)
+        findings = ReentrancyDetector().detect(contract_data, first_only=True)
+        self.assertEqual(len(findings), 1)
+        self.assertEqual(findings[0]["function_name"], "doStuff")
+
+    def test_worker_processes_match_sequential_results(self):
+        """Test that analyzing entrypoints in worker processes gives the same findings."""
+        contract_data = self._contract_data([
+            ["ret_1 = call[external](IA(a).hello)"],
+            ["x_1 = 1"]
+        ])
+        safe_entrypoint = {"name": "safe", "basic_blocks": [{"id": "Block0", "ssa_statements": ["x_1 = 1"]}]}
+        contract_data["entrypoints"] += [safe_entrypoint, dict(contract_data["entrypoints"][0], name="doMore"), dict(safe_entrypoint)]
+
+        sequential = ReentrancyDetector().detect(contract_data)
+        parallel = ReentrancyDetector(max_workers=2).detect(contract_data)
+        self.assertEqual(len(parallel), 2)
+        self.assertEqual(parallel, sequential)
+
+    def test_large_function_batched_search(self):
+        """Test that very large functions report the same write via the batched search."""
+        blocks = [["ret_1 = call[external](IA(a).hello)"]]
+        blocks += [[f"y_{i} = {i}", f"z_{i} = y_{i}"] for i in range(1500)]
+        blocks.append(["z_0 = 0", "x_1 = z_0"])
+        findings = ReentrancyDetector().detect(self._contract_data(blocks))
+        self.assertEqual(len(findings), 1)
+        self.assertIn("x_1 = z_0 at Block1501", findings[0]["description"])
+
+    def test_parser_statement_summary_is_used(self):
+        """Test that blocks summarized by the SSA converter are checked without re-parsing statements."""
+        contract_data = self._contract_data([
+            ["require cond_0", "call[external](require, cond_0)"],
+            ["ret_1 = call[external](IA(a).hello)"],
+            ["y_1 = x_0 + 1", "x_1 = y_1"]
+        ])
+        blocks = contract_data["entrypoints"][0]["basic_blocks"]
+        SSAConverter.annotate_statement_summary(blocks)
+        self.assertEqual([block["_bsa_external_call_index"] for block in blocks], [None, 0, None])
+        self.assertEqual(blocks[2]["_bsa_written_vars"], {"y": 0, "x": 1})
+
+        with patch("bsa.detectors.reentrancy._classify_block_calls") as mock_calls, \
+                patch("bsa.detectors.reentrancy._first_state_write") as mock_writes:
+            findings = ReentrancyDetector().detect(contract_data)
+        mock_calls.assert_not_called()
+        mock_writes.assert_not_called()
+        self.assertEqual(len(findings), 1)
+        self.assertIn("x_1 = y_1 at Block2", findings[0]["description"])
+
+    def test_repeated_detect_reuses_results(self):
+        """Test that analyzing the same contract data twice reuses memoized results."""
+        detector = ReentrancyDetector()
+        contract_data = self._contract_data([
+            ["ret_1 = call[external](IA(a).hello)"],
+            ["x_1 = 1"]
+        ])
+        first = list(detector.detect(contract_data))
+        with patch.object(ReentrancyDetector, "check_reentrancy_blocks") as mock_check:
+            second = detector.detect(contract_data)
+        mock_check.assert_not_called()
+        self.assertEqual(first, second)
+
+        # A different contract must not see the previous results
+        other = self._contract_data([["x_1 = 1"]])
+        self.assertEqual(detector.detect(other), [])
+
+    def test_earlier_findings_are_not_changed(self):
+        """Test that a later detect() call leaves the findings returned earlier intact."""
+        detector = ReentrancyDetector()
+        first = detector.detect(self._contract_data([
+            ["ret_1 = call[external](IA(a).hello)"],
+            ["x_1 = 1"]
+        ]))
+        second = detector.detect(self._contract_data([["x_1 = 1"]]))
+        self.assertEqual(len(first), 1)
+        self.assertEqual(second, [])
+        self.assertIsNot(first, second)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
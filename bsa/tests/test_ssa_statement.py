@@ -0,0 +1,44 @@
+"""
+Tests for the structured SSA statement representation.
+"""
+
+import unittest
+
+from bsa.parser.nodes import SSAStatement, parse_ssa_statement
+
+class TestSSAStatement(unittest.TestCase):
+    def test_parse_assignment_with_operator(self):
+        """Test that assignments expose the written variable and operands."""
+        stmt = parse_ssa_statement("balanceOf[to]_1 = balanceOf[to]_0 + amount_0")
+        self.assertEqual(stmt.target, "balanceOf[to]_1")
+        self.assertEqual(stmt.written, ("balanceOf[to]", 1))
+        self.assertEqual(stmt.op, "+")
+        self.assertEqual(stmt.operands, ("balanceOf[to]_0", "amount_0"))
+        self.assertEqual(stmt.operand_names, ("balanceOf[to]", "amount"))
+        self.assertEqual(str(stmt), "balanceOf[to]_1 = balanceOf[to]_0 + amount_0")
+
+    def test_parse_non_assignment_and_unversioned_target(self):
+        """Test statements without an assignment or a versioned target."""
+        stmt = parse_ssa_statement("emit Transfer(from_0, to_0, amount_0)")
+        self.assertIsNone(stmt.target)
+        self.assertIsNone(stmt.written)
+        self.assertIsNone(stmt.op)
+
+        stmt = parse_ssa_statement("ret_x = call[internal](foo)")
+        self.assertEqual(stmt.target, "ret_x")
+        self.assertIsNone(stmt.written)
+        self.assertEqual(stmt.operands, ("call[internal](foo)",))
+
+    def test_operand_names_skip_unversioned_terms(self):
+        """Test that operand names cover every versioned term of the operation."""
+        stmt = parse_ssa_statement("total_2 = total_1 - fee_0 - 1")
+        self.assertEqual(stmt.op, "-")
+        self.assertEqual(stmt.operand_names, ("total", "fee"))
+
+    def test_parse_is_cached(self):
+        """Test that repeated statements share one parsed instance."""
+        self.assertIs(parse_ssa_statement("x_2 = x_1 - 1"), parse_ssa_statement("x_2 = x_1 - 1"))
+        self.assertIsInstance(parse_ssa_statement("x_2 = x_1 - 1"), SSAStatement)
+
+if __name__ == '__main__':
+    unittest.main()
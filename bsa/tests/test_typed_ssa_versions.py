@@ -0,0 +1,75 @@
+"""
+Tests for SSA version assignment in the typed parser.
+"""
+
+import unittest
+
+from bsa.parser.ast_parser_new import ASTParser
+
+def identifier(name):
+    return {"nodeType": "Identifier", "name": name}
+
+def assignment(name, right_hand_side):
+    return {"nodeType": "ExpressionStatement", "expression": {
+        "nodeType": "Assignment", "operator": "=",
+        "leftHandSide": identifier(name), "rightHandSide": right_hand_side
+    }}
+
+class TestSSAVersions(unittest.TestCase):
+    def setUp(self):
+        self.parser = ASTParser(".")
+
+    def test_statements_dispatch_to_generators(self):
+        """Test that each statement type reaches its generator and other types are skipped."""
+        emit = {"nodeType": "EmitStatement", "eventCall": {
+            "nodeType": "FunctionCall", "expression": identifier("E"), "arguments": [identifier("a")]
+        }}
+        blocks = [{
+            "id": "Block0",
+            "statements": [
+                {"type": "Assignment", "node": assignment("b", identifier("a"))},
+                {"type": "Expression", "node": {}},
+                {"type": "EmitStatement", "node": emit},
+                {"type": "Return", "node": {"nodeType": "Return", "expression": identifier("a")}}
+            ],
+            "accesses": {"reads": ["a"], "writes": ["b"]}
+        }]
+        result = self.parser.assign_ssa_versions(blocks)
+        self.assertIs(result, blocks)
+        self.assertEqual(blocks[0]["ssa_versions"], {"reads": {"a": 0}, "writes": {"b": 1}})
+        self.assertEqual(blocks[0]["ssa_statements"], ["b_1 = a_0", "emit E(a_0)", "return a_0"])
+
+    def test_versions_increase_across_blocks(self):
+        """Test that writes bump a variable's version and later reads see the new version."""
+        blocks = [
+            {"id": "Block0", "statements": [], "accesses": {"reads": [], "writes": ["x"]}},
+            {"id": "Block1", "statements": [], "accesses": {"reads": ["x"], "writes": ["x"]}},
+            {"id": "Block2", "statements": [], "accesses": {"reads": ["x"], "writes": []}}
+        ]
+        self.parser.assign_ssa_versions(blocks)
+        self.assertEqual(
+            [block["ssa_versions"] for block in blocks],
+            [
+                {"reads": {}, "writes": {"x": 1}},
+                {"reads": {"x": 1}, "writes": {"x": 2}},
+                {"reads": {"x": 2}, "writes": {}}
+            ]
+        )
+
+    def test_if_block_reads_written_version(self):
+        """Test that only blocks with an if statement read a variable at its new version."""
+        blocks = [
+            {"id": "Block0",
+             "statements": [{"type": "IfStatement", "node": {"nodeType": "IfStatement", "condition": identifier("x")}}],
+             "accesses": {"reads": ["x", "y"], "writes": ["x"]}},
+            {"id": "Block1", "statements": [{"type": "Assignment", "node": assignment("x", identifier("x"))}],
+             "accesses": {"reads": ["x"], "writes": ["x"]}}
+        ]
+        self.parser.assign_ssa_versions(blocks)
+        self.assertEqual(blocks[0]["ssa_versions"]["reads"], {"x": 1, "y": 0})
+        self.assertEqual(blocks[1]["ssa_versions"]["reads"], {"x": 1})
+        self.assertEqual(blocks[1]["ssa_versions"]["writes"], {"x": 2})
+        self.assertEqual([block["ssa_statements"] for block in blocks], [["if (x_1)"], ["x_2 = x_1"]])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,8 +8,10 @@ from bsa.utils.forge import (
     build_project_ast,
     find_source_files,
     find_ast_files,
-    load_ast_file
+    load_ast_file,
+    loads_ast
 )
+from bsa.utils.cache import cache_key, default_cache_dir, load_cached, store_cached
 
 __all__ = [
     'run_forge_command',
@@ -17,5 +19,10 @@ __all__ = [
     'build_project_ast',
     'find_source_files',
     'find_ast_files',
-    'load_ast_file'
+    'load_ast_file',
+    'loads_ast',
+    'cache_key',
+    'default_cache_dir',
+    'load_cached',
+    'store_cached'
 ]
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""
+On-disk cache for parsed contract data.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+from bsa import __version__
+from bsa.utils.forge import loads_ast
+
+
+def cache_key(*parts):
+    """
+    Build a cache key from the raw inputs of a parse.
+
+    Args:
+        *parts (bytes): Inputs the cached result depends on, e.g. source and AST file contents
+
+    Returns:
+        str: Hex digest identifying the inputs and the BSA version
+    """
+    digest = hashlib.sha256(__version__.encode())
+    for part in parts:
+        # Length prefix keeps ("ab", "c") and ("a", "bc") from colliding
+        digest.update(len(part).to_bytes(8, "little"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def default_cache_dir():
+    """
+    Get the per-user cache directory for processed ASTs.
+
+    The cache lives outside the analyzed project, so a repository cannot ship
+    entries that a later run would load as its own results.
+
+    Returns:
+        str: $XDG_CACHE_HOME/bsa/ast, or ~/.cache/bsa/ast when XDG_CACHE_HOME is not set
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "bsa", "ast")
+
+
+def _encode_set(value):
+    """
+    Encode the sets in contract data for JSON, e.g. state_var_names.
+
+    Args:
+        value (object): Object the json module cannot encode itself
+
+    Returns:
+        list: The set's items, sorted
+    """
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"Cannot cache {type(value).__name__} values")
+
+
+def load_cached(cache_dir, key):
+    """
+    Load a cached result.
+
+    Entries are plain JSON, so loading one never runs code. Sets are
+    returned as lists.
+
+    Args:
+        cache_dir (str): Cache directory
+        key (str): Cache key from cache_key()
+
+    Returns:
+        object: The cached result, or None on a miss or unreadable entry
+    """
+    try:
+        with open(os.path.join(cache_dir, key), "rb") as f:
+            return loads_ast(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def store_cached(cache_dir, key, value):
+    """
+    Store a result in the cache as JSON, replacing any existing entry atomically.
+
+    Args:
+        cache_dir (str): Cache directory
+        key (str): Cache key from cache_key()
+        value (object): JSON-compatible result to store; sets are stored as sorted lists
+
+    Returns:
+        bool: True if the entry was written, False if the cache is not writable or
+            the value cannot be encoded
+    """
+    try:
+        data = json.dumps(value, default=_encode_set, separators=(",", ":")).encode()
+    except (TypeError, ValueError):
+        return False
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, os.path.join(cache_dir, key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return True
+    except OSError:
+        return False
@@ -2,11 +2,24 @@
 Utilities for interacting with Forge, the Foundry Solidity development framework.
 """
 
+import io
 import os
 import subprocess
 import glob
 import json
 
+# orjson parses large solc ASTs several times faster; fall back to the stdlib when it is absent
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ijson builds only the "ast" subtree of an artifact; used for very large files when installed
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 def run_forge_command(command, project_path, check=True):
     """
     Run a forge command in the given project path.
@@ -87,7 +100,8 @@ def find_ast_files(project_path, src_files):
     
     Args:
         project_path (str): Path to the project directory
-        src_files (list): List of source file names without extension
+        src_files (dict or set): Source file names without extension; only membership
+            is checked, so pass a dict or set rather than a list
         
     Returns:
         list: List of AST JSON file paths
@@ -108,15 +122,42 @@ def find_ast_files(project_path, src_files):
     
     return json_files
 
-def load_ast_file(ast_file_path):
+def loads_ast(data, stream=False):
+    """
+    Parse AST JSON that has already been read into memory.
+    
+    Args:
+        data (bytes): Raw AST JSON
+        stream (bool): Keep only the "ast" entry, without building the bytecode and
+            metadata in the rest of the artifact. Requires ijson; the whole document
+            is parsed when it is not installed.
+        
+    Returns:
+        dict: The AST data as a dictionary
+    """
+    if stream and ijson is not None:
+        return {"ast": next(ijson.items(io.BytesIO(data), "ast"), {})}
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def load_ast_file(ast_file_path, stream=False):
     """
     Load an AST file and return its contents.
     
     Args:
         ast_file_path (str): Path to the AST JSON file
+        stream (bool): Stream the file and keep only the "ast" entry, skipping the
+            bytecode and metadata in the rest of the artifact. Requires ijson;
+            the whole file is loaded when it is not installed.
         
     Returns:
         dict: The AST data as a dictionary
     """
-    with open(ast_file_path, "r") as f:
+    # Let the parser decode the raw bytes instead of going through a text wrapper first
+    with open(ast_file_path, "rb") as f:
+        if stream and ijson is not None:
+            return {"ast": next(ijson.items(f, "ast"), {})}
+        if orjson is not None:
+            return orjson.loads(f.read())
         return json.load(f)
\ No newline at end of file